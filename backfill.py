@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Rebuild history/*.md and the timeline for a range of days from recorded snapshots.
+
+Each day is replayed from ``<snapshots>/<YYYY-MM-DD>/`` (a directory written by
+``generate_dashboard.py --record``), so a day needs no network access and no state
+from the days before it: feeds, translations and the RAG section are all taken from
+the snapshot, and a day whose snapshot lacks any of them fails instead of being
+rebuilt with today's data.  Days are fanned out across a process pool; the parent
+upserts all timeline entries into the timeline store in one pass, re-exports
+timeline.md / timeline.json and re-indexes the rebuilt days for search.
+
+    python backfill.py --start 2026-01-01 --end 2026-03-31 --snapshots snapshots/
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import generate_dashboard as gd
+
+
+def build_day(day: str, snapshot_dir: str) -> Tuple[Dict[str, Any], bool]:
+    """Worker: replay one day's snapshot and write its history file.
+
+    Returns the timeline entry and whether the history file changed.
+    """
+    gd.TRANSLATION_CACHE.enabled = False
+    gd.FEED_CACHE.enabled = False
+    gd.CADENCE.enabled = False
+    seen = gd.install_replay(Path(snapshot_dir))
+    now = gd.current_time()
+    updated = now.strftime("%Y-%m-%d %H:%M")
+    yesterday = (now - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    articles = gd.collect_news()
+    sections = gd.split_sections(articles, seen, now.date())
+    gd.translate_sections(sections)
+    rag = gd.day_rag(gd.rag_queries(sections))
+    markdown = gd.render_markdown(sections, rag, day, yesterday, updated)
+    changed = gd.save_history(markdown, day)
+    return gd.timeline_entry(day, updated, sections), changed
+
+
+def day_range(start: date, end: date) -> List[str]:
+    return [(start + timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="以快照平行重建歷史儀表板與時間軸")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="起始日期 YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="結束日期（含），預設與起始日期相同")
+    parser.add_argument("--snapshots", type=Path, required=True, metavar="DIR",
+                        help="每日快照的上層目錄，子目錄以 YYYY-MM-DD 命名")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="平行處理的行程數")
+    args = parser.parse_args(argv)
+
+    end = args.end or args.start
+    if end < args.start:
+        parser.error("--end 不可早於 --start")
+
+    days = []
+    for day in day_range(args.start, end):
+        if (args.snapshots / day / "manifest.json").exists():
+            days.append(day)
+        else:
+            gd.log(f"⏭️ {day} 沒有快照，略過")
+    if not days:
+        gd.log("⚠️ 指定區間內沒有任何快照")
+        return
+
+    gd.OUTPUTS.reset()
+    gd.log(f"▶️ 開始回填 {len(days)} 天（{min(args.workers, len(days))} 個行程）")
+    start = time.perf_counter()
+    entries: List[Dict[str, Any]] = []
+    failed: List[str] = []
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(days))) as pool:
+        futures = {pool.submit(build_day, day, str(args.snapshots / day)): day for day in days}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                entry, changed = future.result()
+            except Exception as exc:  # noqa: BLE001 - one bad snapshot must not stop the others
+                failed.append(day)
+                gd.log(f"⚠️ {day} 回填失敗：{exc}")
+                continue
+            entries.append(entry)
+            gd.OUTPUTS.record(gd.HISTORY_DIR / f"{day}.md", changed)
+
+    if entries:
+        gd.merge_timeline(entries)
+        rebuilt = {entry["date"]: (gd.HISTORY_DIR / f"{entry['date']}.md").read_text(encoding="utf-8") for entry in entries}
+        gd.update_search_index(rebuilt)
+        gd.write_changes()
+    elapsed = time.perf_counter() - start
+    gd.log(f"✅ 回填完成：{len(entries)} 天成功、{len(failed)} 天失敗，耗時 {elapsed:.1f} 秒")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""arXiv fetcher (rag_system/arxiv_client.py) against a local stand-in for the arXiv API.
+
+The stub answers ``/api/query`` with arXiv-format Atom pages (opensearch totals,
+versioned entry IDs, primary categories), newest first, from a fixed synthetic
+catalogue in which queries overlap.  Reports wall time and request count for a
+cold fetch into an empty store and for a warm re-fetch, and checks that papers
+are deduped by arXiv ID and that the warm run stops after one page per query.
+
+    python benchmarks/bench_arxiv_fetch.py --queries 5 --per-query 120 --interval 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "rag_system"))
+
+from arxiv_client import ArxivClient  # noqa: E402
+from rag_store import RagStore  # noqa: E402
+from rate_limit import TokenBucket  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def catalogue(queries: List[str], per_query: int) -> Dict[str, List[int]]:
+    """Paper numbers per query, newest (highest) first; consecutive queries share a third."""
+    results = {}
+    step = per_query * 2 // 3
+    for number, query in enumerate(queries):
+        first = number * step
+        results[query] = list(range(first + per_query - 1, first - 1, -1))
+    return results
+
+
+def atom_page(numbers: List[int], total: int) -> bytes:
+    entries = []
+    for n in numbers:
+        entries.append(f"""
+  <entry>
+    <id>http://arxiv.org/abs/2601.{n:05d}v{1 + n % 3}</id>
+    <published>2026-01-{1 + n % 28:02d}T00:00:00Z</published>
+    <title>Agentic systems study number {n}:
+      planning &amp; tool use</title>
+    <summary>  We study {escape("<agents>")} number {n}.  </summary>
+    <author><name>Author {n}</name></author>
+    <author><name>Coauthor {n}</name></author>
+    <arxiv:primary_category term="cs.AI"/>
+    <category term="cs.LG"/>
+    <category term="cs.AI"/>
+  </entry>""")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <title>arXiv Query</title>
+  <opensearch:totalResults>{total}</opensearch:totalResults>{''.join(entries)}
+</feed>""".encode("utf-8")
+
+
+def arxiv_handler(results: Dict[str, List[int]]):
+    def handle(params: Dict[str, List[str]], headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        query = params["search_query"][0].split(":", 1)[1].strip('"')
+        start = int(params.get("start", ["0"])[0])
+        size = int(params.get("max_results", ["10"])[0])
+        numbers = results.get(query, [])
+        return 200, {"Content-Type": "application/atom+xml"}, atom_page(numbers[start:start + size], len(numbers))
+    return handle
+
+
+def run(client: ArxivClient, store: RagStore, queries: List[str]) -> Tuple[float, int, int]:
+    requests = client.requests
+    start = time.perf_counter()
+    papers = client.fetch(queries, store.ids("papers"), workers=len(queries))
+    added = store.add_new("papers", papers.values())
+    return time.perf_counter() - start, client.requests - requests, added
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--per-query", type=int, default=120, help="results each query has in the catalogue")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between requests (arXiv: 3)")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response latency in seconds")
+    args = parser.parse_args()
+
+    queries = [f"agent topic {i}" for i in range(args.queries)]
+    results = catalogue(queries, args.per_query)
+    unique = len({n for numbers in results.values() for n in numbers})
+    with StubServer(latency=args.latency, handlers={"/api/query": arxiv_handler(results)}) as stub, \
+            tempfile.TemporaryDirectory() as tmp, RagStore(Path(tmp) / "rag_store.db") as store:
+        client = ArxivClient(
+            base_url=f"{stub.base_url}/api/query",
+            limiter=TokenBucket(1.0 / args.interval if args.interval else 0.0),
+            page_size=args.page_size,
+            max_results=args.per_query,
+        )
+        cold = run(client, store, queries)
+        warm = run(client, store, queries)
+        sample = store.items("papers", 1)[0]
+
+    pages = -(-args.per_query // args.page_size)
+    print(f"{args.queries} queries x {args.per_query} results, page size {args.page_size}, "
+          f"{args.interval:.2f} s between requests, {args.latency * 1000:.0f} ms stub latency")
+    print(f"  cold: {cold[0]:.2f} s, {cold[1]} requests ({args.queries * pages} pages), {cold[2]} papers stored")
+    print(f"  warm: {warm[0]:.2f} s, {warm[1]} requests, {warm[2]} papers stored")
+    print(f"  sample: {sample['id']} {sample['title']!r} {sample['categories']}")
+    assert cold[2] == unique, f"expected {unique} unique papers, stored {cold[2]}"
+    assert warm[1] == args.queries and warm[2] == 0
+
+
+if __name__ == "__main__":
+    main()
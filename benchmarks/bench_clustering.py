@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Cost and accuracy of story clustering (clustering.py) on synthetic news batches.
+
+Each synthetic event has a few distinctive words (product, figure) plus two company
+names that other events share, as a company turns up in many unrelated stories;
+its articles mix some of those with words drawn from a shared Zipf-distributed
+news vocabulary, so different write-ups of one event overlap only partially and
+stories about the same companies overlap too.  Reports time per 1k articles and
+pair precision / recall against the true events, and exits non-zero when a batch
+falls below --min-precision or --min-recall.
+
+Recall drops on small batches (below 0.5 at 100 articles): idf from so few articles
+barely tells an event's words from incidental ones, and a lower threshold than
+``SIMILARITY`` starts merging unrelated stories of the larger batches.
+
+    python benchmarks/bench_clustering.py --articles 500,2000,5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from itertools import combinations
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import clustering  # noqa: E402
+
+VOCABULARY = 5000
+EVENT_WORDS = 6              # per event, COMPANIES of them shared with other events
+COMPANIES = 2
+EVENTS_PER_COMPANY = 8
+ARTICLES_PER_EVENT = 3
+
+
+def synth_batch(count: int, seed: int = 5) -> List[Tuple[int, str, str]]:
+    """(event, title, summary) triples, shuffled."""
+    rng = random.Random(seed)
+    common = [f"w{i}" for i in range(VOCABULARY)]
+    zipf = [1.0 / (rank + 1) for rank in range(VOCABULARY)]
+    batch = []
+    events = max(1, count // ARTICLES_PER_EVENT)
+    companies = [f"org{i}" for i in range(max(COMPANIES, events * COMPANIES // EVENTS_PER_COMPANY))]
+    for event in range(events):
+        words = [f"e{event}x{k}" for k in range(EVENT_WORDS - COMPANIES)] + rng.sample(companies, COMPANIES)
+        for _ in range(ARTICLES_PER_EVENT):
+            if len(batch) == count:
+                break
+            title = rng.sample(words, 3) + rng.choices(common, zipf, k=5)
+            summary = rng.sample(words, 3) + rng.choices(common, zipf, k=25)
+            rng.shuffle(title)
+            rng.shuffle(summary)
+            batch.append((event, " ".join(title), " ".join(summary)))
+    rng.shuffle(batch)
+    return batch
+
+
+def pair_scores(labels: List[int], truth: List[int]) -> Tuple[float, float]:
+    def pairs(assignment: List[int]) -> set:
+        groups: dict = {}
+        for item, label in enumerate(assignment):
+            groups.setdefault(label, []).append(item)
+        return {pair for members in groups.values() for pair in combinations(members, 2)}
+
+    found, expected = pairs(labels), pairs(truth)
+    hits = len(found & expected)
+    return hits / max(1, len(found)), hits / max(1, len(expected))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", default="500,2000,5000", help="comma-separated batch sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-precision", type=float, default=0.95)
+    parser.add_argument("--min-recall", type=float, default=0.8)
+    args = parser.parse_args()
+
+    print(f"{'articles':>8} {'stories':>8} {'ms total':>9} {'ms/1k':>7} {'precision':>10} {'recall':>7}")
+    below = []
+    for count in map(int, args.articles.split(",")):
+        batch = synth_batch(count)
+        best = float("inf")
+        labels: List[int] = []
+        for _ in range(args.repeat):
+            leader_of: dict = {}
+            start = time.perf_counter()
+            kept = clustering.cluster(
+                range(len(batch)),
+                title=lambda i: batch[i][1],
+                summary=lambda i: batch[i][2],
+                order_key=lambda i: i,
+                on_member=lambda kept, other: leader_of.__setitem__(other, kept),
+            )
+            best = min(best, time.perf_counter() - start)
+            labels = [leader_of.get(i, i) for i in range(len(batch))]
+        precision, recall = pair_scores(labels, [event for event, _, _ in batch])
+        stories = len(Counter(labels))
+        assert stories == len(kept)
+        print(f"{count:>8} {stories:>8} {best * 1000:9.1f} {best * 1e6 / count:7.2f} {precision:10.3f} {recall:7.3f}")
+        if precision < args.min_precision or recall < args.min_recall:
+            below.append(count)
+    if below:
+        print(f"precision < {args.min_precision} or recall < {args.min_recall} at {', '.join(map(str, below))} articles")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Offline end-to-end benchmark of generate_dashboard.main().
+
+A local stub server serves RSS/Atom feeds and a fake translate endpoint; every
+grid point runs main() in a fresh subprocess against a temporary workspace
+(AI_DASHBOARD_WORKSPACE), so caches start cold and peak RSS is per run.
+
+Feeds are synthesised from the titles in history/*.md, alternating RSS and Atom.
+``--fixtures DIR`` serves recorded *.xml feeds from DIR instead (round-robin).
+
+    python benchmarks/bench_end_to_end.py --sources 5,50,500 --items 10,1000,10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from stub_server import StubServer  # noqa: E402
+
+STAGES = ("collect", "parse", "dedup", "translate", "render_markdown", "timeline", "render_html")
+
+
+def corpus_titles() -> List[str]:
+    titles = []
+    for path in sorted((ROOT / "history").glob("*.md")):
+        titles += re.findall(r"^- \*\*\[(.+?)\]\(", path.read_text(encoding="utf-8"), re.M)
+    return titles or ["AI agents reach a new benchmark milestone"]
+
+
+def synth_feed(index: int, count: int, titles: List[str]) -> bytes:
+    now = datetime.now(timezone.utc)
+    span = timedelta(hours=48)
+    rows = []
+    for i in range(count):
+        title = escape(f"{titles[(index * 7 + i) % len(titles)]} #{index}-{i}")
+        published = now - span * (i / max(count, 1))
+        summary = escape(f"Source {index} reports item {i}: {titles[i % len(titles)]}. " * 3)
+        link = f"https://example.com/{index}/{i}?utm_source=rss"
+        if index % 2:
+            rows.append(f"<entry><title>{title}</title><link href='{link}'/>"
+                        f"<updated>{published.isoformat()}</updated><summary>{summary}</summary></entry>")
+        else:
+            rows.append(f"<item><title>{title}</title><link>{link}</link>"
+                        f"<pubDate>{format_datetime(published)}</pubDate><description>{summary}</description></item>")
+    if index % 2:
+        return ("<?xml version='1.0'?><feed xmlns='http://www.w3.org/2005/Atom'><title>stub</title>"
+                + "".join(rows) + "</feed>").encode("utf-8")
+    return ("<?xml version='1.0'?><rss version='2.0'><channel><title>stub</title>"
+            + "".join(rows) + "</channel></rss>").encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Child: one run of main() inside a temporary workspace
+# ---------------------------------------------------------------------------
+
+def run_child(base_url: str, sources: int) -> None:
+    import generate_dashboard as gd
+    import http_client
+
+    gd.RSS_SOURCES = [{"name": f"Stub {i}", "url": f"{base_url}/feed/{i}"} for i in range(sources)]
+    gd.TRANSLATE_BATCH_ENDPOINT = f"{base_url}/translate_a/t"
+    del sys.argv[1:]    # --child BASE_URL SOURCES are this script's arguments, not main()'s
+    start = time.perf_counter()
+    gd.main()
+    total = time.perf_counter() - start
+
+    stages: Dict[str, float] = {}
+    for row in gd.METRICS.snapshot():
+        stages[row["stage"]] = stages.get(row["stage"], 0.0) + row["duration_seconds"]
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = {"total": total, "stages": stages, "peak_mb": peak_kb / 1024,
+              "client": http_client.default_client().totals()}
+    print("RESULT " + json.dumps(result))
+
+
+# ---------------------------------------------------------------------------
+# Parent: stub server + grid
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", default="5,50", help="comma-separated source counts")
+    parser.add_argument("--items", default="10,1000", help="comma-separated total item counts")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub delay per request (s)")
+    parser.add_argument("--fixtures", type=Path, help="directory of recorded *.xml feeds to serve instead")
+    parser.add_argument("--child", nargs=2, metavar=("BASE_URL", "SOURCES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]))
+        return
+
+    titles = corpus_titles()
+    recorded = sorted(args.fixtures.glob("*.xml")) if args.fixtures else []
+    header = f"{'sources':>7} {'items':>6} " + " ".join(f"{stage[:9]:>9}" for stage in STAGES)
+    print(header + f" {'total':>8} {'peak MB':>8} {'requests':>8} {'conns':>6}")
+
+    with StubServer(latency=args.latency) as stub:
+        for sources, items in itertools.product(map(int, args.sources.split(",")), map(int, args.items.split(","))):
+            per_source = max(1, items // sources)
+            if recorded:
+                bodies = [recorded[i % len(recorded)].read_bytes() for i in range(sources)]
+            else:
+                bodies = [synth_feed(i, per_source, titles) for i in range(sources)]
+            stub.routes = {f"/feed/{i}": (lambda body=body: body) for i, body in enumerate(bodies)}
+            stub.reset()
+
+            with tempfile.TemporaryDirectory() as workspace:
+                env = dict(os.environ, AI_DASHBOARD_WORKSPACE=workspace)
+                env.pop("AI_DASHBOARD_PROM_FILE", None)
+                proc = subprocess.run(
+                    [sys.executable, __file__, "--child", stub.base_url, str(sources)],
+                    env=env, capture_output=True, text=True, check=False,
+                )
+            line = next((ln for ln in proc.stdout.splitlines() if ln.startswith("RESULT ")), None)
+            if proc.returncode or line is None:
+                print(f"{sources:>7} {items:>6} failed:\n{proc.stderr}")
+                continue
+            result = json.loads(line[len("RESULT "):])
+            cells = " ".join(f"{result['stages'].get(stage, 0.0) * 1000:9.1f}" for stage in STAGES)
+            print(f"{sources:>7} {sources * per_source:>6} {cells} {result['total'] * 1000:8.1f}"
+                  f" {result['peak_mb']:8.1f} {stub.total_requests:>8} {stub.connections:>6}")
+    print("(stage columns and total in ms; parse is summed across sources)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Full page render vs. RAG-only update of index.html through the fragment cache (fragments.py).
+
+"full" renders every fragment with a new timestamp, stores them and writes the
+page (what a publish does); "rag-only" re-renders the RAG fragment and re-joins
+the cached others (generate_dashboard.refresh_rag_html minus the RAG selection),
+once with new RAG items and once with unchanged ones.  News sections are padded to --articles each
+so the cost of the untouched sections is visible.  Checks that the RAG-only page
+equals a full render of the same inputs.
+
+    python benchmarks/bench_fragments.py --articles 10,200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import generate_dashboard as gd  # noqa: E402
+from fragments import FragmentCache  # noqa: E402
+from output_writer import OUTPUTS  # noqa: E402
+
+
+def synth_sections(per_section: int) -> Dict[str, List[gd.Article]]:
+    now = datetime.now(timezone.utc)
+    sections = {}
+    for key in ("headlines", "industry", "highlights"):
+        sections[key] = [gd.Article(
+            title=f"{key} story {i}: a model release with benchmark results",
+            link=f"https://example.com/{key}/{i}",
+            source=gd.RSS_SOURCES[i % len(gd.RSS_SOURCES)]["name"],
+            published=now - timedelta(minutes=i),
+            summary="一段約兩三句的中文摘要，描述這則新聞的重點與影響。" * 2,
+        ) for i in range(per_section)]
+    return sections
+
+
+def shuffled_rag(rag: Dict[str, Any], shift: int) -> Dict[str, Any]:
+    return {kind: items[shift:] + items[:shift] if isinstance(items, list) else items for kind, items in rag.items()}
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", default="10,200", help="articles per news section, comma separated")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rag = json.loads((ROOT / "rag_data" / "rag_data.json").read_text(encoding="utf-8"))
+    timeline = [{"date": f"2026-10-{day:02d}", "updated": "08:00", "link": f"history/2026-10-{day:02d}.md",
+                 "headlines": ["a", "b"], "industry": ["c"], "highlights": ["d"]} for day in range(1, 8)]
+    today, updated = "2026-10-18", "2026-10-18 08:00"
+
+    print(f"best of {args.repeat}")
+    for count in (int(part) for part in args.articles.split(",")):
+        sections = synth_sections(count)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = FragmentCache(Path(tmp) / "fragments")
+            page = Path(tmp) / "index.html"
+            OUTPUTS.reset()
+            state = {"shift": 0}
+
+            def full() -> None:
+                state["shift"] += 1
+                parts = gd.render_fragments(sections, rag, today, f"{updated}:{state['shift']:02d}", timeline)
+                cache.update(parts)
+                OUTPUTS.write(page, gd.render_page(parts))
+
+            def rag_only(change: bool) -> Callable[[], None]:
+                def run() -> None:
+                    if change:
+                        state["shift"] += 1
+                    parts = cache.load(gd.HTML_FRAGMENTS)
+                    parts["rag"] = gd.render_rag_html(shuffled_rag(rag, state["shift"] % 3), today)
+                    if cache.update({"rag": parts["rag"]}) or not page.exists():
+                        OUTPUTS.write(page, gd.render_page(parts))
+                return run
+
+            full_s = best_of(args.repeat, full)
+            state["shift"] = 0
+            full()
+            changed_s = best_of(args.repeat, rag_only(True))
+            same_s = best_of(args.repeat, rag_only(False))
+            rendered = shuffled_rag(rag, state["shift"] % 3)
+            expected = gd.render_html(sections, rendered, today, f"{updated}:01", timeline)
+            assert page.read_text(encoding="utf-8") == expected
+            size = len(expected.encode("utf-8"))
+            news = len(cache.load(["news"])["news"].encode("utf-8"))
+
+        print(f"  {count:4d} articles/section, page {size / 1024:6.1f} KiB (news {news / 1024:6.1f} KiB): "
+              f"full {full_s * 1000:6.2f} ms, rag-only {changed_s * 1000:6.2f} ms, "
+              f"rag-only unchanged {same_s * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Show that the shared HTTP client reuses keep-alive connections.
+
+Sends the same sequence of translation batches and feed GETs to a local stub server,
+once with a fresh connection per request (the old urlopen behaviour) and once through
+one pooled ``HttpClient``, and compares server-side connection counts.  Exits non-zero
+if the pooled run did not reuse connections.
+
+    python benchmarks/bench_http_pool.py --requests 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.request import urlopen
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import http_client  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with StubServer(routes={"/feed": lambda: b"<rss/>"}) as stub:
+        urls = [f"{stub.base_url}/feed" if i % 2 else f"{stub.base_url}/translate_a/t?q=x{i}"
+                for i in range(args.requests)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.workers) as pool:
+            list(pool.map(lambda url: urlopen(url).read(), urls))
+        urlopen_time = time.perf_counter() - start
+        urlopen_conns = stub.connections
+        stub.reset()
+
+        client = http_client.HttpClient(pool_size=args.workers)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.workers) as pool:
+            list(pool.map(lambda url: client.get(url).body, urls))
+        pooled_time = time.perf_counter() - start
+        totals = client.totals()
+        client.close()
+
+    print(f"urlopen  requests={len(urls):<5} server connections={urlopen_conns:<5} wall={urlopen_time * 1000:7.1f} ms")
+    print(f"pooled   requests={totals['requests']:<5} server connections={stub.connections:<5} wall={pooled_time * 1000:7.1f} ms"
+          f"  (client: opened={totals['opened']} reused={totals['reused']})")
+    if totals["reused"] == 0 or stub.connections > args.workers:
+        sys.exit("❌ connections were not reused")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""GitHub / Hugging Face fetchers (rag_system/hub_clients.py) against local stand-in APIs.
+
+The GitHub stub answers ``/search/repositories`` with a quota of ``--quota`` requests
+per ``--window`` seconds reported in X-RateLimit-Remaining / X-RateLimit-Reset (403
+once exhausted, 304s free as on GitHub); the Hugging Face stub answers ``/api/models``
+with a combined ``RateLimit: "api";r=..;t=..`` header.  Both send ETags and honour
+If-None-Match.  Queries overlap, so results must be deduped by ID.
+
+Three rounds: cold (empty store and cache), warm (nothing changed: all 304), and
+after the stubs add stars / downloads (deltas must match).  Reports wall time,
+requests, 304s, quota pauses and 403s.
+
+    python benchmarks/bench_hub_fetch.py --queries 12 --per-query 30 --quota 8 --window 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "rag_system"))
+
+from api_client import RateLimitedApi, ResponseCache  # noqa: E402
+from hub_clients import (github_project, github_search_url, huggingface_model,  # noqa: E402
+                         huggingface_search_url, search)
+from rag_store import RagStore  # noqa: E402
+from rate_limit import TokenBucket  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+class Catalogue:
+    """Result IDs per query (consecutive queries share a third) and a counter per ID."""
+
+    def __init__(self, queries: List[str], per_query: int) -> None:
+        step = per_query * 2 // 3
+        self.results = {query: list(range(n * step, n * step + per_query)) for n, query in enumerate(queries)}
+        self.counts = {i: 1000 + 7 * i for ids in self.results.values() for i in ids}
+
+    def bump(self, every: int, amount: int) -> Dict[int, int]:
+        bumped = {i: amount for i in self.counts if i % every == 0}
+        for i, extra in bumped.items():
+            self.counts[i] += extra
+        return bumped
+
+
+def conditional(body: bytes, headers: Dict[str, str], extra: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    if headers.get("if-none-match") == etag:
+        return 304, {"ETag": etag, **extra}, b""
+    return 200, {"Content-Type": "application/json", "ETag": etag, **extra}, body
+
+
+def github_handler(catalogue: Catalogue, quota: int, window: float, forbidden: List[int]):
+    lock = threading.Lock()
+    state = {"used": 0, "reset": time.time() + window}
+
+    def handle(params: Dict[str, List[str]], headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        query = params["q"][0]
+        items = [{
+            "full_name": f"org{i % 17}/agent-kit-{i}",
+            "html_url": f"https://github.com/org{i % 17}/agent-kit-{i}",
+            "description": f"Agent toolkit number {i}",
+            "stargazers_count": catalogue.counts[i],
+            "forks_count": i,
+            "language": "Python",
+            "topics": ["agents", "llm"],
+            "pushed_at": f"2026-09-{1 + i % 28:02d}T00:00:00Z",
+        } for i in catalogue.results[query][:int(params["per_page"][0])]]
+        body = json.dumps({"total_count": len(items), "items": items}).encode("utf-8")
+        with lock:
+            now = time.time()
+            if now >= state["reset"]:
+                state["used"], state["reset"] = 0, now + window
+            rate = {"X-RateLimit-Limit": str(quota), "X-RateLimit-Reset": str(math.ceil(state["reset"]))}
+            if state["used"] >= quota:
+                forbidden.append(1)
+                return 403, {"Content-Type": "application/json", "X-RateLimit-Remaining": "0", **rate}, b"{}"
+            status, reply, data = conditional(body, headers, {})
+            if status == 200:
+                state["used"] += 1
+            reply.update(rate, **{"X-RateLimit-Remaining": str(quota - state["used"])})
+        return status, reply, data
+
+    return handle
+
+
+def huggingface_handler(catalogue: Catalogue):
+    def handle(params: Dict[str, List[str]], headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        query = params["search"][0]
+        models = [{
+            "id": f"lab{i % 11}/agent-model-{i}",
+            "pipeline_tag": "text-generation",
+            "library_name": "transformers",
+            "downloads": catalogue.counts[i],
+            "likes": i % 50,
+            "tags": ["transformers", "agent", "license:apache-2.0"],
+            "lastModified": f"2026-09-{1 + i % 28:02d}T00:00:00.000Z",
+        } for i in catalogue.results[query][:int(params["limit"][0])]]
+        return conditional(json.dumps(models).encode("utf-8"), headers, {"RateLimit": '"api";r=499;t=120'})
+    return handle
+
+
+def run(api: RateLimitedApi, store: RagStore, kind: str, urls: Dict[str, str], convert, counter: str,
+        workers: int) -> Dict[str, object]:
+    before = dict(api.stats)
+    start = time.perf_counter()
+    records, errors = search(api, urls, convert, workers)
+    added, updated = store.upsert(kind, records.values(), counters=(counter,))
+    elapsed = time.perf_counter() - start
+    stats = {key: api.stats[key] - before[key] for key in before}
+    return {"seconds": elapsed, "found": len(records), "added": added, "updated": updated,
+            "errors": errors, **stats}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=12)
+    parser.add_argument("--per-query", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--quota", type=int, default=8, help="GitHub stub requests per window")
+    parser.add_argument("--window", type=float, default=2.0, help="GitHub stub quota window in seconds")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response latency in seconds")
+    args = parser.parse_args()
+
+    queries = [f"agent topic {i}" for i in range(args.queries)]
+    catalogue = Catalogue(queries, args.per_query)
+    forbidden: List[int] = []
+    handlers = {
+        "/search/repositories": github_handler(catalogue, args.quota, args.window, forbidden),
+        "/api/models": huggingface_handler(catalogue),
+    }
+    with StubServer(latency=args.latency, handlers=handlers) as stub, tempfile.TemporaryDirectory() as tmp, \
+            RagStore(Path(tmp) / "rag_store.db") as store:
+        sources = {
+            "github": ("projects", github_search_url, github_project, "stars"),
+            "huggingface": ("models", huggingface_search_url, huggingface_model, "downloads"),
+        }
+        apis = {name: RateLimitedApi(name, TokenBucket(0.0), cache=ResponseCache(Path(tmp) / "http_cache" / name))
+                for name in sources}
+
+        def round_trip() -> Dict[str, Dict[str, object]]:
+            report = {}
+            for name, (kind, url_for, convert, counter) in sources.items():
+                urls = {query: url_for(stub.base_url, query, args.per_query) for query in queries}
+                report[name] = run(apis[name], store, kind, urls, convert, counter, args.workers)
+            return report
+
+        cold = round_trip()
+        warm = round_trip()
+        bumped = catalogue.bump(every=5, amount=42)
+        changed = round_trip()
+        projects = {p["id"]: p for p in store.items("projects")}
+        models = {m["id"]: m for m in store.items("models")}
+
+    unique = len(catalogue.counts)
+    print(f"{args.queries} queries x {args.per_query} results ({unique} unique) per API, {args.workers} workers, "
+          f"GitHub quota {args.quota}/{args.window:g} s, {args.latency * 1000:.0f} ms stub latency")
+    for label, report in (("cold", cold), ("warm", warm), ("changed", changed)):
+        for name, r in report.items():
+            print(f"  {label:7} {name:11}: {r['seconds']:.2f} s, {r['requests']} requests, "
+                  f"{r['not_modified']} not modified, {r['throttled']} quota pauses, "
+                  f"{r['found']} found, {r['added']} added, {r['updated']} updated")
+    print(f"  GitHub stub answered 403 (quota exhausted) {len(forbidden)} times")
+
+    for report in (cold, warm, changed):
+        for r in report.values():
+            assert not r["errors"], r["errors"]
+    assert cold["github"]["added"] == cold["huggingface"]["added"] == unique
+    assert warm["github"]["not_modified"] == warm["huggingface"]["not_modified"] == args.queries
+    assert warm["github"]["updated"] == warm["huggingface"]["updated"] == 0
+    assert changed["github"]["updated"] == changed["huggingface"]["updated"] == len(bumped)
+    for i, extra in bumped.items():
+        assert projects[f"org{i % 17}/agent-kit-{i}"]["stars_delta"] == extra
+        assert models[f"lab{i % 11}/agent-model-{i}"]["downloads_delta"] == extra
+    assert sum(p["stars_delta"] for p in projects.values()) == 42 * len(bumped)
+
+
+if __name__ == "__main__":
+    main()
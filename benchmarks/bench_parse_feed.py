@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Time and peak memory of parse_feed() on multi-megabyte RSS/Atom fixtures.
+
+Compares the old tree-based parse (ET.fromstring + findall) with the streaming
+parser, with and without the lookback cutoff.  Example:
+
+    python benchmarks/bench_parse_feed.py --items 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_dashboard as gd  # noqa: E402
+
+BODY = "Researchers describe a new agent framework that plans, calls tools and reflects. " * 6
+
+
+def rss_fixture(count: int, shuffled: bool = False) -> bytes:
+    now = datetime.now(timezone.utc)
+    order = list(range(count))
+    if shuffled:
+        random.Random(7).shuffle(order)
+    items = "".join(
+        f"<item><title>Story {i}</title><link>https://example.com/{i}</link>"
+        f"<pubDate>{format_datetime(now - timedelta(minutes=30 * i))}</pubDate>"
+        f"<description>&lt;p&gt;{BODY}&lt;/p&gt;</description></item>"
+        for i in order
+    )
+    return f"<?xml version='1.0'?><rss version='2.0'><channel><title>fixture</title>{items}</channel></rss>".encode()
+
+
+def atom_fixture(count: int) -> bytes:
+    now = datetime.now(timezone.utc)
+    entries = "".join(
+        f"<entry><title>Story {i}</title><link href='https://example.com/{i}'/>"
+        f"<updated>{(now - timedelta(minutes=30 * i)).isoformat()}</updated>"
+        f"<summary>{BODY}</summary></entry>"
+        for i in range(count)
+    )
+    return f"<?xml version='1.0'?><feed xmlns='http://www.w3.org/2005/Atom'><title>fixture</title>{entries}</feed>".encode()
+
+
+def legacy_parse(data: bytes) -> int:
+    """The pre-streaming parse_feed(): whole tree in memory, RSS scan then Atom scan."""
+    root = ET.fromstring(data)
+    items = root.findall(".//item")
+    if not items:
+        items = root.findall(f".//{gd.ATOM_NS}entry")
+    articles = []
+    for item in items:
+        title = gd.node_text(item, "title")
+        link = gd._item_link(item)
+        if not title or not link:
+            continue
+        pub_date_raw = gd.node_text(item, "pubDate") or gd.node_text(item, "updated")
+        summary_raw = gd.node_text(item, "description") or gd.node_text(item, "summary")
+        articles.append(gd.Article(title, link, "legacy", gd._parse_date(pub_date_raw), gd.strip_html(summary_raw)))
+    return len(articles)
+
+
+def measure(label: str, func) -> None:
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22} items={count:<7} time={elapsed * 1000:9.1f} ms  peak={peak / 1e6:8.2f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    args = parser.parse_args()
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=gd.LOOKBACK_HOURS)
+    with tempfile.TemporaryDirectory() as tmp:
+        gd.LOG_FILE = Path(tmp) / "update.log"
+        fixtures = {
+            "rss (newest first)": rss_fixture(args.items),
+            "rss (shuffled)": rss_fixture(args.items, shuffled=True),
+            "atom (newest first)": atom_fixture(args.items),
+        }
+        for name, data in fixtures.items():
+            print(f"{name}: {len(data) / 1e6:.1f} MB")
+            measure("tree (fromstring)", lambda: legacy_parse(data))
+            measure("stream", lambda: len(gd.parse_feed(data, name)))
+            measure("stream + cutoff", lambda: len(gd.parse_feed(data, name, cutoff)))
+
+
+if __name__ == "__main__":
+    main()
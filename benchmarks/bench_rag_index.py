@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Top-k query latency of the RAG retrieval index (rag_index.py) at 100k documents.
+
+Builds an index of synthetic papers / projects / models in a temporary directory
+(titles drawn from a Zipf-distributed vocabulary plus the history archive's
+headline words), then reports build time, reopen time, per-query latency
+percentiles with headline titles as queries, and incremental add / remove cost,
+including one added document saved on its own (a run that found one new item).
+Last, a close without ``save`` after replacing documents: the reopened index must
+score them exactly as before the unsaved changes.
+
+    python benchmarks/bench_rag_index.py --docs 100000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from rag_index import KIND_FIELDS, RagIndex  # noqa: E402
+
+VOCABULARY = 20000
+
+
+def headlines() -> List[str]:
+    titles = []
+    for path in sorted((ROOT / "history").glob("*.md")):
+        titles += re.findall(r"^- \*\*\[(.+?)\]\(", path.read_text(encoding="utf-8"), re.M)
+    return titles or ["Anthropic launches enterprise agents", "Nvidia posts record quarter on AI chips"]
+
+
+def synth_items(count: int, seed: int = 7) -> List[tuple]:
+    rng = random.Random(seed)
+    words = [f"t{i}" for i in range(VOCABULARY)]
+    # Headline words spread over the frequency ranks, so queries hit both common and rare terms.
+    real = sorted({word.lower() for title in headlines() for word in re.findall(r"[A-Za-z]+", title)})
+    for rank, word in zip(range(20, VOCABULARY, 7), real):
+        words[rank] = word
+    zipf = [1.0 / (rank + 1) ** 0.9 for rank in range(VOCABULARY)]
+    kinds = list(KIND_FIELDS)
+    items = []
+    for i in range(count):
+        kind = kinds[i % len(kinds)]
+        title, body, tags = KIND_FIELDS[kind]
+        items.append((kind, {
+            "url": f"https://example.com/{kind}/{i}",
+            title: " ".join(rng.choices(words, zipf, k=8)),
+            body: " ".join(rng.choices(words, zipf, k=40)),
+            tags: rng.choices(words[:200], k=3),
+        }))
+    return items
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    items = synth_items(args.docs + 1000)
+    queries = (headlines() * (args.queries // len(headlines()) + 1))[:args.queries]
+    report: Dict[str, str] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "rag_index"
+        index = RagIndex(root)
+        start = time.perf_counter()
+        for kind, item in items[:args.docs]:
+            index.add(kind, item)
+        report["build"] = f"{time.perf_counter() - start:.1f} s"
+        start = time.perf_counter()
+        index.save()
+        report["save"] = f"{time.perf_counter() - start:.2f} s"
+        index.close()
+
+        start = time.perf_counter()
+        index = RagIndex(root)
+        report["reopen"] = f"{time.perf_counter() - start:.2f} s"
+        assert len(index) == args.docs
+
+        latencies = []
+        for text in queries:
+            start = time.perf_counter()
+            index.query(text, args.top)
+            latencies.append((time.perf_counter() - start) * 1000)
+        report[f"query top-{args.top} p50"] = f"{statistics.median(latencies):.2f} ms"
+        report[f"query top-{args.top} p95"] = f"{percentile(latencies, 0.95):.2f} ms"
+        report[f"query top-{args.top} max"] = f"{max(latencies):.2f} ms"
+
+        start = time.perf_counter()
+        index.select(queries[:20], {"papers": 3, "projects": 4, "models": 2})
+        report["select (20 headlines)"] = f"{(time.perf_counter() - start) * 1000:.1f} ms"
+
+        (kind, item), extra = items[args.docs], items[args.docs + 1:]
+        start = time.perf_counter()
+        index.add(kind, item)
+        index.save()
+        report["add one + save"] = f"{(time.perf_counter() - start) * 1000:.1f} ms"
+
+        start = time.perf_counter()
+        for kind, item in extra:
+            index.add(kind, item)
+        report["add"] = f"{(time.perf_counter() - start) * 1e6 / len(extra):.0f} µs/doc"
+        start = time.perf_counter()
+        for _, item in extra:
+            index.remove(item["url"])
+        report["remove"] = f"{(time.perf_counter() - start) * 1e6 / len(extra):.0f} µs/doc"
+        start = time.perf_counter()
+        index.save()
+        report[f"save after {2 * len(extra)} changes"] = f"{(time.perf_counter() - start) * 1000:.1f} ms"
+
+        # Replace the documents some queries return (remove + add of a changed copy),
+        # add new ones, then close unsaved.
+        before = {text: index.query(text, args.top) for text in queries[:20]}
+        for key in {key for hits in before.values() for _, key in hits}:
+            kind, item = index.kind(key), index.item(key)
+            index.remove(key)
+            index.add(kind, {**item, KIND_FIELDS[kind][0]: "replaced " + item[KIND_FIELDS[kind][0]]})
+        for kind, item in extra:
+            index.add(kind, item)
+        index.close()
+        start = time.perf_counter()
+        index = RagIndex(root)
+        report["reopen, unsaved close"] = f"{time.perf_counter() - start:.2f} s"
+        after = {text: index.query(text, args.top) for text in queries[:20]}
+        assert after == before, "unsaved changes leaked into the reopened index"
+        index.close()
+
+    print(f"{args.docs} documents, {len(queries)} headline queries")
+    for name, value in report.items():
+        print(f"  {name:<24} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Incremental RAG refresh (rag_system/fetch_papers.refresh) against local stand-in APIs.
+
+One stub serves the arXiv, GitHub and Hugging Face endpoints (see bench_arxiv_fetch.py
+and bench_hub_fetch.py).  After a cold refresh of every query, the clock is moved
+forward past one source's TTL after another, and single queries are aged by hand;
+each refresh must ask only for the stale queries, so requests and wall time follow
+what went stale rather than the size of the configuration.
+
+    python benchmarks/bench_rag_refresh.py --queries 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "rag_system"))
+
+from bench_arxiv_fetch import arxiv_handler, catalogue  # noqa: E402
+from bench_hub_fetch import Catalogue, github_handler, huggingface_handler  # noqa: E402
+from rag_store import RagStore  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=10, help="queries per source")
+    parser.add_argument("--per-query", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response latency in seconds")
+    args = parser.parse_args()
+
+    queries = {source: [f"{source} topic {i}" for i in range(args.queries)]
+               for source in ("arxiv", "github", "huggingface")}
+    handlers = {
+        "/api/query": arxiv_handler(catalogue(queries["arxiv"], args.per_query)),
+        "/search/repositories": github_handler(Catalogue(queries["github"], args.per_query), 10 ** 6, 60, []),
+        "/api/models": huggingface_handler(Catalogue(queries["huggingface"], args.per_query)),
+    }
+    with StubServer(latency=args.latency, handlers=handlers) as stub, tempfile.TemporaryDirectory() as tmp:
+        # rag_config reads the workspace and API URLs from the environment when imported.
+        os.environ.update({
+            "AI_DASHBOARD_WORKSPACE": str(Path(tmp) / "ai-dashboard"),
+            "ARXIV_API_URL": f"{stub.base_url}/api/query",
+            "GITHUB_API_URL": stub.base_url,
+            "HUGGINGFACE_API_URL": stub.base_url,
+        })
+        import fetch_papers
+        import rag_config
+
+        for source, source_queries in queries.items():
+            rag_config.SEARCH_CONFIG[f"{source}_queries"] = source_queries
+        rag_config.ARXIV_CONFIG.update(request_interval=0.0, max_results=args.per_query)
+        rag_config.GITHUB_CONFIG["requests_per_minute"] = 0
+        rag_config.HUGGINGFACE_CONFIG["requests_per_minute"] = 0
+
+        with RagStore(Path(rag_config.RAG_STORE_FILE)) as store:
+            start = datetime.now(timezone.utc)
+
+            def step(label: str, now: datetime) -> None:
+                stub.reset()
+                began = time.perf_counter()
+                refreshed = fetch_papers.refresh(store, now=now)
+                elapsed = time.perf_counter() - began
+                stale = ", ".join(f"{source} {len(q)}" for source, q in refreshed.items()) or "none"
+                print(f"  {label:28}: {elapsed:6.2f} s, {stub.total_requests:3d} requests, stale: {stale}")
+
+            print(f"{args.queries} queries per source, {args.per_query} results each, "
+                  f"{args.latency * 1000:.0f} ms stub latency, TTL {rag_config.REFRESH_TTL_HOURS} h")
+            step("cold", start)
+            step("immediately after", start)
+            step("+7 h (GitHub TTL 6 h)", start + timedelta(hours=7))
+            store.mark_fetched("huggingface", queries["huggingface"][:1], when=start - timedelta(days=1))
+            step("one Hugging Face query aged", start + timedelta(hours=7))
+            step("+13 h (+ Hugging Face 12 h)", start + timedelta(hours=13))
+            step("+25 h (+ arXiv 24 h)", start + timedelta(hours=25))
+
+            began = time.perf_counter()
+            payload = store.rag_data()
+            print(f"  rag_data() from the store   : {(time.perf_counter() - began) * 1000:6.2f} ms "
+                  f"({', '.join(f'{len(payload[kind])} {kind}' for kind in ('papers', 'projects', 'models'))})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Cost of the ranking stage (ranking.py) per 1k candidate articles.
+
+A run of the ranking stage is ``FeatureTable`` + ``rank_sections``.  Reported:
+
+* cold -- building the table over articles never ranked before, which matches every
+          title + summary against the keyword / topic patterns;
+* run  -- the whole stage over articles ranked before: their matches come from the
+          config's cache, multi-source coverage and scoring are redone;
+* rank -- rank_sections alone.
+
+A run with k articles not seen before costs about run + k * cold / 1000.  Exits
+non-zero when a run exceeds --budget-ms per 1k articles.
+
+    python benchmarks/bench_ranking.py --articles 1000,10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import generate_dashboard as gd  # noqa: E402
+from ranking import FeatureTable, rank_sections  # noqa: E402
+
+
+def corpus() -> List[tuple]:
+    rows = []
+    for path in sorted((ROOT / "history").glob("*.md")):
+        text = path.read_text(encoding="utf-8")
+        rows += re.findall(r"^- \*\*\[(.+?)\]\(.+?\n  (.+)$", text, re.M)
+    return rows or [("AI agents reach a new benchmark milestone", "A short summary.")]
+
+
+def synth_articles(count: int, covered: float = 25.0) -> List[gd.Article]:
+    """``covered`` percent of the stories also carry 1-3 copies from other sources."""
+    rng = random.Random(11)
+    rows = corpus()
+    sources = [source["name"] for source in gd.RSS_SOURCES]
+    now = datetime.now(timezone.utc)
+    articles = []
+    for i in range(count):
+        title, summary = rows[i % len(rows)]
+        article = gd.Article(
+            title=f"{title} #{i}",
+            link=f"https://example.com/{i}",
+            source=sources[i % len(sources)],
+            published=now - timedelta(minutes=rng.randrange(0, 36 * 60)),
+            summary=summary,
+        )
+        if rng.random() * 100 < covered:
+            others = [source for source in sources if source != article.source]
+            article.related = [gd.Article("", "", source, now, "") for source in rng.sample(others, rng.randint(1, 3))]
+        articles.append(article)
+    return articles
+
+
+def best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", default="1000,10000", help="comma-separated candidate counts")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--covered", type=float, default=25.0, help="percent of stories with other sources' copies")
+    parser.add_argument("--budget-ms", type=float, default=1.0, help="max run time per 1k articles")
+    args = parser.parse_args()
+
+    print(f"{'articles':>8} {'cold ms/1k':>11} {'run ms/1k':>10} {'rank ms/1k':>11}")
+    over_budget = False
+    for count in map(int, args.articles.split(",")):
+        articles = synth_articles(count, covered=args.covered)
+        now = time.time()
+        per_k = 1000 / count
+        cold = float("inf")
+        for _ in range(max(1, args.repeat // 4)):
+            config = replace(gd.RANKING)    # empty feature cache
+            config.matcher
+            cold = min(cold, best_of(1, lambda: FeatureTable(articles, config)))
+        run = best_of(args.repeat, lambda: rank_sections(FeatureTable(articles, config), now))
+        table = FeatureTable(articles, config)
+        ranking = best_of(args.repeat, lambda: rank_sections(table, now))
+        print(f"{count:>8} {cold * 1000 * per_k:11.3f} {run * 1000 * per_k:10.3f} {ranking * 1000 * per_k:11.3f}")
+        over_budget |= run * 1000 * per_k > args.budget_ms
+    if over_budget:
+        print(f"a run exceeded {args.budget_ms} ms per 1k articles")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
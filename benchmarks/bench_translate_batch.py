@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Compare per-summary translation requests with the batched translate_batch() path.
+
+Runs against a local stub translate endpoint (no network).  Example:
+
+    python benchmarks/bench_translate_batch.py --items 50 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_dashboard as gd  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def sample_summaries(count: int) -> list:
+    return [
+        f"Article {i}: a startup announced a new model that improves agent reasoning benchmarks by {i % 17}%."
+        for i in range(count)
+    ]
+
+
+def run(label: str, texts: list, stub: StubServer, batch_items: int, tmp: Path) -> float:
+    gd.TRANSLATE_BATCH_ITEMS = batch_items
+    gd.TRANSLATION_CACHE = gd.TranslationCache(tmp / f"{label}.json", 1, 10_000)
+    stub.reset()
+    start = time.perf_counter()
+    results = gd.translate_batch(texts)
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for src, dst in zip(texts, results) if dst != src)
+    print(f"{label:<10} requests={stub.total_requests:<5} translated={ok}/{len(texts):<6} wall={elapsed * 1000:8.1f} ms")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub server delay per request (s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir, StubServer(latency=args.latency) as stub:
+        tmp = Path(tmp_dir)
+        gd.LOG_FILE = tmp / "update.log"
+        gd.TRANSLATE_BATCH_ENDPOINT = f"{stub.base_url}/translate_a/t"
+        texts = sample_summaries(args.items)
+        batch_items = gd.TRANSLATE_BATCH_ITEMS
+        single = run("per-item", texts, stub, 1, tmp)
+        batched = run("batched", texts, stub, batch_items, tmp)
+        print(f"speedup    {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
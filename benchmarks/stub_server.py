@@ -0,0 +1,139 @@
+"""Local stand-ins for the feed hosts and the translate endpoint used by the benchmarks."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+# (query params, request headers) -> (status, response headers, body)
+Handler = Callable[[Dict[str, List[str]], Dict[str, str]], Tuple[int, Dict[str, str], bytes]]
+
+
+def fake_translate(text: str) -> str:
+    return f"〔譯〕{text}"
+
+
+class StubServer:
+    """Threaded HTTP server with per-path counters and an artificial per-request latency.
+
+    ``routes`` maps a GET path to a callable returning the response body.  ``handlers``
+    maps a GET path to a callable that gets the parsed query string and the request
+    headers and returns ``(status, headers, body)``, for APIs whose answer depends on
+    the request (paging, conditional requests, rate-limit headers).  POST/GET on
+    ``/translate_a/t`` and GET on ``/translate_a/single`` emulate the Google gtx API.
+    """
+
+    def __init__(self, latency: float = 0.0, routes: Optional[Dict[str, Callable[[], bytes]]] = None,
+                 handlers: Optional[Dict[str, Handler]] = None) -> None:
+        self.latency = latency
+        self.routes: Dict[str, Callable[[], bytes]] = dict(routes or {})
+        self.handlers: Dict[str, Handler] = dict(handlers or {})
+        self.requests: Dict[str, int] = {}
+        self.translated_items = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.translated_items = 0
+            self.connections = 0
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, path: str, items: int = 0) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.translated_items += items
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def _reply(self, status: int, body: bytes, content_type: str,
+                       headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _translate(self, params: Dict[str, list], path: str) -> None:
+                texts = params.get("q", [])
+                stub._count(path, len(texts))
+                if path.endswith("/single"):
+                    payload = [[[fake_translate(texts[0]), texts[0]]]]
+                else:
+                    payload = [[fake_translate(text), "en"] for text in texts]
+                self._reply(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+            def do_GET(self) -> None:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlparse(self.path)
+                if url.path.startswith("/translate_a/"):
+                    self._translate(parse_qs(url.query), url.path)
+                    return
+                handler = stub.handlers.get(url.path)
+                if handler is not None:
+                    stub._count(url.path)
+                    request_headers = {key.lower(): value for key, value in self.headers.items()}
+                    status, headers, body = handler(parse_qs(url.query), request_headers)
+                    headers = dict(headers)
+                    self._reply(status, body, headers.pop("Content-Type", "application/xml"), headers)
+                    return
+                route = stub.routes.get(url.path)
+                stub._count(url.path)
+                if route is None:
+                    self._reply(404, b"not found", "text/plain")
+                    return
+                self._reply(200, route(), "application/xml")
+
+            def do_POST(self) -> None:
+                if stub.latency:
+                    time.sleep(stub.latency)
+                length = int(self.headers.get("Content-Length") or 0)
+                params = parse_qs(self.rfile.read(length).decode("utf-8"))
+                path = urlparse(self.path).path
+                if not path.startswith("/translate_a/"):
+                    stub._count(path)
+                    self._reply(404, b"not found", "text/plain")
+                    return
+                self._translate(params, path)
+
+        return Handler
@@ -0,0 +1,104 @@
+"""Per-feed publish cadence, used to skip or delay fetches that are unlikely to return anything new.
+
+For each feed the model keeps the newest ``published`` time seen so far and a window
+of recent inter-arrival gaps.  After every poll the next poll is scheduled at
+
+    base  = max(floor, median gap * POLL_FRACTION)
+    delay = min(base * 2 ** misses, max_delay)
+
+where ``misses`` counts consecutive polls that brought nothing new, so quiet feeds
+back off exponentially while busy feeds keep being polled at their own pace.
+State is a small JSON file keyed by feed URL.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from output_writer import atomic_write
+
+WINDOW = 50            # inter-arrival gaps remembered per feed
+MIN_SAMPLES = 3        # fewer gaps than this: fall back to the floor
+POLL_FRACTION = 0.5    # poll about twice per expected gap
+SLACK = 0.1            # a poll is due this fraction of its delay early (absorbs scheduler jitter)
+
+
+class CadenceModel:
+    def __init__(self, path: Path, max_delay: float) -> None:
+        self.path = path
+        self.max_delay = max_delay
+        self.enabled = True
+        self._feeds: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if isinstance(data, dict):
+            self._feeds = data
+
+    def expected_gap(self, url: str) -> Optional[float]:
+        """Median seconds between items of ``url``, or None while there is too little history."""
+        gaps = self._feeds.get(url, {}).get("gaps", [])
+        return statistics.median(gaps) if len(gaps) >= MIN_SAMPLES else None
+
+    def due(self, url: str, now: datetime) -> bool:
+        if not self.enabled:
+            return True
+        feed = self._feeds.get(url)
+        if not feed or "next_poll" not in feed:
+            return True
+        slack = timedelta(seconds=feed.get("delay", 0) * SLACK)
+        return now + slack >= datetime.fromisoformat(feed["next_poll"])
+
+    def delay(self, url: str, floor: float) -> float:
+        """Seconds until ``url`` should be polled again (``floor`` when the model is off or cold)."""
+        if not self.enabled:
+            return floor
+        return self._feeds.get(url, {}).get("delay", floor)
+
+    def observe(self, url: str, published: Iterable[datetime], now: datetime, floor: float) -> int:
+        """Record one poll of ``url``; returns how many items were newer than anything seen before."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            feed = self._feeds.setdefault(url, {"gaps": [], "misses": 0})
+            last = datetime.fromisoformat(feed["last_item"]) if feed.get("last_item") else None
+            fresh = sorted(t for t in published if last is None or t > last)
+            previous = last
+            for stamp in fresh:
+                if previous is not None:
+                    feed["gaps"].append(max(0.0, (stamp - previous).total_seconds()))
+                previous = stamp
+            del feed["gaps"][:-WINDOW]
+            if fresh:
+                feed["last_item"] = fresh[-1].isoformat()
+                feed["misses"] = 0
+            else:
+                feed["misses"] += 1
+
+            base = floor
+            expected = self.expected_gap(url)
+            if expected is not None:
+                base = max(floor, expected * POLL_FRACTION)
+            delay = min(base * 2 ** min(feed["misses"], 32), max(self.max_delay, floor))
+            feed["delay"] = delay
+            feed["next_poll"] = (now + timedelta(seconds=delay)).isoformat()
+            self._dirty = True
+            return len(fresh)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty or not self.enabled:
+                return
+            atomic_write(self.path, json.dumps(self._feeds, ensure_ascii=False, indent=1))
+            self._dirty = False
@@ -0,0 +1,143 @@
+"""Story clustering: group different articles about the same event.
+
+dedup.py only collapses copies of one article (same URL, near-identical text).  Two
+outlets writing up the same chip deal or funding round use different words, so
+this stage compares TF-IDF vectors instead:
+
+* every article becomes a sparse, L2-normalised TF-IDF vector over its title
+  (weighted ``TITLE_WEIGHT``) and summary, keeping its ``MAX_TERMS`` heaviest terms;
+  idf comes from the batch being clustered;
+* articles are added one at a time, oldest first (leader clustering): an article
+  joins the cluster whose centroid has the highest cosine similarity, if that is at
+  least ``SIMILARITY``, and starts a new cluster otherwise;
+* candidate clusters are found through an inverted index over *anchor* terms: the
+  ``ANCHOR_TERMS`` rarest terms of each article that some other article also uses,
+  which for news are the named entities and figures that write-ups of one event
+  share.  An article is only compared with clusters holding one of its anchors, and
+  the exact cosine is then computed against those centroids.  Terms in more than ``MAX_DF`` of the
+  batch carry almost no idf weight and are dropped from the vectors altogether.
+
+Centroids are kept as unnormalised sums with a running squared norm, so adding a
+member costs one pass over its own terms and nothing is ever compared pairwise.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Sequence, Set, TypeVar
+
+from search_index import tokenize
+
+T = TypeVar("T")
+
+SIMILARITY = 0.2       # cosine between an article and a centroid needed to join that cluster
+TITLE_WEIGHT = 2
+MAX_TERMS = 24         # heaviest terms kept per article vector
+ANCHOR_TERMS = 8       # rarest terms per article used to look up candidate clusters
+MAX_DF = 0.2           # terms in more than this fraction of the batch are dropped...
+MIN_DF_CAP = 8         # ...unless they occur in at most this many articles (small batches)
+
+Vector = Dict[str, float]
+
+
+def term_counts(title: str, summary: str) -> Counter:
+    counts = Counter(tokenize(summary))
+    for token in tokenize(title):
+        counts[token] += TITLE_WEIGHT
+    return counts
+
+
+def document_frequencies(documents: Iterable[Counter]) -> Counter:
+    df: Counter = Counter()
+    for counts in documents:
+        df.update(counts.keys())
+    return df
+
+
+def idf_table(df: Counter, total: int) -> Dict[str, float]:
+    """Smoothed idf of every term below the document-frequency cap."""
+    cap = max(MIN_DF_CAP, MAX_DF * total)
+    return {term: math.log((1 + total) / (1 + freq)) + 1.0 for term, freq in df.items() if freq <= cap}
+
+
+def tfidf_vector(counts: Counter, idf: Dict[str, float]) -> Vector:
+    """Sublinear tf x idf over the indexed terms, pruned to MAX_TERMS and L2-normalised."""
+    weights = [((1.0 + math.log(tf)) * idf[term], term) for term, tf in counts.items() if term in idf]
+    if len(weights) > MAX_TERMS:
+        weights.sort(reverse=True)
+        del weights[MAX_TERMS:]
+    norm = math.sqrt(sum(weight * weight for weight, _ in weights))
+    return {term: weight / norm for weight, term in weights} if norm else {}
+
+
+class StoryClusters:
+    """Incremental leader clustering of unit vectors by cosine similarity to cluster centroids."""
+
+    def __init__(self, similarity: float = SIMILARITY) -> None:
+        self.similarity = similarity
+        self.centroids: List[Vector] = []      # per cluster: sum of member vectors
+        self.norms_sq: List[float] = []        # per cluster: squared norm of that sum
+        self.members: List[List[int]] = []     # per cluster: item numbers, in insertion order
+        self._postings: Dict[str, Set[int]] = {}   # anchor term -> clusters
+        self._count = 0
+
+    def add(self, vector: Vector, anchors: Sequence[str]) -> int:
+        """Place the next item, looking up candidates by its ``anchors``; returns its cluster number."""
+        item = self._count
+        self._count += 1
+        candidates: Set[int] = set()
+        for term in anchors:
+            candidates.update(self._postings.get(term, ()))
+
+        best, best_cosine, best_dot = -1, self.similarity, 0.0
+        for cluster in candidates:
+            centroid = self.centroids[cluster]
+            dot = sum(weight * centroid.get(term, 0.0) for term, weight in vector.items())
+            cosine = dot / math.sqrt(self.norms_sq[cluster])
+            if cosine >= best_cosine:
+                best, best_cosine, best_dot = cluster, cosine, dot
+        if best < 0:
+            best = len(self.centroids)
+            self.centroids.append({})
+            self.norms_sq.append(0.0)
+            self.members.append([])
+            best_dot = 0.0
+
+        centroid = self.centroids[best]
+        for term, weight in vector.items():
+            centroid[term] = centroid.get(term, 0.0) + weight
+        for term in anchors:
+            self._postings.setdefault(term, set()).add(best)
+        # |s + v|^2 = |s|^2 + 2 s.v + |v|^2, with |v| = 1 for any non-empty vector.
+        self.norms_sq[best] += 2.0 * best_dot + (1.0 if vector else 0.0)
+        self.members[best].append(item)
+        return best
+
+
+def cluster(items: Sequence[T], *, title: Callable[[T], str], summary: Callable[[T], str],
+            order_key: Callable[[T], object], on_member: Callable[[T, T], None],
+            similarity: float = SIMILARITY) -> List[T]:
+    """Group ``items`` into stories, keeping the item with the smallest ``order_key`` of each.
+
+    ``on_member(kept, other)`` is called for every other item of a story.
+    """
+    ordered = sorted(items, key=order_key)
+    counts = [term_counts(title(item), summary(item)) for item in ordered]
+    df = document_frequencies(counts)
+    idf = idf_table(df, len(counts))
+    clusters = StoryClusters(similarity)
+    for item_counts in counts:
+        vector = tfidf_vector(item_counts, idf)
+        # A term no other article uses cannot lead to a match.
+        shared = (term for term in vector if df[term] > 1)
+        clusters.add(vector, heapq.nsmallest(ANCHOR_TERMS, shared, key=df.__getitem__))
+
+    kept: List[T] = []
+    for members in clusters.members:
+        leader = ordered[members[0]]
+        for number in members[1:]:
+            on_member(leader, ordered[number])
+        kept.append(leader)
+    return kept
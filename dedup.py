@@ -0,0 +1,184 @@
+"""Near-duplicate detection for aggregated articles.
+
+Two checks, cheapest first:
+
+1. URL canonicalization: tracking parameters, ``www.``, scheme, fragments and
+   redirect wrappers (``?url=https://...``) are normalised away, so syndicated
+   links to the same page compare equal.
+2. 64-bit SimHash fingerprints over title + summary tokens, looked up through a
+   banded index (4 x 16-bit bands).  Two fingerprints within ``MAX_DISTANCE`` bits
+   share at least one band, so a lookup only inspects one bucket per band instead
+   of every previous article.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+T = TypeVar("T")
+
+FINGERPRINT_BITS = 64
+BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // BANDS
+MAX_DISTANCE = BANDS - 1       # pigeonhole: <= 3 differing bits leaves one band intact
+MIN_TOKENS = 4                 # shorter texts are too ambiguous to fingerprint
+MAX_TOKENS = 400               # keeps per-bit counters far below COUNTER_WIDTH overflow
+TITLE_WEIGHT = 2
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "mkt_tok",
+    "ref", "ref_src", "referrer", "cmpid", "guccounter", "guce_referrer", "guce_referrer_sig",
+    "_hsenc", "_hsmi", "src", "source", "ito", "sr_share", "smid", "spm",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "__twitter")
+REDIRECT_PARAMS = ("url", "u", "target", "dest", "destination", "redirect", "redirect_url", "link", "to")
+STRIP_HOST_PREFIXES = ("www.", "m.", "amp.")
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[一-鿿]")
+
+# SimHash counters are kept bit-sliced in one big int: bit i of a feature hash is
+# spread to position COUNTER_WIDTH * i, so summing features is one big-int add per
+# feature instead of 64 Python-level additions.
+COUNTER_WIDTH = 16
+_COUNTER_MASK = (1 << COUNTER_WIDTH) - 1
+
+
+def _spread_byte(byte: int) -> int:
+    value = 0
+    for bit in range(8):
+        if byte >> bit & 1:
+            value |= 1 << (COUNTER_WIDTH * bit)
+    return value
+
+
+_SPREAD = [[_spread_byte(b) << (COUNTER_WIDTH * 8 * k) for b in range(256)] for k in range(8)]
+
+
+def canonical_url(url: str) -> str:
+    """Normalise ``url`` so equivalent article links compare equal."""
+    parts = urlsplit(url.strip())
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for key, value in query:
+        if key.lower() in REDIRECT_PARAMS and value.startswith(("http://", "https://")):
+            return canonical_url(value)
+
+    host = (parts.hostname or "").lower()
+    for prefix in STRIP_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    kept = sorted(
+        (key, value) for key, value in query
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return urlunsplit(("https", host, path, urlencode(kept), ""))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _feature_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(title: str, summary: str = "") -> Optional[int]:
+    """64-bit SimHash of the title (weighted) and summary tokens; None if there is too little text."""
+    title_tokens = tokenize(title)
+    summary_tokens = tokenize(summary)[:MAX_TOKENS]
+    if len(title_tokens) + len(summary_tokens) < MIN_TOKENS:
+        return None
+
+    weights: Dict[str, int] = {}
+    for token in title_tokens:
+        weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+    for token in summary_tokens:
+        weights[token] = weights.get(token, 0) + 1
+
+    total = 0
+    sliced = 0
+    for token, weight in weights.items():
+        h = _feature_hash(token)
+        spread = 0
+        for k in range(8):
+            spread |= _SPREAD[k][h >> (8 * k) & 0xFF]
+        sliced += spread * weight
+        total += weight
+
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if 2 * (sliced >> (COUNTER_WIDTH * bit) & _COUNTER_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class SimHashIndex:
+    """Banded index answering "is there a stored fingerprint within MAX_DISTANCE bits?"."""
+
+    def __init__(self, max_distance: int = MAX_DISTANCE) -> None:
+        self.max_distance = max_distance
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+        self._items: List[tuple] = []
+
+    @staticmethod
+    def _band_keys(fingerprint: int) -> Iterable[int]:
+        mask = (1 << BAND_BITS) - 1
+        return (fingerprint >> (BAND_BITS * band) & mask for band in range(BANDS))
+
+    def add(self, fingerprint: int, value: object) -> None:
+        slot = len(self._items)
+        self._items.append((fingerprint, value))
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            self._bands[band].setdefault(key, []).append(slot)
+
+    def find(self, fingerprint: int) -> Optional[object]:
+        best = None
+        best_distance = self.max_distance + 1
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            for slot in self._bands[band].get(key, ()):
+                other, value = self._items[slot]
+                distance = (fingerprint ^ other).bit_count()
+                if distance < best_distance:
+                    best, best_distance = value, distance
+        return best
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def dedupe(items: Sequence[T], *, link: Callable[[T], str], title: Callable[[T], str],
+           summary: Callable[[T], str], order_key: Callable[[T], object],
+           on_duplicate: Callable[[T, T], None]) -> List[T]:
+    """Collapse duplicates, keeping the item with the smallest ``order_key`` of each group.
+
+    ``on_duplicate(kept, dropped)`` is called for every collapsed item.
+    """
+    by_url: Dict[str, T] = {}
+    index = SimHashIndex()
+    kept: List[T] = []
+    for item in sorted(items, key=order_key):
+        url = canonical_url(link(item))
+        original = by_url.get(url)
+        fingerprint = None
+        if original is None:
+            fingerprint = simhash(title(item), summary(item))
+            if fingerprint is not None:
+                original = index.find(fingerprint)
+        if original is not None:
+            on_duplicate(original, item)
+            by_url.setdefault(url, original)
+            continue
+        by_url[url] = item
+        if fingerprint is not None:
+            index.add(fingerprint, item)
+        kept.append(item)
+    return kept
@@ -0,0 +1,78 @@
+"""Fragment cache for index.html: each page section is rendered and stored on its own.
+
+A fragment is kept as ``<root>/<name>.html`` with its SHA-256 in ``<root>/manifest.json``;
+``update`` writes only the fragments whose hash changed.  The page is assembled by
+joining cached fragments into a fixed layout, so re-rendering one section (e.g. the
+RAG block after a fetch) needs neither the other sections' inputs nor the previous
+page: nothing reads or parses index.html.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from output_writer import atomic_write
+
+
+def digest(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class FragmentCache:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict[str, str]] = None
+        self._bodies: Dict[str, str] = {}    # fragments read or written by this process
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    def _hashes(self) -> Dict[str, str]:
+        if self._manifest is None:
+            try:
+                self._manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._manifest = {}
+        return self._manifest
+
+    def update(self, fragments: Dict[str, str]) -> List[str]:
+        """Store ``fragments`` (name -> HTML); returns the names whose content changed."""
+        with self._lock:
+            hashes = self._hashes()
+            changed = []
+            for name, html in fragments.items():
+                value = digest(html)
+                if hashes.get(name) == value and (name in self._bodies or (self.root / f"{name}.html").exists()):
+                    self._bodies[name] = html
+                    continue
+                atomic_write(self.root / f"{name}.html", html)
+                hashes[name] = value
+                self._bodies[name] = html
+                changed.append(name)
+            if changed:
+                atomic_write(self._manifest_path, json.dumps(hashes, indent=2, sort_keys=True))
+            return changed
+
+    def load(self, names: Iterable[str]) -> Optional[Dict[str, str]]:
+        """The cached fragments ``names``, or None if any is missing or does not match its hash."""
+        with self._lock:
+            hashes = self._hashes()
+            fragments = {}
+            for name in names:
+                html = self._bodies.get(name)
+                if html is None:
+                    try:
+                        html = (self.root / f"{name}.html").read_text(encoding="utf-8")
+                    except OSError:
+                        return None
+                    if digest(html) != hashes.get(name):
+                        return None
+                    self._bodies[name] = html
+                fragments[name] = html
+            return fragments
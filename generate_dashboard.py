@@ -3,42 +3,124 @@
 
 from __future__ import annotations
 
+import argparse
+import gzip
+import hashlib
+import io
 import json
+import os
 import re
+import signal
+import threading
+import time
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from html import escape, unescape
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 
-WORKSPACE = Path("/home/ubuntu/.openclaw/workspace/ai-dashboard")
+import clustering
+import dedup
+import fragments
+import http_client
+import snapshot as snapshots
+from cadence import CadenceModel
+from metrics import METRICS
+from output_writer import OUTPUTS, atomic_write
+from rag_index import RagIndex
+from rag_store import RagStore
+from ranking import FeatureTable, RankingConfig, rank_sections
+from search_index import SearchIndex, parse_history
+from seen_index import SeenIndex
+from timeline_store import TimelineStore
+
+WORKSPACE = Path(os.environ.get("AI_DASHBOARD_WORKSPACE", "/home/ubuntu/.openclaw/workspace/ai-dashboard"))
 DASHBOARD_MD = WORKSPACE / "DASHBOARD.md"
 DASHBOARD_HTML = WORKSPACE / "index.html"
-RAG_DATA_FILE = WORKSPACE / "rag_data" / "rag_data.json"
+RAG_DATA_FILE = WORKSPACE / "rag_data" / "rag_data.json"   # hand-edited / sample data, used without a store
+RAG_STORE_FILE = WORKSPACE / "rag_data" / "rag_store.db"   # written by rag_system/fetch_papers.py
+RAG_INDEX_DIR = WORKSPACE / "rag_index"   # every RAG item ever fetched (rag_index.py)
+RAG_LIMITS = {"papers": 3, "projects": 4, "models": 2}
 LOG_FILE = WORKSPACE / "update.log"
 HISTORY_DIR = WORKSPACE / "history"
 TIMELINE_FILE = WORKSPACE / "timeline.md"
 TIMELINE_JSON = WORKSPACE / "timeline.json"
 TIMELINE_UI_LIMIT = 7
-TIMELINE_STORE_LIMIT = 90
+TIMELINE_DB = WORKSPACE / "timeline.db"
+SEARCH_INDEX_DIR = WORKSPACE / "search"
+TIMELINE_JSON_LIMIT = 90       # days exported to timeline.json; timeline.md gets everything kept
+TIMELINE_RETENTION_DAYS: Optional[int] = None   # None keeps every day in the store
+CACHE_DIR = WORKSPACE / "cache"
+TRANSLATION_CACHE_FILE = CACHE_DIR / "translations.json"
+TRANSLATION_CACHE_TTL_DAYS = 14
+TRANSLATION_CACHE_MAX_ENTRIES = 5000
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+SEEN_INDEX_FILE = CACHE_DIR / "seen.idx"
+CADENCE_FILE = CACHE_DIR / "cadence.json"
+FRAGMENT_DIR = CACHE_DIR / "fragments"   # index.html sections, rendered separately (fragments.py)
+HTML_FRAGMENTS = ("header", "news", "rag", "timeline", "automation")
+RAG_QUERIES_FILE = CACHE_DIR / "rag_queries.json"   # article titles the last RAG selection used
+CADENCE_MAX_DELAY = 24 * 3600   # longest a quiet feed is left unpolled, however far it backs off
+METRICS_FILE = WORKSPACE / "metrics.json"
+CHANGES_FILE = WORKSPACE / "changes.json"   # which published artifacts the last run changed
+# Optional node-exporter textfile, e.g. /var/lib/node_exporter/textfile/ai_dashboard.prom
+PROMETHEUS_TEXTFILE = Path(os.environ["AI_DASHBOARD_PROM_FILE"]) if os.environ.get("AI_DASHBOARD_PROM_FILE") else None
+SEEN_POLICY = "demote"     # articles featured on an earlier day: "demote" below fresh ones, or "skip"
 
 ATOM_NS = "{http://www.w3.org/2005/Atom}"
-USER_AGENT = "Mozilla/5.0 (AI-Dashboard-Aggregator)"
-TRANSLATE_ENDPOINT = "https://translate.googleapis.com/translate_a/single"
+TRANSLATE_BATCH_ENDPOINT = "https://translate.googleapis.com/translate_a/t"
+TRANSLATE_TARGET = "zh-TW"
+TRANSLATE_BATCH_CHARS = 4500   # source characters per request; the endpoint rejects ~5k+
+TRANSLATE_BATCH_ITEMS = 64
 LOOKBACK_HOURS = 36
 MIN_ARTICLES = 6
 SUMMARY_LIMIT = 400
-
+FETCH_WORKERS = 8          # max feeds fetched at the same time
+FETCH_TIMEOUT = 20         # seconds allowed per source (connect + download)
+FETCH_BUDGET = 60          # wall-clock seconds for the whole fetch stage
+DEFAULT_POLL_INTERVAL = 900   # poll floor (seconds) for a source without its own "interval"
+STORY_SIMILARITY = 0.2     # TF-IDF cosine at which two articles count as the same story (clustering.py)
+
+# Ranking (see ranking.py): recency half-life, per-source weights, multi-source coverage,
+# and keyword multipliers matched case-insensitively on title + summary.
+RANKING = RankingConfig(
+    half_life_hours=18.0,
+    source_weights={
+        "MIT Technology Review · AI": 1.15,
+        "TechCrunch · Artificial Intelligence": 1.0,
+        "VentureBeat · AI": 1.0,
+        "ScienceDaily · AI": 0.9,
+        "AI Trends": 0.8,
+    },
+    coverage_weight=0.5,
+    keyword_weights={
+        r"openai|anthropic|deepmind|nvidia|gpt-?\d\w*|claude|gemini|llama": 1.25,
+        r"agents?|agentic|llms?|foundation models?|reasoning|benchmarks?": 1.15,
+        # Promotions and event marketing are not news.
+        r"tickets?|save up to|discounts?|early[- ]bird|register now|webinars?|sponsored|last chance|final \d+ days": 0.15,
+    },
+    section_topics={
+        "industry": r"funding|raises?|raised|acqui\w+|deals?|enterprises?|startups?|revenue|valuation|ipo|partnerships?|layoffs?|ceo|coo",
+        "highlights": r"research\w*|study|studies|paper|analysis|why|how|explain\w*|interview|opinion|scientists?",
+    },
+    section_affinity=1.6,
+    min_prior=0.3,
+)
+
+# "interval" is the shortest time (seconds) between polls; the cadence model (cadence.py)
+# stretches it for feeds that publish rarely or keep coming back empty.
 RSS_SOURCES = [
-    {"name": "VentureBeat · AI", "url": "https://venturebeat.com/category/ai/feed/"},
-    {"name": "TechCrunch · Artificial Intelligence", "url": "https://techcrunch.com/category/artificial-intelligence/feed/"},
-    {"name": "MIT Technology Review · AI", "url": "https://www.technologyreview.com/feed/?category_name=artificial-intelligence"},
-    {"name": "ScienceDaily · AI", "url": "https://www.sciencedaily.com/rss/computers_math/artificial_intelligence.xml"},
-    {"name": "AI Trends", "url": "https://www.aitrends.com/feed/"},
+    {"name": "VentureBeat · AI", "url": "https://venturebeat.com/category/ai/feed/", "interval": 600},
+    {"name": "TechCrunch · Artificial Intelligence", "url": "https://techcrunch.com/category/artificial-intelligence/feed/", "interval": 600},
+    {"name": "MIT Technology Review · AI", "url": "https://www.technologyreview.com/feed/?category_name=artificial-intelligence", "interval": 1800},
+    {"name": "ScienceDaily · AI", "url": "https://www.sciencedaily.com/rss/computers_math/artificial_intelligence.xml", "interval": 3600},
+    {"name": "AI Trends", "url": "https://www.aitrends.com/feed/", "interval": 3600},
 ]
 
 
@@ -46,17 +128,41 @@ RSS_SOURCES = [
 # Helpers
 # ---------------------------------------------------------------------------
 
+_LOG_LOCK = threading.Lock()
+
+
 def log(message: str) -> None:
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_FILE.open("a", encoding="utf-8") as fh:
-        fh.write(f"[{timestamp}] {message}\n")
+    with _LOG_LOCK:
+        LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with LOG_FILE.open("a", encoding="utf-8") as fh:
+            fh.write(f"[{timestamp}] {message}\n")
+
+
+FROZEN_NOW: Optional[datetime] = None   # pinned by --record/--replay so a run is reproducible
+RECORDING: Optional[snapshots.Snapshot] = None   # --record: also keeps translations and the RAG payload
+REPLAYING: Optional[snapshots.Snapshot] = None   # --replay / backfill: answers them from the snapshot
+
+
+def current_time() -> datetime:
+    """Timezone-aware local time the pipeline treats as "now"."""
+    return FROZEN_NOW if FROZEN_NOW is not None else datetime.now().astimezone()
+
+
+def http_fetch(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 20,
+               deadline: Optional[float] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """GET ``url`` over the shared keep-alive client; returns (status, headers, body), 304 included."""
+    resp = http_client.default_client().get(url, headers=headers, timeout=timeout, deadline=deadline)
+    return resp.status, resp.headers, resp.body
+
+
+def http_get(url: str, timeout: int = 20, deadline: Optional[float] = None) -> bytes:
+    return http_fetch(url, timeout=timeout, deadline=deadline)[2]
 
 
-def http_get(url: str, timeout: int = 20) -> bytes:
-    req = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(req, timeout=timeout) as resp:
-        return resp.read()
+def http_post(url: str, data: bytes, timeout: int = 20) -> bytes:
+    headers = {"Content-Type": "application/x-www-form-urlencoded;charset=utf-8"}
+    return http_client.default_client().post(url, data, headers=headers, timeout=timeout).body
 
 
 def strip_html(text: str) -> str:
@@ -76,25 +182,170 @@ def node_text(element, tag: str) -> str:
     return ""
 
 
+class TranslationCache:
+    """On-disk LRU/TTL cache of translations keyed by sha256(target language + source text).
+
+    Only successful translations are stored, so a flaky endpoint never poisons the cache.
+    """
+
+    def __init__(self, path: Path, ttl_days: int, max_entries: int) -> None:
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.enabled = True
+
+    @staticmethod
+    def key(text: str, target: str) -> str:
+        return hashlib.sha256(f"{target}\0{text}".encode("utf-8")).hexdigest()
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as fh:
+                raw = json.load(fh)
+        except (OSError, json.JSONDecodeError) as exc:
+            log(f"⚠️ 翻譯快取損毀，重新建立：{exc}")
+            return
+        expires_before = time.time() - self.ttl
+        # Stored least-recently-used first, so insertion order restores the LRU order.
+        for key, entry in raw.items():
+            if entry.get("created", 0) >= expires_before:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        # Expired or evicted entries make the file worth rewriting; nothing else here does.
+        self._dirty = len(self._entries) < len(raw)
+
+    def get(self, text: str, target: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        key = self.key(text, target)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get(key)
+            if entry is None or entry.get("created", 0) < time.time() - self.ttl:
+                self.misses += 1
+                return None
+            # Reordered in memory only: the LRU order reaches disk with the next insert or
+            # eviction, so a run that translates nothing new does not rewrite the file.
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["text"]
+
+    def put(self, text: str, target: str, translated: str) -> None:
+        if not self.enabled:
+            return
+        key = self.key(text, target)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._entries[key] = {"text": translated, "created": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            atomic_write(self.path, json.dumps(self._entries, ensure_ascii=False))
+            self._dirty = False
+        log(f"💾 翻譯快取已保存（命中 {self.hits}、未命中 {self.misses}、共 {len(self._entries)} 筆）")
+
+
+TRANSLATION_CACHE = TranslationCache(TRANSLATION_CACHE_FILE, TRANSLATION_CACHE_TTL_DAYS, TRANSLATION_CACHE_MAX_ENTRIES)
+
+
+def _pack_batches(texts: List[str]) -> List[List[str]]:
+    batches: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for text in texts:
+        if current and (size + len(text) > TRANSLATE_BATCH_CHARS or len(current) >= TRANSLATE_BATCH_ITEMS):
+            batches.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _request_batch(batch: List[str]) -> List[str]:
+    body = urlencode(
+        [("client", "gtx"), ("sl", "auto"), ("tl", TRANSLATE_TARGET)] + [("q", text) for text in batch]
+    ).encode("utf-8")
+    data = json.loads(http_post(TRANSLATE_BATCH_ENDPOINT, body, timeout=15).decode("utf-8"))
+    # One q comes back as a bare value; each item is either "譯文" or ["譯文", "偵測語言"].
+    if len(batch) == 1 and not (isinstance(data, list) and len(data) == 1):
+        data = [data]
+    if not isinstance(data, list) or len(data) != len(batch):
+        raise ValueError(f"批次回應數量不符（送出 {len(batch)}，收到 {len(data) if isinstance(data, list) else '?'}）")
+    results = []
+    for item in data:
+        if isinstance(item, list):
+            item = item[0] if item else ""
+        if not isinstance(item, str):
+            raise ValueError(f"無法解析批次翻譯結果：{item!r}")
+        results.append(item.strip())
+    return results
+
+
+def translate_batch(texts: List[str]) -> List[str]:
+    """Translate ``texts`` with as few requests as possible; failed batches keep the original text.
+
+    A replay takes each text's translation from the snapshot (SnapshotMiss if it has none).
+    """
+    results = list(texts)
+    pending: Dict[str, List[int]] = {}
+    for index, text in enumerate(texts):
+        if not text:
+            continue
+        source = text[:SUMMARY_LIMIT]
+        cached = TRANSLATION_CACHE.get(source, TRANSLATE_TARGET)
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending.setdefault(source, []).append(index)
+
+    if REPLAYING is not None:
+        for source, indexes in pending.items():
+            result = REPLAYING.translation(TRANSLATE_TARGET, source)
+            for index in indexes:
+                results[index] = result
+        return results
+    for batch in _pack_batches(list(pending)):
+        try:
+            translated = _request_batch(batch)
+        except Exception as exc:  # pragma: no cover
+            log(f"⚠️ 批次翻譯失敗（{len(batch)} 則改用原文）：{exc}")
+            METRICS.count("translate", errors=1)
+            continue
+        for source, result in zip(batch, translated):
+            if not result:
+                continue
+            TRANSLATION_CACHE.put(source, TRANSLATE_TARGET, result)
+            for index in pending[source]:
+                results[index] = result
+    if RECORDING is not None:
+        # What the page showed, failed batches (original text) included.
+        for source, indexes in pending.items():
+            RECORDING.record_translation(TRANSLATE_TARGET, source, results[indexes[0]])
+    return results
+
+
 def translate_to_traditional(text: str) -> str:
-    if not text:
-        return ""
-    params = urlencode({
-        "client": "gtx",
-        "sl": "auto",
-        "tl": "zh-TW",
-        "dt": "t",
-        "q": text[:SUMMARY_LIMIT],
-    })
-    url = f"{TRANSLATE_ENDPOINT}?{params}"
-    try:
-        raw = http_get(url, timeout=15)
-        data = json.loads(raw.decode("utf-8"))
-        translated = "".join(segment[0] for segment in data[0] if segment[0])
-        return translated.strip()
-    except Exception as exc:  # pragma: no cover
-        log(f"⚠️ 翻譯失敗（改用原文）：{exc}")
-        return text
+    return translate_batch([text])[0]
 
 
 @dataclass
@@ -104,94 +355,445 @@ class Article:
     source: str
     published: datetime
     summary: str
+    # Other sources' copies of the same story, collapsed into this one.
+    related: List["Article"] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "title": self.title,
+            "link": self.link,
+            "source": self.source,
+            "published": self.published.isoformat(),
+            "summary": self.summary,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "Article":
+        return cls(
+            title=data["title"],
+            link=data["link"],
+            source=data["source"],
+            published=datetime.fromisoformat(data["published"]),
+            summary=data["summary"],
+        )
+
+    def also_covered_by(self) -> List["Article"]:
+        """The first related article of every other source, earliest first."""
+        others: Dict[str, Article] = {}
+        for other in sorted(self.related, key=lambda a: a.published):
+            if other.source != self.source:
+                others.setdefault(other.source, other)
+        return list(others.values())
 
     def to_markdown(self) -> str:
         date_str = self.published.strftime("%Y-%m-%d %H:%M %Z")
-        return (
+        markdown = (
             f"- **[{self.title}]({self.link})**  _{self.source} · {date_str}_  \n"
             f"  {self.summary}"
         )
+        others = self.also_covered_by()
+        if others:
+            markdown += "  \n  ↳ 其他報導：" + " · ".join(f"[{other.source}]({other.link})" for other in others)
+        return markdown
 
     def to_html(self) -> str:
         date_str = self.published.strftime("%Y-%m-%d %H:%M %Z")
+        others = self.also_covered_by()
+        also = ""
+        if others:
+            links = "、".join(
+                f"<a href=\"{escape(other.link)}\" target=\"_blank\">{escape(other.source)}</a>" for other in others
+            )
+            also = f"<p class=\"also-covered\">其他報導：{links}</p>"
         return (
             "<li>"
             f"<strong><a href=\"{escape(self.link)}\" target=\"_blank\">{escape(self.title)}</a></strong><br>"
             f"<span class=\"source\">{escape(self.source)} · {date_str}</span>"
             f"<p>{escape(self.summary)}</p>"
+            f"{also}"
             "</li>"
         )
 
 
+# ---------------------------------------------------------------------------
+# Conditional GET cache
+# ---------------------------------------------------------------------------
+
+class FeedCache:
+    """Per-URL store of HTTP validators, the last feed body and the articles parsed from it.
+
+    Layout: ``<root>/<sha1(url)>/{meta.json, body.gz, articles.json}``.  Files are written
+    atomically and meta.json (the validators) last, so validators never outlive a torn
+    or missing body.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.enabled = True
+
+    def _dir(self, url: str) -> Path:
+        return self.root / hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def validators(self, url: str) -> Dict[str, str]:
+        if not self.enabled:
+            return {}
+        meta_path = self._dir(url) / "meta.json"
+        if not meta_path.exists() or not (self._dir(url) / "body.gz").exists():
+            return {}
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(self, url: str, body: bytes, headers: Dict[str, str]) -> None:
+        if not self.enabled:
+            return
+        folder = self._dir(url)
+        (folder / "meta.json").unlink(missing_ok=True)
+        atomic_write(folder / "body.gz", gzip.compress(body))
+        (folder / "articles.json").unlink(missing_ok=True)
+        lowered = {key.lower(): value for key, value in headers.items()}
+        meta = {
+            "url": url,
+            "etag": lowered.get("etag", ""),
+            "last_modified": lowered.get("last-modified", ""),
+            "fetched": datetime.now(timezone.utc).isoformat(),
+        }
+        atomic_write(folder / "meta.json", json.dumps(meta, ensure_ascii=False))
+
+    def body(self, url: str) -> Optional[bytes]:
+        """The cached feed body, or None if it is missing or cannot be decoded."""
+        try:
+            return gzip.decompress((self._dir(url) / "body.gz").read_bytes())
+        except (OSError, EOFError, zlib.error):
+            return None
+
+    def drop(self, url: str) -> None:
+        folder = self._dir(url)
+        for name in ("meta.json", "body.gz", "articles.json"):
+            (folder / name).unlink(missing_ok=True)
+
+    def load_articles(self, url: str) -> Optional[List["Article"]]:
+        path = self._dir(url) / "articles.json"
+        if not path.exists():
+            return None
+        try:
+            return [Article.from_dict(item) for item in json.loads(path.read_text(encoding="utf-8"))]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store_articles(self, url: str, articles: List["Article"]) -> None:
+        if not self.enabled:
+            return
+        path = self._dir(url) / "articles.json"
+        if path.parent.exists():
+            atomic_write(path, json.dumps([a.to_dict() for a in articles], ensure_ascii=False))
+
+
+FEED_CACHE = FeedCache(HTTP_CACHE_DIR)
+CADENCE = CadenceModel(CADENCE_FILE, CADENCE_MAX_DELAY)
+FRAGMENTS = fragments.FragmentCache(FRAGMENT_DIR)
+
+
 # ---------------------------------------------------------------------------
 # Aggregation
 # ---------------------------------------------------------------------------
 
-def parse_feed(data: bytes, source: str) -> List[Article]:
+FEED_ITEM_TAGS = ("item", ATOM_NS + "entry")
+EARLY_STOP_MIN_ITEMS = 2   # the "2 newest" fallback must still be answerable
+
+
+def _iter_feed_items(data: bytes):
+    """Yield RSS <item> / Atom <entry> elements in document order, freeing each one afterwards."""
+    stack = []
+    for event, elem in ET.iterparse(io.BytesIO(data), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag in FEED_ITEM_TAGS:
+            yield elem
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def _item_link(item) -> str:
+    link = node_text(item, "link")
+    if link:
+        return link
+    fallback = ""
+    for link_el in item.findall("link") + item.findall(ATOM_NS + "link"):
+        href = (link_el.get("href") or link_el.text or "").strip()
+        if href and link_el.get("rel", "alternate") == "alternate":
+            return href
+        fallback = fallback or href
+    return fallback
+
+
+def _parse_date(raw: str) -> datetime:
+    try:
+        pub_dt = parsedate_to_datetime(raw)
+    except Exception:
+        try:
+            pub_dt = datetime.fromisoformat(raw)  # Atom uses RFC 3339
+        except ValueError:
+            return current_time().astimezone(timezone.utc)
+    if pub_dt.tzinfo is None:
+        return pub_dt.replace(tzinfo=timezone.utc)
+    return pub_dt.astimezone(timezone.utc)
+
+
+def parse_feed(data: bytes, source: str, cutoff: Optional[datetime] = None) -> List[Article]:
+    """Stream-parse an RSS or Atom feed in one pass.
+
+    With ``cutoff``, parsing stops at the first item older than the cutoff as long as the
+    feed has been newest-first so far and the fallback already has enough items.
+    """
     articles: List[Article] = []
+    previous: Optional[datetime] = None
+    sorted_desc = True
     try:
-        root = ET.fromstring(data)
+        for item in _iter_feed_items(data):
+            title = node_text(item, "title")
+            link = _item_link(item)
+            if not title or not link:
+                continue
+            pub_date_raw = node_text(item, "pubDate") or node_text(item, "published") or node_text(item, "updated")
+            summary_raw = node_text(item, "description") or node_text(item, "summary")
+            pub_dt = _parse_date(pub_date_raw)
+            articles.append(Article(title=title, link=link, source=source, published=pub_dt, summary=strip_html(summary_raw)))
+
+            if previous is not None and pub_dt > previous:
+                sorted_desc = False
+            previous = pub_dt
+            if cutoff and sorted_desc and pub_dt < cutoff and len(articles) >= EARLY_STOP_MIN_ITEMS:
+                break
     except ET.ParseError as exc:
-        log(f"❌ 無法解析 {source} RSS：{exc}")
-        return articles
-
-    items = root.findall(".//item")
-    if not items:
-        items = root.findall(f".//{ATOM_NS}entry")
-
-    for item in items:
-        title = node_text(item, "title")
-        link = node_text(item, "link")
-        if not link:
-            link_el = item.find("link") or item.find(ATOM_NS + "link")
-            if link_el is not None:
-                link = (link_el.get("href") or link_el.text or "").strip()
-        pub_date_raw = node_text(item, "pubDate") or node_text(item, "updated")
-        summary_raw = node_text(item, "description") or node_text(item, "summary")
-        summary = translate_to_traditional(strip_html(summary_raw))
-
-        if not title or not link:
-            continue
+        log(f"❌ 無法解析 {source} RSS（保留已解析 {len(articles)} 則）：{exc}")
+    return articles
 
-        try:
-            pub_dt = parsedate_to_datetime(pub_date_raw)
-            if pub_dt.tzinfo is None:
-                pub_dt = pub_dt.replace(tzinfo=timezone.utc)
-            else:
-                pub_dt = pub_dt.astimezone(timezone.utc)
-        except Exception:
-            pub_dt = datetime.now(timezone.utc)
 
-        articles.append(Article(title=title, link=link, source=source, published=pub_dt, summary=summary))
-    return articles
+def fetch_source(source: Dict[str, str], cutoff: datetime, budget: Optional[float] = None) -> List[Article]:
+    """Recent articles of one feed; ``budget`` (time.monotonic) caps its FETCH_TIMEOUT deadline."""
+    url, name = source["url"], source["name"]
+    deadline = time.monotonic() + FETCH_TIMEOUT
+    if budget is not None:
+        deadline = min(deadline, budget)
+    with METRICS.stage("fetch", source=name) as stage:
+        status, headers, data = http_fetch(url, FEED_CACHE.validators(url), timeout=FETCH_TIMEOUT, deadline=deadline)
+        stage.bytes = len(data)
+    parsed: Optional[List[Article]] = None
+    if status == 304:
+        with METRICS.stage("parse", source=name) as stage:
+            parsed = cached_articles(url, name, cutoff)
+            stage.items = len(parsed or [])
+        if parsed is None:
+            # The server says "unchanged" but the cached body is gone or torn: start over.
+            log(f"⚠️ {name} 快取內容無法讀取，捨棄快取並重新完整抓取")
+            FEED_CACHE.drop(url)
+            with METRICS.stage("fetch", source=name) as stage:
+                status, headers, data = http_fetch(url, {}, timeout=FETCH_TIMEOUT, deadline=deadline)
+                stage.bytes = len(data)
+        else:
+            log(f"♻️ {name} 未變更（304），沿用快取")
+    if parsed is None:
+        with METRICS.stage("parse", source=name) as stage:
+            parsed = parse_feed(data, name, cutoff)
+            FEED_CACHE.store(url, data, headers)
+            FEED_CACHE.store_articles(url, parsed)
+            stage.items = len(parsed)
+    return recent_articles(parsed, cutoff)
+
+
+def cached_articles(url: str, name: str, cutoff: datetime) -> Optional[List[Article]]:
+    """Articles of the cached feed body (parsed once, then kept in articles.json); None if unreadable."""
+    parsed = FEED_CACHE.load_articles(url)
+    if parsed is None:
+        body = FEED_CACHE.body(url)
+        if body is None:
+            return None
+        parsed = parse_feed(body, name, cutoff)
+        FEED_CACHE.store_articles(url, parsed)
+    return parsed
+
+
+def recent_articles(parsed: List[Article], cutoff: datetime) -> List[Article]:
+    """Articles newer than ``cutoff``, or the 2 newest if there are none."""
+    recent = [a for a in parsed if a.published >= cutoff]
+    if not recent:
+        recent = sorted(parsed, key=lambda a: a.published, reverse=True)[:2]
+    return recent
+
+
+def poll_floor(source: Dict[str, Any]) -> float:
+    return source.get("interval", DEFAULT_POLL_INTERVAL)
 
 
 def collect_news() -> List[Article]:
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
-    aggregated: List[Article] = []
+    """Fetch every source in parallel; total latency tracks the slowest feed, capped by FETCH_BUDGET."""
+    now, cutoff = current_time(), news_cutoff()
+    due: List[Dict[str, Any]] = []
+    skipped: Dict[str, List[Article]] = {}
     for source in RSS_SOURCES:
-        try:
-            data = http_get(source["url"])
-            parsed = parse_feed(data, source["name"])
-            recent = [a for a in parsed if a.published >= cutoff]
-            if not recent:
-                recent = sorted(parsed, key=lambda a: a.published, reverse=True)[:2]
-            aggregated.extend(recent)
-            log(f"✅ {source['name']} 抓到 {len(recent)} 則")
-        except Exception as exc:
-            log(f"❌ 無法抓取 {source['name']}：{exc}")
+        cached = None if CADENCE.due(source["url"], now) else FEED_CACHE.load_articles(source["url"])
+        if cached is None:
+            due.append(source)
+            continue
+        skipped[source["url"]] = recent_articles(cached, cutoff)
+        METRICS.count("fetch_skipped", items=1, source=source["name"])
+        log(f"⏭️ {source['name']} 依發佈節奏暫不抓取，沿用快取 {len(skipped[source['url']])} 則")
+    results = fetch_sources(due, cutoff)
+    results.update(skipped)
+    return merge_articles([article for source in RSS_SOURCES for article in results.get(source["url"], [])])
+
+
+def news_cutoff() -> datetime:
+    return current_time().astimezone(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)
+
+
+def fetch_sources(sources: List[Dict[str, Any]], cutoff: datetime) -> Dict[str, List[Article]]:
+    """Recent articles per source URL; sources that failed or ran out of time are left out."""
+    results: Dict[str, List[Article]] = {}
+    if not sources:
+        return results
+
+    timed_out = False
+    budget = time.monotonic() + FETCH_BUDGET
+    pool = ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(sources)), thread_name_prefix="fetch")
+    futures = {pool.submit(fetch_source, source, cutoff, budget): source for source in sources}
+    try:
+        for future in as_completed(futures, timeout=FETCH_BUDGET):
+            source = futures[future]
+            try:
+                recent = future.result()
+            except snapshots.SnapshotMiss:
+                raise   # the replay diverged from the recording; a partial page would hide it
+            except Exception as exc:
+                log(f"❌ 無法抓取 {source['name']}：{exc}")
+                continue
+            results[source["url"]] = recent
+            fresh = CADENCE.observe(source["url"], [a.published for a in recent], current_time(), poll_floor(source))
+            log(f"✅ {source['name']} 抓到 {len(recent)} 則（新 {fresh} 則）")
+    except FuturesTimeout:
+        timed_out = True
+        for future, source in futures.items():
+            if not future.done():
+                log(f"⏱️ {source['name']} 超過整體時限 {FETCH_BUDGET} 秒，略過")
+                METRICS.count("fetch", errors=1, source=source["name"])
+    finally:
+        # Stragglers share the budget deadline, which bounds every connect and read,
+        # so they close their connections and exit with it instead of delaying shutdown.
+        pool.shutdown(wait=not timed_out, cancel_futures=True)
+    CADENCE.save()
+    return results
+
+
+def merge_articles(aggregated: List[Article]) -> List[Article]:
+    with METRICS.stage("dedup") as stage:
+        aggregated = dedupe_articles(aggregated)
+        stage.items = len(aggregated)
+    with METRICS.stage("cluster") as stage:
+        aggregated = cluster_stories(aggregated)
+        stage.items = len(aggregated)
     aggregated.sort(key=lambda a: a.published, reverse=True)
     return aggregated
 
 
-def split_sections(articles: List[Article]) -> Dict[str, List[Article]]:
+def _article_order(articles: List[Article]):
+    """Earliest first, ties going to the source listed first in RSS_SOURCES."""
+    source_rank = {source["name"]: rank for rank, source in enumerate(RSS_SOURCES)}
+    return lambda a: (a.published, source_rank.get(a.source, len(source_rank)))
+
+
+def _absorb(kept: Article, dropped: Article) -> None:
+    kept.related.append(dropped)
+    kept.related.extend(dropped.related)
+    dropped.related = []
+
+
+def dedupe_articles(articles: List[Article]) -> List[Article]:
+    """Collapse cross-source duplicates; the earliest copy wins, ties go to the source listed first."""
+    unique = dedup.dedupe(
+        articles,
+        link=lambda a: a.link,
+        title=lambda a: a.title,
+        summary=lambda a: a.summary,
+        order_key=_article_order(articles),
+        on_duplicate=_absorb,
+    )
+    if len(unique) < len(articles):
+        log(f"🧹 合併重複報導 {len(articles) - len(unique)} 則")
+    return unique
+
+
+def cluster_stories(articles: List[Article]) -> List[Article]:
+    """Group different write-ups of the same event (see clustering.py); the earliest one is shown."""
+    stories = clustering.cluster(
+        articles,
+        title=lambda a: a.title,
+        summary=lambda a: a.summary,
+        order_key=_article_order(articles),
+        on_member=_absorb,
+        similarity=STORY_SIMILARITY,
+    )
+    if len(stories) < len(articles):
+        log(f"🧩 歸併同一事件的其他報導 {len(articles) - len(stories)} 則")
+    return stories
+
+
+def load_seen_index() -> SeenIndex:
+    seen = SeenIndex.load(SEEN_INDEX_FILE)
+    if seen is None:
+        seen = SeenIndex.bootstrap(SEEN_INDEX_FILE, HISTORY_DIR, TIMELINE_JSON)
+        log(f"🧾 已由歷史檔建立已讀索引（{len(seen)} 筆）")
+    return seen
+
+
+def split_sections(articles: List[Article], seen: Optional[SeenIndex] = None,
+                   day: Optional[date] = None) -> Dict[str, List[Article]]:
+    """Rank ``articles`` (see ranking.py) and fill the sections by score."""
+    demoted: List[int] = []
+    if seen is not None and articles:
+        day = day or current_time().date()
+        repeated = [i for i, a in enumerate(articles) if seen.seen_before(a.title, a.link, day)]
+        if repeated:
+            log(f"🔁 {len(repeated)} 則先前已上榜，{'略過' if SEEN_POLICY == 'skip' else '順延'}")
+            if SEEN_POLICY == "skip":
+                skipped = set(repeated)
+                articles = [a for i, a in enumerate(articles) if i not in skipped]
+            else:
+                demoted = repeated
     if not articles:
         return {"headlines": [], "industry": [], "highlights": []}
-    return {
-        "headlines": articles[:2],
-        "industry": articles[2:6],
-        "highlights": articles[6:8],
-    }
+    with METRICS.stage("rank") as stage:
+        sections = rank_sections(FeatureTable(articles, RANKING), current_time().timestamp(), demoted)
+        stage.items = len(articles)
+    return sections
+
+
+def translate_sections(sections: Dict[str, List[Article]]) -> None:
+    """Translate summaries in place, only for articles that are rendered (the timeline reuses them)."""
+    rendered: List[Article] = []
+    seen = set()
+    for items in sections.values():
+        for article in items:
+            if id(article) not in seen:
+                seen.add(id(article))
+                rendered.append(article)
+    with METRICS.stage("translate") as stage:
+        translated = translate_batch([article.summary for article in rendered])
+        stage.items = len(rendered)
+        stage.bytes = sum(len(article.summary.encode("utf-8")) for article in rendered)
+    for article, summary in zip(rendered, translated):
+        article.summary = summary
+    log(f"🌐 已翻譯 {len(rendered)} 則摘要")
 
 
 # ---------------------------------------------------------------------------
@@ -199,6 +801,10 @@ def split_sections(articles: List[Article]) -> Dict[str, List[Article]]:
 # ---------------------------------------------------------------------------
 
 def load_rag() -> Dict[str, Any]:
+    """The RAG payload: from the fetchers' store when there is one, else rag_data.json."""
+    if RAG_STORE_FILE.exists():
+        with RagStore(RAG_STORE_FILE) as store:
+            return store.rag_data()
     if not RAG_DATA_FILE.exists():
         log("⚠️ 找不到 RAG 資料，略過該區塊")
         return {}
@@ -206,21 +812,80 @@ def load_rag() -> Dict[str, Any]:
         return json.load(fh)
 
 
+_RAG_INDEX: Optional[RagIndex] = None
+
+
+def rag_index() -> RagIndex:
+    """The process-wide RAG retrieval index, opened once (the daemon keeps it for its lifetime)."""
+    global _RAG_INDEX
+    if _RAG_INDEX is None:
+        _RAG_INDEX = RagIndex(RAG_INDEX_DIR)
+    return _RAG_INDEX
+
+
+def rag_queries(sections: Dict[str, List[Article]]) -> List[str]:
+    """The RAG relevance queries for a day: every rendered article title."""
+    return [article.title for items in sections.values() for article in items]
+
+
+def index_rag(rag: Dict[str, Any]) -> RagIndex:
+    """The RAG index with every fetched item added: the fetchers' store records written
+    since the index last synced with it (all of them the first time), or the items of
+    ``rag`` (rag_data.json) when there is no store."""
+    index = rag_index()
+    if RAG_STORE_FILE.exists():
+        with RagStore(RAG_STORE_FILE) as store:
+            synced = index.meta("store_version")
+            version = store.version()
+            if synced is None or not len(index) or version < int(synced):   # new index or store
+                added = sum(index.sync({kind: store.items(kind)}) for kind in RAG_LIMITS)
+            else:
+                added = sum(index.sync({kind: store.items_since(kind, int(synced))}) for kind in RAG_LIMITS)
+            if synced != str(version):
+                index.set_meta("store_version", str(version))
+    else:
+        added = index.sync(rag)
+    index.save()
+    if added:
+        log(f"📚 RAG 索引新增或更新 {added} 筆（共 {len(index)} 筆）")
+    return index
+
+
+def day_rag(queries: List[str]) -> Dict[str, Any]:
+    """The RAG payload of a run: selected for ``queries``, or as recorded when replaying."""
+    if REPLAYING is not None:
+        return json.loads(REPLAYING.load_state("rag.json"))
+    rag = select_rag(load_rag(), queries)
+    if RECORDING is not None:
+        RECORDING.save_state("rag.json", json.dumps(rag, ensure_ascii=False).encode("utf-8"))
+    return rag
+
+
+def select_rag(rag: Dict[str, Any], queries: List[str]) -> Dict[str, Any]:
+    """Keep the indexed RAG items most relevant to ``queries``.
+
+    Kinds with too few matches keep the items of ``rag`` (the latest payload), in order.
+    """
+    if not rag:
+        return rag
+    return {**rag, **index_rag(rag).select(queries, RAG_LIMITS, fallback=rag)}
+
+
 def render_rag_markdown(rag: Dict[str, Any]) -> str:
     if not rag:
         return ""
     lines: List[str] = ["## 🤖 RAG 資訊", "", "### 📚 最新 AI Agent 論文", ""]
-    for paper in rag.get("papers", [])[:3]:
+    for paper in rag.get("papers", [])[:RAG_LIMITS["papers"]]:
         lines.append(f"- **[{paper['title']}]({paper['url']})**  ")
         lines.append(f"  {paper.get('abstract', '').strip()}")
         lines.append("")
     lines.append("### 💻 熱門開源專案\n")
-    for project in rag.get("projects", [])[:4]:
+    for project in rag.get("projects", [])[:RAG_LIMITS["projects"]]:
         lines.append(f"- **[{project['name']}]({project['url']})**  ")
         lines.append(f"  {project.get('description', '').strip()}")
         lines.append("")
     lines.append("### 🤗 Hugging Face 趨勢\n")
-    for model in rag.get("models", [])[:2]:
+    for model in rag.get("models", [])[:RAG_LIMITS["models"]]:
         lines.append(f"- **[{model['name']}]({model['url']})**  ")
         lines.append(f"  {model.get('description', '').strip()}")
         lines.append("")
@@ -247,19 +912,19 @@ def render_rag_html(rag: Dict[str, Any], today: str) -> str:
                 <div class=\"news-card\">
                     <h3>最新論文</h3>
                     <ul>
-                        {_build_list(rag.get('papers', []), ('title', 'url', 'abstract'), 3)}
+                        {_build_list(rag.get('papers', []), ('title', 'url', 'abstract'), RAG_LIMITS['papers'])}
                     </ul>
                 </div>
                 <div class=\"news-card\">
                     <h3>熱門開源專案</h3>
                     <ul>
-                        {_build_list(rag.get('projects', []), ('name', 'url', 'description'), 4)}
+                        {_build_list(rag.get('projects', []), ('name', 'url', 'description'), RAG_LIMITS['projects'])}
                     </ul>
                 </div>
                 <div class=\"news-card\">
                     <h3>Hugging Face 趨勢</h3>
                     <ul>
-                        {_build_list(rag.get('models', []), ('name', 'url', 'description'), 2)}
+                        {_build_list(rag.get('models', []), ('name', 'url', 'description'), RAG_LIMITS['models'])}
                     </ul>
                 </div>
             </section>
@@ -371,28 +1036,9 @@ def render_markdown(sections: Dict[str, List[Article]], rag: Dict[str, Any], tod
     return "\n".join(lines)
 
 
-def render_html(sections: Dict[str, List[Article]], rag: Dict[str, Any], today: str, updated: str, timeline_entries: List[Dict[str, Any]]) -> str:
-    def render_list(items: List[Article]) -> str:
-        if not items:
-            return '<p class="empty">目前沒有資料</p>'
-        return "<ul>" + "".join(article.to_html() for article in items) + "</ul>"
-
+def render_header_html(today: str, updated: str) -> str:
     history_link = f"history/{today}.md"
-    rag_section = render_rag_html(rag, today)
-    timeline_section = render_timeline_html(timeline_entries)
-
-    return f"""<!DOCTYPE html>
-<html lang=\"zh-TW\">
-<head>
-    <meta charset=\"UTF-8\">
-    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">
-    <title>AI 每日儀表板</title>
-    <link rel=\"stylesheet\" href=\"style.css\">
-    <link href=\"https://fonts.googleapis.com/css2?family=Noto+Sans+TC:wght@300;400;500;700&display=swap\" rel=\"stylesheet\">
-</head>
-<body>
-    <div class=\"container\">
-        <header>
+    return f"""<header>
             <h1>🤖 AI 每日儀表板</h1>
             <p class=\"subtitle\">追蹤最新 AI 發展 · 每日自動更新</p>
             <div class=\"last-updated\">最後更新：{updated}</div>
@@ -400,9 +1046,16 @@ def render_html(sections: Dict[str, List[Article]], rag: Dict[str, Any], today:
                 <a href=\"{history_link}\" target=\"_blank\">🗂 今日完整內容</a>
                 <a href=\"timeline.md\" target=\"_blank\">📜 歷史時間軸</a>
             </div>
-        </header>
-        <main>
-            <section class=\"dashboard-section\">
+        </header>"""
+
+
+def render_news_html(sections: Dict[str, List[Article]], today: str) -> str:
+    def render_list(items: List[Article]) -> str:
+        if not items:
+            return '<p class="empty">目前沒有資料</p>'
+        return "<ul>" + "".join(article.to_html() for article in items) + "</ul>"
+
+    return f"""<section class=\"dashboard-section\">
                 <h2>📅 {today}</h2>
                 <p class=\"date-subtitle\">昨日 AI 大事件</p>
                 <div class=\"news-card\">
@@ -417,115 +1070,149 @@ def render_html(sections: Dict[str, List[Article]], rag: Dict[str, Any], today:
                     <h3>🧠 深度觀點</h3>
                     {render_list(sections.get('highlights', []))}
                 </div>
-            </section>
-            {rag_section}
-            {timeline_section}
-            <section class=\"automation-info\">
+            </section>"""
+
+
+def render_automation_html() -> str:
+    return """<section class=\"automation-info\">
                 <h3>⚙️ 自動化狀態</h3>
                 <div class=\"status-grid\">
                     <div class=\"status-item\"><span class=\"status-icon\">✅</span>RSS 聚合</div>
                     <div class=\"status-item\"><span class=\"status-icon\">✅</span>RAG 整合</div>
                     <div class=\"status-item\"><span class=\"status-icon\">✅</span>每日 08:00 定時更新</div>
                 </div>
+            </section>"""
+
+
+def render_fragments(sections: Dict[str, List[Article]], rag: Dict[str, Any], today: str, updated: str,
+                     timeline_entries: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Every section of index.html, rendered separately (see HTML_FRAGMENTS and render_page)."""
+    return {
+        "header": render_header_html(today, updated),
+        "news": render_news_html(sections, today),
+        "rag": render_rag_html(rag, today),
+        "timeline": render_timeline_html(timeline_entries),
+        "automation": render_automation_html(),
+    }
+
+
+def render_page(fragments: Dict[str, str]) -> str:
+    """index.html from its fragments; the page around them is fixed."""
+    return f"""<!DOCTYPE html>
+<html lang=\"zh-TW\">
+<head>
+    <meta charset=\"UTF-8\">
+    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">
+    <title>AI 每日儀表板</title>
+    <link rel=\"stylesheet\" href=\"style.css\">
+    <link href=\"https://fonts.googleapis.com/css2?family=Noto+Sans+TC:wght@300;400;500;700&display=swap\" rel=\"stylesheet\">
+</head>
+<body>
+    <div class=\"container\">
+        {fragments['header']}
+        <main>
+            {fragments['news']}
+            {fragments['rag']}
+            {fragments['timeline']}
+            <section class=\"search-section\">
+                <h2>🔎 搜尋歷史</h2>
+                <input id=\"history-search\" type=\"search\" placeholder=\"輸入公司、模型或關鍵字…\" autocomplete=\"off\">
+                <ul id=\"search-results\" class=\"search-results\"></ul>
             </section>
+            {fragments['automation']}
         </main>
         <footer>
             <p>由小管家 🤖 自動維護 • Firebird 的 AWS 雲端管家</p>
         </footer>
     </div>
+    <script src=\"search.js\" defer></script>
 </body>
 </html>
 """
 
 
+def render_html(sections: Dict[str, List[Article]], rag: Dict[str, Any], today: str, updated: str, timeline_entries: List[Dict[str, Any]]) -> str:
+    return render_page(render_fragments(sections, rag, today, updated, timeline_entries))
+
+
 # ---------------------------------------------------------------------------
 # History & timeline helpers
 # ---------------------------------------------------------------------------
 
-def save_history(markdown: str, date: str) -> Path:
-    HISTORY_DIR.mkdir(exist_ok=True)
+def save_history(markdown: str, date: str) -> bool:
     path = HISTORY_DIR / f"{date}.md"
-    path.write_text(markdown, encoding="utf-8")
-    log(f"🗂️ 歷史儀表板已保存：{path}")
-    return path
-
+    if OUTPUTS.write(path, markdown):
+        log(f"🗂️ 歷史儀表板已保存：{path}")
+        return True
+    log(f"🗂️ 歷史儀表板未變更：{path}")
+    return False
 
 
+def update_search_index(days: Dict[str, str]) -> int:
+    """Re-index the given days (date -> rendered markdown); only their postings are touched."""
+    index = SearchIndex(SEARCH_INDEX_DIR)
+    if not index.days() and HISTORY_DIR.exists():
+        index.sync(HISTORY_DIR, load_timeline_entries(0))
+    changed = sum(index.index_day(day, parse_history(markdown)) for day, markdown in days.items())
+    index.save()
+    return changed
 
 
-def update_timeline(date: str, updated: str, sections: Dict[str, List[Article]]) -> List[Dict[str, Any]]:
+def timeline_entry(date: str, updated: str, sections: Dict[str, List[Article]]) -> Dict[str, Any]:
     def collect_titles(key: str, limit: int = 2) -> List[str]:
         return [article.title for article in sections.get(key, [])[:limit]]
 
-    def join_titles(items: List[str]) -> str:
-        return " / ".join(items) if items else "（無資料）"
-
-    link = f"history/{date}.md"
-    entry_lines = [
-        f"## {date}",
-        f"- 🕒 更新時間：{updated}",
-        f"- 🔥 頭條：{join_titles(collect_titles('headlines'))}",
-        f"- 💼 產業：{join_titles(collect_titles('industry'))}",
-        f"- 🧠 深度：{join_titles(collect_titles('highlights'))}",
-        f"- 📄 [完整內容]({link})",
-        "",
-    ]
-    entry = "\n".join(entry_lines)
-
-    if TIMELINE_FILE.exists():
-        existing = TIMELINE_FILE.read_text(encoding="utf-8")
-    else:
-        existing = "# AI 儀表板時間軸\n\n"
-
-    if not existing.startswith("# AI 儀表板時間軸"):
-        header = "# AI 儀表板時間軸\n\n"
-        body = existing.strip()
-    else:
-        header, _, body = existing.partition("\n\n")
-        if not header:
-            header = "# AI 儀表板時間軸"
-
-    pattern = re.compile(rf"## {re.escape(date)}.*?(?=\n## |\Z)", re.S)
-    body = re.sub(pattern, "", body).strip()
-
-    new_body = entry + ("\n" + body if body else "")
-    TIMELINE_FILE.write_text(header + "\n\n" + new_body.strip() + "\n", encoding="utf-8")
-    log("🧭 timeline.md 已更新")
-
-    entry_data = {
+    return {
         "date": date,
         "updated": updated,
         "headlines": collect_titles('headlines'),
         "industry": collect_titles('industry'),
         "highlights": collect_titles('highlights'),
-        "link": link,
+        "link": f"history/{date}.md",
     }
-    return _update_timeline_json(entry_data)
 
 
+_TIMELINE_STORE: Optional[TimelineStore] = None
 
-def _load_timeline_json() -> List[Dict[str, Any]]:
-    if TIMELINE_JSON.exists():
-        try:
-            with TIMELINE_JSON.open("r", encoding="utf-8") as fh:
-                return json.load(fh)
-        except json.JSONDecodeError:
-            return []
-    return []
 
+def timeline_store() -> TimelineStore:
+    """The process-wide timeline store, opened once (the daemon keeps it for its lifetime).
+
+    timeline.db is seeded from timeline.json / timeline.md the first time.
+    """
+    global _TIMELINE_STORE
+    if _TIMELINE_STORE is None:
+        store = TimelineStore(TIMELINE_DB)
+        if not len(store):
+            imported = store.import_legacy(TIMELINE_JSON, TIMELINE_FILE)
+            if imported:
+                log(f"🧭 已從舊時間軸匯入 {imported} 天")
+        _TIMELINE_STORE = store
+    return _TIMELINE_STORE
 
-def _update_timeline_json(entry: Dict[str, Any]) -> List[Dict[str, Any]]:
-    data = [item for item in _load_timeline_json() if item.get("date") != entry.get("date")]
-    data.insert(0, entry)
-    if len(data) > TIMELINE_STORE_LIMIT:
-        data = data[:TIMELINE_STORE_LIMIT]
-    TIMELINE_JSON.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    return data[:TIMELINE_UI_LIMIT]
+
+def update_timeline(date: str, updated: str, sections: Dict[str, List[Article]]) -> List[Dict[str, Any]]:
+    return merge_timeline([timeline_entry(date, updated, sections)])
+
+
+def merge_timeline(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Upsert ``entries`` into the store, apply retention and re-export timeline.md / timeline.json."""
+    store = timeline_store()
+    store.upsert(entries)
+    if TIMELINE_RETENTION_DAYS is not None:
+        newest = store.latest(1)
+        if newest:
+            cutoff = datetime.strptime(newest[0]["date"], "%Y-%m-%d") - timedelta(days=TIMELINE_RETENTION_DAYS)
+            store.prune(cutoff.strftime("%Y-%m-%d"))
+    if store.export_markdown(TIMELINE_FILE):
+        log("🧭 timeline.md 已更新")
+    store.export_json(TIMELINE_JSON, TIMELINE_JSON_LIMIT)
+    return store.latest(TIMELINE_UI_LIMIT)
 
 
 def load_timeline_entries(limit: int = TIMELINE_UI_LIMIT) -> List[Dict[str, Any]]:
-    data = _load_timeline_json()
-    return data[:limit] if limit else data
+    store = timeline_store()
+    return store.latest(limit) if limit else store.range()
 
 
 
@@ -533,35 +1220,284 @@ def load_timeline_entries(limit: int = TIMELINE_UI_LIMIT) -> List[Dict[str, Any]
 # Entrypoint
 # ---------------------------------------------------------------------------
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="產生 AI 每日儀表板")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", type=Path, metavar="DIR", help="將本次的 RSS 與翻譯回應存成快照")
+    mode.add_argument("--replay", type=Path, metavar="DIR", help="完全離線，以快照重跑整條流程")
+    mode.add_argument("--daemon", action="store_true", help="常駐模式：依各來源的間隔輪詢，有新文章才重新產生")
+    mode.add_argument("--rag-only", action="store_true",
+                      help="只重新產生 index.html 的 RAG 區塊（其他區塊沿用上次的快取）")
+    args = parser.parse_args(argv)
+
+    global FROZEN_NOW, RECORDING
+    METRICS.reset()
+    OUTPUTS.reset()
+    snapshot = None
+    if args.record or args.replay:
+        # Caches would hide requests from the recording (or answer them differently on replay).
+        TRANSLATION_CACHE.enabled = False
+        FEED_CACHE.enabled = False
+        CADENCE.enabled = False
+    if args.record:
+        snapshot = snapshots.Snapshot(args.record)
+        snapshot.now = FROZEN_NOW = current_time()
+        RECORDING = snapshot
+        http_client.set_default_client(snapshots.RecordingClient(snapshot))
+        seen = load_seen_index()
+        snapshot.save_state("seen.idx", seen.to_bytes())
+        log(f"⏺️ 錄製模式：{args.record}")
+    elif args.replay:
+        seen = install_replay(args.replay)
+        log(f"⏯️ 重播模式：{args.replay}")
+    else:
+        seen = load_seen_index()
+
+    if args.daemon:
+        Daemon(seen).run()
+        return
+    if args.rag_only:
+        try:
+            if not refresh_rag_html():
+                log("⚠️ 尚無快取的頁面區塊，改為完整更新")
+                run(seen)
+            write_changes()
+        finally:
+            write_metrics()
+        return
+
+    try:
+        run(seen)
+        write_changes()
+    finally:
+        if args.record and snapshot is not None:
+            snapshot.save()
+            log(f"💾 快照已保存：{args.record}（{len(snapshot.requests)} 個請求）")
+        write_metrics()
+
+
+def install_replay(root: Path) -> SeenIndex:
+    """Answer all HTTP, translations and the RAG payload from the snapshot at ``root`` and pin
+    the clock; returns its read-only seen index."""
+    global FROZEN_NOW, REPLAYING
+    snapshot = snapshots.Snapshot.load(root)
+    FROZEN_NOW = snapshot.now
+    REPLAYING = snapshot
+    http_client.set_default_client(snapshots.ReplayClient(snapshot))
+    state = snapshot.state_path("seen.idx")
+    return (SeenIndex.from_bytes(None, state.read_bytes()) if state.exists() else None) or SeenIndex(None)
+
+
+def run(seen: SeenIndex) -> None:
     log("▶️ 開始生成儀表板")
-    now = datetime.now()
+    with METRICS.stage("collect") as stage:
+        articles = collect_news()
+        stage.items = len(articles)
+    publish(articles, seen)
+
+
+def publish(articles: List[Article], seen: SeenIndex) -> None:
+    """Render and write every output from already collected ``articles``."""
+    now = current_time()
     today = now.strftime("%Y-%m-%d")
     yesterday = (now - timedelta(days=1)).strftime("%Y-%m-%d")
     updated = now.strftime("%Y-%m-%d %H:%M")
 
-    articles = collect_news()
     if len(articles) < MIN_ARTICLES:
         log(f"⚠️ 文章數不足 ({len(articles)} < {MIN_ARTICLES})，仍使用現有資料生成")
-    sections = split_sections(articles)
-    rag = load_rag()
-
-    markdown = render_markdown(sections, rag, today, yesterday, updated)
-    DASHBOARD_MD.write_text(markdown, encoding="utf-8")
-    log("📝 已寫入 DASHBOARD.md")
+    sections = split_sections(articles, seen, now.date())
+    translate_sections(sections)
+    TRANSLATION_CACHE.save()
+    with METRICS.stage("rag") as stage:
+        queries = rag_queries(sections)
+        rag = day_rag(queries)
+        atomic_write(RAG_QUERIES_FILE, json.dumps(queries, ensure_ascii=False))
+        stage.items = sum(len(rag.get(kind) or []) for kind in RAG_LIMITS)
+
+    with METRICS.stage("render_markdown") as stage:
+        markdown = render_markdown(sections, rag, today, yesterday, updated)
+        stage.bytes = len(markdown.encode("utf-8"))
+    if OUTPUTS.write(DASHBOARD_MD, markdown):
+        log("📝 已寫入 DASHBOARD.md")
 
     save_history(markdown, today)
-    timeline_entries = update_timeline(today, updated, sections)
-    if not timeline_entries:
-        timeline_entries = load_timeline_entries()
-
-    html = render_html(sections, rag, today, updated, timeline_entries)
-    DASHBOARD_HTML.write_text(html, encoding="utf-8")
-    log("🕸️ 已寫入 index.html")
-
+    with METRICS.stage("search_index") as stage:
+        stage.items = update_search_index({today: markdown})
+    with METRICS.stage("timeline") as stage:
+        timeline_entries = update_timeline(today, updated, sections)
+        if not timeline_entries:
+            timeline_entries = load_timeline_entries()
+        stage.items = len(timeline_entries)
+    seen.add(((a.title, a.link) for items in sections.values() for a in items), now.date())
+    seen.save()
+
+    with METRICS.stage("render_html") as stage:
+        parts = render_fragments(sections, rag, today, updated, timeline_entries)
+        changed = FRAGMENTS.update(parts)
+        html = render_page(parts)
+        stage.items = len(changed)
+        stage.bytes = len(html.encode("utf-8"))
+    if OUTPUTS.write(DASHBOARD_HTML, html):
+        log(f"🕸️ 已寫入 index.html（變更區塊：{', '.join(changed) or '無'}）")
+
+    totals = http_client.default_client().totals()
+    log(f"🔌 HTTP 請求 {totals['requests']} 次（新建連線 {totals['opened']}、重用 {totals['reused']}）")
     log("✅ 儀表板更新完成")
     print("Dashboard updated successfully.")
 
 
+def refresh_rag_html() -> bool:
+    """Re-render only the RAG fragment of index.html from the current RAG data.
+
+    The other sections come from the fragment cache as last published, and the
+    selection reuses that run's article titles.  Returns False (nothing written)
+    when some fragment has not been rendered yet and a full run is needed.
+    """
+    parts = FRAGMENTS.load(HTML_FRAGMENTS)
+    if parts is None:
+        return False
+    try:
+        queries = json.loads(RAG_QUERIES_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        queries = []
+    with METRICS.stage("rag") as stage:
+        rag = select_rag(load_rag(), queries)
+        stage.items = sum(len(rag.get(kind) or []) for kind in RAG_LIMITS)
+    with METRICS.stage("render_html") as stage:
+        parts["rag"] = render_rag_html(rag, current_time().strftime("%Y-%m-%d"))
+        changed = FRAGMENTS.update({"rag": parts["rag"]})
+        stage.items = len(changed)
+        if not changed and DASHBOARD_HTML.exists():
+            OUTPUTS.record(DASHBOARD_HTML, changed=False)
+            log("🕸️ RAG 區塊未變更")
+            return True
+        html = render_page(parts)
+        stage.bytes = len(html.encode("utf-8"))
+    if OUTPUTS.write(DASHBOARD_HTML, html):
+        log("🕸️ 已更新 index.html 的 RAG 區塊")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+class Daemon:
+    """Long-running mode: each source is polled on its own schedule (see CADENCE) and the
+    outputs are republished only when a poll brings articles that were not there before
+    (or the date changes).  Caches, HTTP connection pools, the seen index and the timeline store stay
+    in memory between polls.  SIGTERM / SIGINT let the current cycle finish, then exit.
+    """
+
+    def __init__(self, seen: SeenIndex) -> None:
+        self.seen = seen
+        self.stop = threading.Event()
+        self.articles: Dict[str, List[Article]] = {}    # source URL -> its latest recent articles
+        self.due: Dict[str, float] = {}                  # source URL -> time.monotonic() of next poll
+        self.published_day: Optional[date] = None
+
+    def _request_stop(self, signum: int, frame: Any) -> None:
+        log(f"🛑 收到 {signal.Signals(signum).name}，完成本輪後結束")
+        self.stop.set()
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        log(f"🔁 常駐模式啟動：{len(RSS_SOURCES)} 個來源")
+        start = time.monotonic()
+        self.due = {source["url"]: start for source in RSS_SOURCES}
+        try:
+            while not self.stop.is_set():
+                self.poll()
+                if self.due:
+                    self.stop.wait(max(0.0, min(self.due.values()) - time.monotonic()))
+                else:
+                    self.stop.wait(DEFAULT_POLL_INTERVAL)
+        finally:
+            self.shutdown()
+
+    def poll(self) -> bool:
+        """Fetch the sources that are due; returns True if the outputs were republished."""
+        now = time.monotonic()
+        due = [source for source in RSS_SOURCES if self.due.get(source["url"], now) <= now]
+        if not due:
+            return False
+        METRICS.reset()
+        OUTPUTS.reset()
+        try:
+            known = {dedup.canonical_url(a.link) for items in self.articles.values() for a in items}
+            cutoff = news_cutoff()
+            with METRICS.stage("collect") as stage:
+                results = fetch_sources(due, cutoff)
+                stage.items = sum(len(items) for items in results.values())
+            for source in due:
+                self.due[source["url"]] = time.monotonic() + CADENCE.delay(source["url"], poll_floor(source))
+            expired = self.expire(cutoff, keep=results.keys())
+            self.articles.update(results)
+            new = sum(1 for items in results.values() for a in items if dedup.canonical_url(a.link) not in known)
+
+            today = current_time().date()
+            if expired:
+                log(f"⌛ {expired} 則保留的文章已超過時間範圍，移出頁面")
+            if not new and not expired and today == self.published_day:
+                log(f"💤 輪詢 {len(due)} 個來源，沒有新文章")
+                return False
+            log(f"🆕 {new} 則新文章，重新產生儀表板")
+            # Copies: translation and dedup modify articles in place, the pool must stay pristine.
+            pool = [replace(a, related=[]) for s in RSS_SOURCES for a in self.articles.get(s["url"], [])]
+            publish(merge_articles(pool), self.seen)
+            write_changes()
+            self.published_day = today
+            return True
+        except Exception as exc:
+            log(f"❌ 常駐模式本輪失敗：{exc}")
+            return False
+        finally:
+            write_metrics()
+
+    def expire(self, cutoff: datetime, keep: Iterable[str] = ()) -> int:
+        """Drop retained articles older than ``cutoff``; returns how many were dropped.
+
+        Sources in ``keep`` were just fetched and already filtered by fetch_sources;
+        the others (not due, or backing off) would otherwise keep their articles forever.
+        """
+        keep = set(keep)
+        dropped = 0
+        for url, items in self.articles.items():
+            if url in keep:
+                continue
+            recent = [a for a in items if a.published >= cutoff]
+            dropped += len(items) - len(recent)
+            self.articles[url] = recent
+        return dropped
+
+    def shutdown(self) -> None:
+        TRANSLATION_CACHE.save()
+        self.seen.save()
+        http_client.default_client().close()
+        log("👋 常駐模式已結束")
+
+
+def write_changes() -> List[str]:
+    """Write changes.json (changed / unchanged artifacts relative to WORKSPACE) and log it."""
+    report = OUTPUTS.report(WORKSPACE)
+    report = {"generated": current_time().isoformat(timespec="seconds"), **report}
+    atomic_write(CHANGES_FILE, json.dumps(report, ensure_ascii=False, indent=2))
+    if report["changed"]:
+        log(f"📦 {len(report['changed'])} 個輸出有變更：{', '.join(report['changed'][:10])}")
+    else:
+        log("📦 所有輸出皆未變更")
+    return report["changed"]
+
+
+def write_metrics() -> None:
+    try:
+        METRICS.write_json(METRICS_FILE)
+        if PROMETHEUS_TEXTFILE:
+            METRICS.write_prometheus(PROMETHEUS_TEXTFILE)
+    except OSError as exc:
+        log(f"⚠️ 無法寫入效能指標：{exc}")
+
+
 if __name__ == "__main__":
     main()
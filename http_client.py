@@ -0,0 +1,254 @@
+"""Shared keep-alive HTTP client for the dashboard generator and the RAG fetchers.
+
+One ``HttpClient`` keeps a small pool of persistent connections per (scheme, host, port),
+so repeated requests to the same host (translation batches, paginated APIs) skip the
+TCP and TLS handshakes.  ``default_client()`` is the process-wide instance.
+"""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "Mozilla/5.0 (AI-Dashboard-Aggregator)"
+DEFAULT_POOL_SIZE = 4          # connections kept per host
+POOL_SIZES: Dict[str, int] = {
+    "translate.googleapis.com": 8,
+}
+DEFAULT_TIMEOUT = 20
+MAX_REDIRECTS = 5
+READ_CHUNK = 64 * 1024
+
+# Raised when a kept-alive socket was closed by the server between requests.
+_STALE_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError, http.client.BadStatusLine)
+
+
+def remaining(timeout: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    """Timeout for the next blocking step: ``timeout``, cut to what is left before ``deadline``.
+
+    Raises TimeoutError once the deadline has passed.
+    """
+    if deadline is None:
+        return timeout
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise TimeoutError("超過下載時限")
+    return left if timeout is None else min(timeout, left)
+
+
+def _set_timeout(conn: http.client.HTTPConnection, timeout: Optional[float]) -> None:
+    conn.timeout = timeout            # used when the connection (re)connects
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, url: str, reason: str = "") -> None:
+        super().__init__(f"HTTP Error {status}: {reason or 'error'} ({url})")
+        self.status = status
+        self.url = url
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Dict[str, str]    # keys are lower-cased
+    body: bytes
+    url: str
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    opened: int = 0
+    reused: int = 0
+
+
+class ConnectionPool:
+    """Idle keep-alive connections for one origin, with at most ``size`` in use at once."""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int], size: int) -> None:
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.size = size
+        self._idle: List[http.client.HTTPConnection] = []
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: float, deadline: Optional[float] = None) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle connection, or a new one (not yet connected); waits for a free slot until ``deadline``."""
+        with self._cond:
+            while not self._idle and self._in_use >= self.size:
+                self._cond.wait(remaining(None, deadline))
+            self._in_use += 1
+            if self._idle:
+                return self._idle.pop(), True
+        conn_cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return conn_cls(self.host, self.port, timeout=timeout), False
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if not reusable:
+            conn.close()
+        with self._cond:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+@dataclass
+class HttpClient:
+    pool_size: int = DEFAULT_POOL_SIZE
+    pool_sizes: Dict[str, int] = field(default_factory=lambda: dict(POOL_SIZES))
+    user_agent: str = USER_AGENT
+    _pools: Dict[Tuple[str, str, Optional[int]], ConnectionPool] = field(default_factory=dict, repr=False)
+    _stats: Dict[str, HostStats] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _pool(self, scheme: str, host: str, port: Optional[int]) -> ConnectionPool:
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(scheme, host, port, self.pool_sizes.get(host, self.pool_size))
+                self._pools[key] = pool
+                self._stats.setdefault(host, HostStats())
+            return pool
+
+    def _count(self, host: str, reused: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(host, HostStats())
+            stats.requests += 1
+            if reused:
+                stats.reused += 1
+            else:
+                stats.opened += 1
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT,
+                deadline: Optional[float] = None, raise_for_status: bool = True) -> Response:
+        """Send one request, following redirects; gzip bodies are decoded.
+
+        ``deadline`` (time.monotonic) bounds the whole exchange: waiting for a pooled
+        connection, connecting and every read get at most the time left until it.
+        With ``raise_for_status`` a status >= 400 raises ``HttpError``; 304 is always returned.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, body, headers or {}, timeout, deadline)
+            location = response.headers.get("location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if response.status == 303:
+                    method, body = "GET", None
+                continue
+            if raise_for_status and response.status >= 400:
+                self._raise(response)
+            return response
+        raise HttpError(response.status, url, "too many redirects")
+
+    @staticmethod
+    def _raise(response: Response) -> None:
+        raise HttpError(response.status, response.url)
+
+    def get(self, url: str, **kwargs) -> Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, body: bytes, **kwargs) -> Response:
+        return self.request("POST", url, body=body, **kwargs)
+
+    def _send(self, method: str, url: str, body: Optional[bytes], headers: Dict[str, str],
+              timeout: float, deadline: Optional[float]) -> Response:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        pool = self._pool(parts.scheme, host, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        all_headers = {"User-Agent": self.user_agent, "Accept-Encoding": "gzip", **headers}
+
+        conn, reused = pool.acquire(timeout, deadline)
+        try:
+            try:
+                _set_timeout(conn, remaining(timeout, deadline))
+                conn.request(method, path, body=body, headers=all_headers)
+                sock = conn.sock
+                resp = conn.getresponse()
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                # The server dropped the idle connection; retry once on a fresh one.
+                conn.close()
+                reused = False
+                _set_timeout(conn, remaining(timeout, deadline))
+                conn.request(method, path, body=body, headers=all_headers)
+                sock = conn.sock
+                resp = conn.getresponse()
+            self._count(host, reused)
+            # The response keeps reading from ``sock`` even after a Connection: close
+            # response has detached it from ``conn``.  read1 returns whatever has
+            # arrived, so a slow body cannot hold a read past the deadline.
+            chunks: List[bytes] = []
+            while True:
+                sock.settimeout(remaining(timeout, deadline))
+                chunk = resp.read1(READ_CHUNK)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            resp.close()   # unlike read(), read1 leaves a fully read Content-Length body open
+        except BaseException:
+            pool.release(conn, reusable=False)
+            raise
+        pool.release(conn, reusable=not resp.will_close)
+
+        data = b"".join(chunks)
+        resp_headers = {key.lower(): value for key, value in resp.getheaders()}
+        if resp_headers.get("content-encoding", "").lower() == "gzip":
+            data = gzip.decompress(data)
+        return Response(status=resp.status, headers=resp_headers, body=data, url=url)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {host: dict(vars(stats)) for host, stats in self._stats.items()}
+
+    def totals(self) -> Dict[str, int]:
+        totals = {"requests": 0, "opened": 0, "reused": 0}
+        for stats in self.stats().values():
+            for key in totals:
+                totals[key] += stats[key]
+        return totals
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def set_default_client(client: HttpClient) -> None:
+    global _default_client
+    with _default_lock:
+        _default_client = client
@@ -0,0 +1,136 @@
+"""Lightweight stage timing and counters for the dashboard pipeline.
+
+Usage::
+
+    with METRICS.stage("fetch", source="TechCrunch") as stage:
+        body = download()
+        stage.bytes += len(body)
+
+A stage that raises is counted as an error and the exception propagates.  Results are
+written as JSON and, optionally, as a Prometheus node-exporter textfile.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from output_writer import atomic_write
+
+PROM_PREFIX = "ai_dashboard"
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    duration_seconds: float = 0.0
+    items: int = 0
+    bytes: int = 0
+    errors: int = 0
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages: Dict[LabelKey, StageStats] = {}
+            self.started = time.time()
+            self._started_monotonic = time.monotonic()
+
+    def _get(self, name: str, labels: Dict[str, str]) -> StageStats:
+        key = (name, tuple(sorted(labels.items())))
+        stats = self._stages.get(key)
+        if stats is None:
+            stats = self._stages[key] = StageStats()
+        return stats
+
+    @contextmanager
+    def stage(self, name: str, **labels: str) -> Iterator[StageStats]:
+        """Time a block; the yielded record collects items/bytes/errors and is merged on exit."""
+        record = StageStats(calls=1)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.errors += 1
+            raise
+        finally:
+            record.duration_seconds = time.perf_counter() - start
+            with self._lock:
+                stats = self._get(name, labels)
+                stats.calls += record.calls
+                stats.duration_seconds += record.duration_seconds
+                stats.items += record.items
+                stats.bytes += record.bytes
+                stats.errors += record.errors
+
+    def count(self, name: str, items: int = 0, bytes: int = 0, errors: int = 0, **labels: str) -> None:
+        with self._lock:
+            stats = self._get(name, labels)
+            stats.items += items
+            stats.bytes += bytes
+            stats.errors += errors
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        with self._lock:
+            rows = [
+                {"stage": name, "labels": dict(labels), **asdict(stats)}
+                for (name, labels), stats in self._stages.items()
+            ]
+        for row in rows:
+            row["duration_seconds"] = round(row["duration_seconds"], 6)
+        return rows
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "started": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "duration_seconds": round(time.monotonic() - self._started_monotonic, 6),
+            "stages": self.snapshot(),
+        }
+
+    def write_json(self, path: Path) -> None:
+        atomic_write(path, json.dumps(self.to_dict(), ensure_ascii=False, indent=2))
+
+    def write_prometheus(self, path: Path) -> None:
+        """Write a node-exporter textfile (the collector requires an atomic rename)."""
+        data = self.to_dict()
+        series = [
+            ("stage_duration_seconds", "Wall time spent in the stage during the last run.", "duration_seconds"),
+            ("stage_calls", "Times the stage ran during the last run.", "calls"),
+            ("stage_items", "Items handled by the stage during the last run.", "items"),
+            ("stage_bytes", "Bytes handled by the stage during the last run.", "bytes"),
+            ("stage_errors", "Errors raised by the stage during the last run.", "errors"),
+        ]
+        lines: List[str] = []
+        for metric, help_text, field_name in series:
+            lines.append(f"# HELP {PROM_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {PROM_PREFIX}_{metric} gauge")
+            for stage in data["stages"]:
+                labels = {"stage": stage["stage"], **stage["labels"]}
+                lines.append(f"{PROM_PREFIX}_{metric}{{{_format_labels(labels)}}} {stage[field_name]}")
+        lines.append(f"# HELP {PROM_PREFIX}_run_duration_seconds Wall time of the last run.")
+        lines.append(f"# TYPE {PROM_PREFIX}_run_duration_seconds gauge")
+        lines.append(f"{PROM_PREFIX}_run_duration_seconds {data['duration_seconds']}")
+        lines.append(f"# HELP {PROM_PREFIX}_last_run_timestamp_seconds Unix time the last run started.")
+        lines.append(f"# TYPE {PROM_PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f"{PROM_PREFIX}_last_run_timestamp_seconds {self.started:.3f}")
+        atomic_write(path, "\n".join(lines) + "\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+    return ",".join(f'{key}="{escape(value)}"' for key, value in labels.items())
+
+
+METRICS = Metrics()
@@ -0,0 +1,111 @@
+"""Atomic, change-aware writes for the files the dashboard publishes.
+
+``atomic_write`` writes to a temp file in the target directory, fsyncs it and
+renames it over the target, so a reader (the web server, a sync job) sees either
+the old file or the new one, never a torn one.
+
+``OUTPUTS.write`` additionally skips the write when the file already holds the
+same content (sha256) and records which artifacts changed, so downstream syncs and
+CDN invalidations can run only on real changes::
+
+    OUTPUTS.write(DASHBOARD_HTML, html)
+    OUTPUTS.changed   # [Path(...), ...]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Union
+
+Content = Union[str, bytes]
+
+
+def _encode(content: Content) -> bytes:
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def atomic_write(path: Path, content: Content) -> None:
+    """Write ``content`` to ``path`` via temp file + fsync + rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(_encode(content))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)   # make the rename itself durable
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+class OutputWriter:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.changed: List[Path] = []
+            self.unchanged: List[Path] = []
+
+    def write(self, path: Path, content: Content) -> bool:
+        """Write ``content`` unless ``path`` already holds it; returns True if the file changed."""
+        data = _encode(content)
+        same = file_digest(path) == hashlib.sha256(data).hexdigest()
+        if not same:
+            atomic_write(path, data)
+        self.record(path, changed=not same)
+        return not same
+
+    def record(self, path: Path, changed: bool) -> None:
+        """Account for a write done elsewhere (e.g. in a worker process)."""
+        with self._lock:
+            (self.changed if changed else self.unchanged).append(path)
+
+    def remove(self, path: Path) -> bool:
+        """Delete ``path`` if present; a removal counts as a change."""
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        self.record(path, changed=True)
+        return True
+
+    def report(self, root: Path) -> Dict[str, List[str]]:
+        def relative(path: Path) -> str:
+            try:
+                return str(path.relative_to(root))
+            except ValueError:
+                return str(path)
+
+        with self._lock:
+            changed = list(dict.fromkeys(self.changed))
+            unchanged = [path for path in dict.fromkeys(self.unchanged) if path not in set(changed)]
+        return {
+            "changed": [relative(path) for path in changed],
+            "unchanged": [relative(path) for path in unchanged],
+        }
+
+
+OUTPUTS = OutputWriter()
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""Local retrieval index over every RAG item (paper, project, model) ever fetched.
+
+The dashboard's RAG section shows the items most relevant to the day's news: each
+headline title is a query, and the per-kind top results across all queries fill
+the section.  Two signals are combined:
+
+* BM25 over the item's title / name (weighted ``TITLE_WEIGHT``), abstract /
+  description and tags, through an inverted index in SQLite; a term's postings are
+  read the first time a query uses it and then kept in memory;
+* cosine similarity of hashed TF vectors: ``DIM`` float32 buckets per document,
+  L2-normalised, one fixed-size row per document in ``vectors.f32``, which is
+  memory-mapped so only the rows a query touches are paged in.  Query vectors carry
+  idf weights, so rare terms dominate the cosine as they do in BM25.
+
+A query takes the ``CANDIDATES`` best documents by BM25 and reranks them by
+
+    (1 - VECTOR_WEIGHT) * bm25 / best bm25 + VECTOR_WEIGHT * cosine
+
+Adding or removing a document writes only its own rows (its ``docs`` row and
+postings, one transaction per ``save``) and its vector row; removed rows are reused.
+A row goes straight to ``vectors.f32`` when its slot is free in the saved state, and
+is held in memory until ``save`` has committed otherwise (a slot freed since the
+last save), so closing without saving leaves the saved documents and their rows as
+they were.  A save cut off between that commit and the held rows' writes leaves a
+flag in ``meta``; the next open then rewrites every vector row from the stored terms.  Otherwise an open reads
+just each document's slot, kind and length, so neither a save nor an open grows
+with the size of the items.
+
+Layout::
+
+    <index>/index.db      SQLite: docs (id -> slot, kind, hash, length, terms, item),
+                          postings (term, slot -> tf), meta (format version, DIM,
+                          and what callers keep with ``set_meta``)
+    <index>/vectors.f32   row ``slot`` = that document's unit vector (native float32)
+
+An index from before the SQLite layout (``docs.json``) is imported once on open.
+
+    python rag_index.py query "Anthropic agents"
+    python rag_index.py build
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import sqlite3
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from search_index import tokenize
+
+FORMAT_VERSION = 2
+DIM = 256                  # hashed vector buckets per document
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+CANDIDATES = 100           # BM25 hits reranked by vector similarity per query
+VECTOR_WEIGHT = 0.3
+INITIAL_ROWS = 1024
+
+# Text fields per RAG kind: (title field, body fields...).
+KIND_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "papers": ("title", "abstract", "categories"),
+    "projects": ("name", "description", "language"),
+    "models": ("name", "description", "tags"),
+}
+ROW_BYTES = DIM * array("f").itemsize
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS docs (
+        id     TEXT PRIMARY KEY,   -- doc_id(): the item URL
+        slot   INTEGER NOT NULL,   -- row in vectors.f32
+        kind   TEXT NOT NULL,      -- papers / projects / models
+        hash   TEXT NOT NULL,      -- sha1 of the item, to skip unchanged re-adds
+        length INTEGER NOT NULL,   -- weighted term count (BM25 document length)
+        terms  TEXT NOT NULL,      -- JSON {term: tf}, to drop the postings on removal
+        item   TEXT NOT NULL       -- the RAG record as JSON
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS postings (
+        term TEXT NOT NULL,
+        slot INTEGER NOT NULL,
+        tf   INTEGER NOT NULL,
+        PRIMARY KEY (term, slot)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key   TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def doc_id(kind: str, item: Dict[str, Any]) -> str:
+    return str(item.get("url") or f"{kind}:{item.get(KIND_FIELDS[kind][0], '')}")
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(part) for part in value)
+    return str(value or "")
+
+
+def item_terms(kind: str, item: Dict[str, Any]) -> Counter:
+    title, *body = KIND_FIELDS[kind]
+    terms = Counter(tokenize(" ".join(_field_text(item.get(name)) for name in body)))
+    for token in tokenize(_field_text(item.get(title))):
+        terms[token] += TITLE_WEIGHT
+    return terms
+
+
+def _bucket(term: str) -> Tuple[int, float]:
+    """Hashed vector position and sign of ``term`` (signed feature hashing)."""
+    value = zlib.crc32(term.encode("utf-8"))
+    return value % DIM, (1.0 if value >> 31 else -1.0)
+
+
+def hashed_vector(weights: Dict[str, float]) -> Dict[int, float]:
+    """Sparse, L2-normalised hashed vector of term weights."""
+    vector: Dict[int, float] = {}
+    for term, weight in weights.items():
+        bucket, sign = _bucket(term)
+        vector[bucket] = vector.get(bucket, 0.0) + sign * weight
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {bucket: value / norm for bucket, value in vector.items()} if norm else {}
+
+
+def _row(terms: Dict[str, int]) -> array:
+    """A document's vector row: its hashed, sublinear-tf vector, dense."""
+    row = array("f", bytes(ROW_BYTES))
+    for bucket, value in hashed_vector({term: 1.0 + math.log(tf) for term, tf in terms.items()}).items():
+        row[bucket] = value
+    return row
+
+
+class RagIndex:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._slots: Dict[str, int] = {}                  # doc id -> slot
+        self._ids: Dict[int, str] = {}                    # slot -> doc id
+        self._kinds: Dict[int, str] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._postings: Dict[str, Dict[int, int]] = {}    # term -> {slot: tf}, for the terms queried so far
+        self._free: List[int] = []
+        self._released: set = set()                       # slots freed since the last save
+        self._pending: Dict[int, array] = {}              # their new rows, written by ``save``
+        self._dirty = False
+        root.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(root / "index.db"))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-65536")   # 64 MiB: postings inserts land all over the term B-tree
+        for statement in _SCHEMA:
+            self.conn.execute(statement)
+        self._check_layout()
+        for key, slot, kind, length in self.conn.execute("SELECT id, slot, kind, length FROM docs"):
+            self._link(key, slot, kind, length)
+        self._open_vectors()
+        if self.meta("vectors") == "pending":
+            self._rebuild_vectors()
+
+    # -- storage ----------------------------------------------------------
+
+    def _check_layout(self) -> None:
+        """Empty the index if it was written with another format or DIM; import a docs.json index."""
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        layout = {"version": str(FORMAT_VERSION), "dim": str(DIM)}
+        if {key: meta.get(key) for key in layout} == layout:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM docs")
+            self.conn.execute("DELETE FROM postings")
+            self.conn.execute("DELETE FROM meta")
+            self.conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", layout.items())
+            self._import_json(self.root / "docs.json")
+
+    def _import_json(self, path: Path) -> None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") == 1 and data.get("dim") == DIM:
+            docs = data["docs"].items()
+            self.conn.executemany(
+                "INSERT INTO docs (id, slot, kind, hash, length, terms, item) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(key, doc["slot"], doc["kind"], doc["hash"], doc["length"],
+                  json.dumps(doc["terms"], ensure_ascii=False), json.dumps(doc["item"], ensure_ascii=False))
+                 for key, doc in docs],
+            )
+            self.conn.executemany(
+                "INSERT INTO postings (term, slot, tf) VALUES (?, ?, ?)",
+                [(term, doc["slot"], tf) for _, doc in docs for term, tf in doc["terms"].items()],
+            )
+        path.unlink()
+
+    def _open_vectors(self) -> None:
+        path = self.root / "vectors.f32"
+        if not self._ids:
+            path.unlink(missing_ok=True)   # rows without docs entries are meaningless
+        self._file = open(path, "a+b")
+        used = max(self._ids, default=-1) + 1
+        rows = max(INITIAL_ROWS, used, self._file.seek(0, 2) // ROW_BYTES)
+        self._map_rows(rows)
+        self._free = sorted(set(range(rows)) - set(self._ids), reverse=True)
+
+    def _map_rows(self, rows: int) -> None:
+        if self._file.seek(0, 2) < rows * ROW_BYTES:
+            self._file.truncate(rows * ROW_BYTES)
+        self._map = mmap.mmap(self._file.fileno(), rows * ROW_BYTES)
+        self._vectors = memoryview(self._map).cast("f")
+        self._rows = rows
+
+    def _grow(self) -> None:
+        rows = self._rows
+        self._vectors.release()
+        self._map.close()
+        self._map_rows(rows * 2)
+        self._free = list(range(rows * 2 - 1, rows - 1, -1))
+
+    def _rebuild_vectors(self) -> None:
+        """Rewrite every vector row from the ``docs`` terms (after an interrupted save)."""
+        self._vectors[:] = memoryview(array("f", bytes(self._rows * ROW_BYTES)))
+        for slot, terms in self.conn.execute("SELECT slot, terms FROM docs"):
+            self._vectors[slot * DIM:(slot + 1) * DIM] = memoryview(_row(json.loads(terms)))
+        self._map.flush()
+        with self.conn:
+            self.conn.execute("DELETE FROM meta WHERE key = 'vectors'")
+
+    def close(self) -> None:
+        """Close without saving: changes since the last ``save`` are discarded."""
+        self._vectors.release()
+        self._map.close()
+        self._file.close()
+        self.conn.close()
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key``; committed with the documents by ``save``."""
+        self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                          "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, value))
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self._map.flush()     # rows of slots the saved state left free
+        if self._pending:
+            self.set_meta("vectors", "pending")
+        self.conn.commit()
+        if self._pending:
+            for slot, row in self._pending.items():
+                self._vectors[slot * DIM:(slot + 1) * DIM] = memoryview(row)
+            self._map.flush()
+            self._pending.clear()
+            with self.conn:
+                self.conn.execute("DELETE FROM meta WHERE key = 'vectors'")
+        self._released.clear()
+        self._dirty = False
+
+    # -- documents ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    def kind(self, key: str) -> str:
+        return self._kinds[self._slots[key]]
+
+    def item(self, key: str) -> Dict[str, Any]:
+        row = self.conn.execute("SELECT item FROM docs WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def _link(self, key: str, slot: int, kind: str, length: int) -> None:
+        self._slots[key] = slot
+        self._ids[slot] = key
+        self._kinds[slot] = kind
+        self._lengths[slot] = length
+        self._total_length += length
+
+    def add(self, kind: str, item: Dict[str, Any]) -> bool:
+        """Index ``item`` (replacing an older version of it); returns False when it is unchanged."""
+        key = doc_id(kind, item)
+        digest = hashlib.sha1(json.dumps(item, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+        if key in self._slots:
+            if self.conn.execute("SELECT hash FROM docs WHERE id = ?", (key,)).fetchone()[0] == digest:
+                return False
+            self.remove(key)
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        terms = item_terms(kind, item)
+        if slot in self._released:
+            self._pending[slot] = _row(terms)
+        else:
+            self._vectors[slot * DIM:(slot + 1) * DIM] = memoryview(_row(terms))
+        length = sum(terms.values())
+        self.conn.execute(
+            "INSERT INTO docs (id, slot, kind, hash, length, terms, item) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, slot, kind, digest, length, json.dumps(terms, ensure_ascii=False), json.dumps(item, ensure_ascii=False)),
+        )
+        self.conn.executemany("INSERT INTO postings (term, slot, tf) VALUES (?, ?, ?)",
+                              [(term, slot, tf) for term, tf in terms.items()])
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings[slot] = tf
+        self._link(key, slot, kind, length)
+        self._dirty = True
+        return True
+
+    def remove(self, key: str) -> bool:
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+        terms = json.loads(self.conn.execute("SELECT terms FROM docs WHERE id = ?", (key,)).fetchone()[0])
+        self.conn.execute("DELETE FROM docs WHERE id = ?", (key,))
+        self.conn.executemany("DELETE FROM postings WHERE term = ? AND slot = ?", [(term, slot) for term in terms])
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+        del self._ids[slot]
+        del self._kinds[slot]
+        self._total_length -= self._lengths.pop(slot)
+        self._pending.pop(slot, None)
+        self._released.add(slot)
+        self._free.append(slot)
+        self._dirty = True
+        return True
+
+    def sync(self, rag: Dict[str, Any]) -> int:
+        """Add every item of a RAG payload (rag_data.json shape); items missing from it stay indexed."""
+        return sum(self.add(kind, item) for kind in KIND_FIELDS for item in rag.get(kind) or [])
+
+    def _term_postings(self, term: str) -> Dict[int, int]:
+        postings = self._postings.get(term)
+        if postings is None:
+            postings = dict(self.conn.execute("SELECT slot, tf FROM postings WHERE term = ?", (term,)))
+            self._postings[term] = postings
+        return postings
+
+    # -- queries ------------------------------------------------------------
+
+    def query(self, text: str, limit: int = 10, kind: Optional[str] = None) -> List[Tuple[float, str]]:
+        """Best ``(score, doc id)`` pairs for ``text``, scores in [0, 1]."""
+        total = len(self._slots)
+        if not total:
+            return []
+        avgdl = self._total_length / total
+        bm25: Dict[int, float] = {}
+        query_weights: Dict[str, float] = {}
+        for term, tf in Counter(tokenize(text)).items():
+            postings = self._term_postings(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            query_weights[term] = (1.0 + math.log(tf)) * idf
+            lengths = self._lengths
+            for slot, doc_tf in postings.items():
+                norm = doc_tf + K1 * (1 - B + B * lengths[slot] / avgdl)
+                bm25[slot] = bm25.get(slot, 0.0) + idf * doc_tf * (K1 + 1) / norm
+        if kind is not None:
+            bm25 = {slot: score for slot, score in bm25.items() if self._kinds[slot] == kind}
+        if not bm25:
+            return []
+
+        candidates = heapq.nlargest(CANDIDATES, bm25.items(), key=lambda hit: hit[1])
+        best = candidates[0][1]
+        query_vector = hashed_vector(query_weights)
+        ranked = []
+        for slot, score in candidates:
+            row = self._pending.get(slot)
+            if row is None:
+                row = self._vectors[slot * DIM:(slot + 1) * DIM]
+            cosine = sum(value * row[bucket] for bucket, value in query_vector.items())
+            ranked.append(((1 - VECTOR_WEIGHT) * score / best + VECTOR_WEIGHT * max(cosine, 0.0), self._ids[slot]))
+        ranked.sort(key=lambda hit: (-hit[0], hit[1]))
+        return ranked[:limit]
+
+    def select(self, queries: Iterable[str], limits: Dict[str, int],
+               fallback: Optional[Dict[str, Sequence[Dict[str, Any]]]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Per kind, the ``limits[kind]`` items most relevant to ``queries`` summed over all queries.
+
+        Kinds with too few matches are topped up from ``fallback`` (e.g. the latest fetch), in order.
+        """
+        totals: Dict[str, float] = {}
+        for text in queries:
+            for score, key in self.query(text, CANDIDATES):
+                totals[key] = totals.get(key, 0.0) + score
+        selected: Dict[str, List[Dict[str, Any]]] = {}
+        for kind, limit in limits.items():
+            ranked = sorted((key for key in totals if self.kind(key) == kind), key=lambda key: (-totals[key], key))
+            picked = {key: self.item(key) for key in ranked[:limit]}
+            for item in (fallback or {}).get(kind) or []:
+                if len(picked) >= limit:
+                    break
+                picked.setdefault(doc_id(kind, item), item)
+            selected[kind] = list(picked.values())
+        return selected
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import generate_dashboard as gd
+
+    parser = argparse.ArgumentParser(description="RAG 檢索索引（BM25 + 向量）")
+    commands = parser.add_subparsers(dest="command", required=True)
+    query = commands.add_parser("query", help="查詢索引")
+    query.add_argument("text", nargs="+")
+    query.add_argument("--limit", type=int, default=10)
+    query.add_argument("--kind", choices=sorted(KIND_FIELDS))
+    commands.add_parser("build", help="把 rag_store.db 的全部項目（或 rag_data.json）加入索引")
+    args = parser.parse_args(argv)
+
+    index = gd.rag_index()
+    try:
+        if args.command == "build":
+            before = len(index)
+            gd.index_rag(gd.load_rag())
+            print(f"新增 {len(index) - before} 筆，索引共 {len(index)} 筆")
+            return
+        for score, key in index.query(" ".join(args.text), args.limit, args.kind):
+            kind = index.kind(key)
+            print(f"{score:6.3f}  {kind:<8}  {index.item(key).get(KIND_FIELDS[kind][0], '')}")
+            print(f"                  {key}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
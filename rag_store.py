@@ -0,0 +1,200 @@
+"""Record store for fetched RAG items (papers, projects, models), keyed by kind + ID.
+
+A small SQLite database, so a fetch writes only the records it found instead of
+rewriting every file, and knows which IDs it already holds before asking for more.
+It also records when each source query was last fetched, so a refresh asks only
+for the queries whose TTL has run out, and ``rag_data()`` serves the dashboard's
+RAG payload straight from the records.  Every write stamps the records it
+changes with a higher ``version``, so a reader that remembers ``version()`` can later
+ask for just the records written since (``items_since``).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    kind       TEXT NOT NULL,   -- papers / projects / models
+    id         TEXT NOT NULL,   -- arXiv ID, repository full name, model ID
+    published  TEXT NOT NULL,   -- ISO date used for ordering (may be empty)
+    data       TEXT NOT NULL,   -- the record as JSON
+    first_seen TEXT NOT NULL,
+    version    INTEGER NOT NULL DEFAULT 0,   -- write that last changed the record (see version())
+    PRIMARY KEY (kind, id)
+) WITHOUT ROWID
+"""
+
+_QUERIES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    source     TEXT NOT NULL,   -- arxiv / github / huggingface
+    query      TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,   -- ISO timestamp (UTC) of the last successful fetch
+    PRIMARY KEY (source, query)
+) WITHOUT ROWID
+"""
+
+# kind -> (counter ordering the listing by its delta then total, or None for newest
+# first; how many records the dashboard payload keeps)
+RAG_DATA = {
+    "papers": (None, 50),
+    "projects": ("stars", 20),
+    "models": ("downloads", 20),
+}
+
+# Stamped on each written row, inside the write transaction: versions only grow, so
+# rows committed after a reader's ``version()`` are all above it.
+_NEXT_VERSION = "(SELECT COALESCE(MAX(version), 0) + 1 FROM items)"
+
+_CHUNK = 500  # IDs per ``IN (...)`` lookup, under SQLite's parameter limit
+
+
+class RagStore:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.execute(_QUERIES_SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(items)")}
+        if "version" not in columns:   # a store from before versions: its records count as version 0
+            self.conn.execute("ALTER TABLE items ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS items_version ON items (version)")
+
+    def __enter__(self) -> "RagStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def count(self, kind: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM items WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def version(self) -> int:
+        """Version of the latest write (0 for an empty store)."""
+        return self.conn.execute("SELECT COALESCE(MAX(version), 0) FROM items").fetchone()[0]
+
+    def ids(self, kind: str) -> Set[str]:
+        return {row[0] for row in self.conn.execute("SELECT id FROM items WHERE kind = ?", (kind,))}
+
+    def add_new(self, kind: str, records: Iterable[Dict[str, Any]], published: str = "published_date") -> int:
+        """Insert the records whose ``id`` is not stored yet; returns how many were added."""
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        rows = [
+            (kind, record["id"], str(record.get(published) or ""), json.dumps(record, ensure_ascii=False), now)
+            for record in records
+        ]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO items (kind, id, published, data, first_seen, version) VALUES (?, ?, ?, ?, ?, {_NEXT_VERSION})",
+                rows,
+            )
+            return self.conn.total_changes - before
+
+    def get(self, kind: str, ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored records of ``kind`` among ``ids``, by ID."""
+        ids = list(ids)
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(ids), _CHUNK):
+            chunk = ids[start:start + _CHUNK]
+            sql = f"SELECT id, data FROM items WHERE kind = ? AND id IN ({', '.join('?' * len(chunk))})"
+            found.update((row[0], json.loads(row[1])) for row in self.conn.execute(sql, [kind, *chunk]))
+        return found
+
+    def upsert(self, kind: str, records: Iterable[Dict[str, Any]], counters: Sequence[str] = (),
+               published: str = "last_updated") -> Tuple[int, int]:
+        """Insert new records and overwrite changed ones; returns ``(added, updated)``.
+
+        Each field in ``counters`` (stars, downloads, ...) gets a ``<field>_delta`` on
+        the record: its change since the stored copy (0 for a new record).  Records
+        identical to the stored copy are not written.
+        """
+        records = list(records)
+        stored = self.get(kind, (record["id"] for record in records))
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        rows = []
+        added = updated = 0
+        for record in records:
+            old = stored.get(record["id"])
+            for field in counters:
+                value, before = record.get(field), (old or {}).get(field)
+                numeric = isinstance(value, int) and isinstance(before, int)
+                record[f"{field}_delta"] = value - before if numeric else 0
+            if old == record:
+                continue
+            if old is None:
+                added += 1
+            else:
+                updated += 1
+            rows.append((kind, record["id"], str(record.get(published) or ""),
+                         json.dumps(record, ensure_ascii=False), now))
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO items (kind, id, published, data, first_seen, version) VALUES (?, ?, ?, ?, ?, {_NEXT_VERSION}) "
+                "ON CONFLICT (kind, id) DO UPDATE SET "
+                "published = excluded.published, data = excluded.data, version = excluded.version",
+                rows,
+            )
+        return added, updated
+
+    def items(self, kind: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Records of ``kind``, newest (by ``published``, then first seen) first."""
+        sql = "SELECT data FROM items WHERE kind = ? ORDER BY published DESC, first_seen DESC, id"
+        params: List[Any] = [kind]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row[0]) for row in self.conn.execute(sql, params)]
+
+    def items_since(self, kind: str, version: int) -> List[Dict[str, Any]]:
+        """Records of ``kind`` added or changed after ``version`` (see ``version()``)."""
+        rows = self.conn.execute("SELECT data FROM items WHERE kind = ? AND version > ? ORDER BY version, id",
+                                 (kind, version))
+        return [json.loads(row[0]) for row in rows]
+
+    def top(self, kind: str, limit: int, counter: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The first ``limit`` records of ``kind``: by ``<counter>_delta`` then ``counter``, or newest."""
+        if counter is None:
+            return self.items(kind, limit)
+        sql = ("SELECT data FROM items WHERE kind = ? "
+               "ORDER BY json_extract(data, ?) DESC, json_extract(data, ?) DESC, id LIMIT ?")
+        rows = self.conn.execute(sql, (kind, f"$.{counter}_delta", f"$.{counter}", limit))
+        return [json.loads(row[0]) for row in rows]
+
+    def rag_data(self) -> Dict[str, Any]:
+        """The dashboard's RAG payload (same shape as rag_data.json), per ``RAG_DATA``."""
+        data: Dict[str, Any] = {kind: self.top(kind, limit, counter) for kind, (counter, limit) in RAG_DATA.items()}
+        data["last_updated"] = self.conn.execute("SELECT MAX(fetched_at) FROM queries").fetchone()[0] or ""
+        return data
+
+    # -- per-query freshness --------------------------------------------------
+
+    def fetched_at(self, source: str) -> Dict[str, datetime]:
+        rows = self.conn.execute("SELECT query, fetched_at FROM queries WHERE source = ?", (source,))
+        return {query: datetime.fromisoformat(when) for query, when in rows}
+
+    def mark_fetched(self, source: str, queries: Iterable[str], when: Optional[datetime] = None) -> None:
+        stamp = (when or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO queries (source, query, fetched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (source, query) DO UPDATE SET fetched_at = excluded.fetched_at",
+                [(source, query, stamp) for query in queries],
+            )
+
+    def stale(self, source: str, queries: Iterable[str], ttl: timedelta,
+              now: Optional[datetime] = None) -> List[str]:
+        """The ``queries`` of ``source`` never fetched, or last fetched ``ttl`` or longer ago."""
+        now = now or datetime.now(timezone.utc)
+        fetched = self.fetched_at(source)
+        return [query for query in queries if query not in fetched or now - fetched[query] >= ttl]
@@ -0,0 +1,163 @@
+"""JSON API access for the RAG fetchers: conditional requests and rate-limit headers.
+
+``RateLimitedApi`` sends every request of one API through a shared ``TokenBucket``
+and reads the quota headers of each response; once the remaining quota drops to
+``reserve`` the bucket is paused until the reported reset time, so concurrent
+queries stop together instead of each running into 403/429.  Responses carrying an
+ETag / Last-Modified are cached on disk and revalidated with If-None-Match /
+If-Modified-Since; a 304 is answered from the cache (GitHub does not count those
+against the quota).
+
+Understood quota headers: ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` (GitHub,
+reset as epoch seconds), ``RateLimit-Remaining`` / ``RateLimit-Reset`` and the
+combined ``RateLimit: "api";r=..;t=..`` (IETF drafts, used by Hugging Face, reset in
+seconds) and ``Retry-After``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import http_client
+from output_writer import atomic_write
+from rate_limit import TokenBucket
+
+MAX_RETRIES = 3
+EPOCH_THRESHOLD = 10 ** 9      # reset values above this are unix timestamps, below are seconds
+_COMBINED_RE = re.compile(r"\b([rt])=(\d+)")
+
+
+def parse_rate_limit(headers: Dict[str, str], now: Optional[float] = None) -> Tuple[Optional[int], Optional[float]]:
+    """``(remaining requests, seconds until the quota resets)`` from lower-cased ``headers``."""
+    now = time.time() if now is None else now
+    remaining = headers.get("x-ratelimit-remaining") or headers.get("ratelimit-remaining")
+    reset = headers.get("x-ratelimit-reset") or headers.get("ratelimit-reset")
+    combined = dict(_COMBINED_RE.findall(headers.get("ratelimit", "")))
+    remaining = remaining if remaining is not None else combined.get("r")
+    reset = reset if reset is not None else combined.get("t")
+    retry_after = headers.get("retry-after", "")
+    if retry_after.isdigit():
+        reset = retry_after
+
+    reset_in: Optional[float] = None
+    if reset is not None:
+        try:
+            value = float(reset)
+        except ValueError:
+            value = None
+        if value is not None:
+            reset_in = max(0.0, value - now if value > EPOCH_THRESHOLD else value)
+    try:
+        left = int(remaining) if remaining is not None else None
+    except ValueError:
+        left = None
+    return left, reset_in
+
+
+class ResponseCache:
+    """ETag / Last-Modified and body of the last 200 response per URL.
+
+    Layout: ``<root>/<sha1(url)>.json`` (validators) and ``<sha1(url)>.gz`` (body).
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _path(self, url: str, suffix: str) -> Path:
+        return self.root / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}{suffix}"
+
+    def validators(self, url: str) -> Dict[str, str]:
+        try:
+            meta = json.loads(self._path(url, ".json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not self._path(url, ".gz").exists():
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def body(self, url: str) -> bytes:
+        return gzip.decompress(self._path(url, ".gz").read_bytes())
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes) -> None:
+        meta = {"etag": headers.get("etag", ""), "last_modified": headers.get("last-modified", "")}
+        if not meta["etag"] and not meta["last_modified"]:
+            return
+        atomic_write(self._path(url, ".gz"), gzip.compress(body, mtime=0))
+        atomic_write(self._path(url, ".json"), json.dumps(meta))
+
+
+class RateLimitedApi:
+    def __init__(self, name: str, limiter: TokenBucket, headers: Optional[Dict[str, str]] = None,
+                 cache: Optional[ResponseCache] = None, client: Optional[http_client.HttpClient] = None,
+                 reserve: int = 0) -> None:
+        self.name = name
+        self.limiter = limiter
+        self.headers = dict(headers or {})
+        self.cache = cache
+        self.client = client or http_client.default_client()
+        self.reserve = reserve
+        self.stats = {"requests": 0, "not_modified": 0, "throttled": 0}
+        self.remaining: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _observe(self, headers: Dict[str, str], limited: bool) -> None:
+        """Pause the shared bucket when the quota is (about to be) exhausted."""
+        remaining, reset_in = parse_rate_limit(headers)
+        if remaining is not None:
+            with self._lock:
+                self.remaining = remaining
+        if reset_in is not None and (limited or (remaining is not None and remaining <= self.reserve)):
+            self._count("throttled")
+            self.limiter.pause_until(time.monotonic() + reset_in)
+
+    def get_json(self, url: str) -> Any:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            headers = {**self.headers, **(self.cache.validators(url) if self.cache else {})}
+            response = self.client.get(url, headers=headers, raise_for_status=False)
+            self._count("requests")
+            limited = response.status == 429 or (response.status == 403 and (
+                parse_rate_limit(response.headers)[0] == 0 or "retry-after" in response.headers))
+            self._observe(response.headers, limited)
+            if response.status == 304 and self.cache is not None:
+                self._count("not_modified")
+                return json.loads(self.cache.body(url))
+            if limited and attempt < MAX_RETRIES:
+                attempt += 1
+                continue
+            if response.status >= 400:
+                raise http_client.HttpError(response.status, url)
+            if self.cache is not None:
+                self.cache.store(url, response.headers, response.body)
+            return json.loads(response.body)
+
+    def map_json(self, urls: List[str], workers: int) -> Dict[str, Any]:
+        """``get_json`` for every URL, ``workers`` at a time; a failed URL maps to its exception."""
+        def fetch(url: str) -> Any:
+            try:
+                return self.get_json(url)
+            except (OSError, http_client.HttpError, ValueError) as exc:
+                return exc
+
+        if not urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls))), thread_name_prefix=self.name) as pool:
+            return dict(zip(urls, pool.map(fetch, urls)))
@@ -0,0 +1,168 @@
+"""arXiv API client: paginated Atom queries, run concurrently under one rate limit.
+
+Results are requested newest first (``sortBy=submittedDate``), so paging for a query
+stops at the first page that holds nothing but papers we already store.  Each page
+is parsed with ``iterparse`` and every ``<entry>`` is cleared once it has been
+turned into a paper, so memory stays flat however large a page is.
+
+The endpoint is configurable (``base_url``), e.g. a local stub server that serves
+recorded Atom responses.  http_client (repo root) must be importable.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import http_client
+from rate_limit import TokenBucket
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+PAGE_SIZE = 50
+MAX_RESULTS = 100            # per query
+REQUEST_INTERVAL = 3.0       # arXiv API terms: no more than one request every 3 seconds
+MAX_RETRIES = 3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+ARXIV = "{http://arxiv.org/schemas/atom}"
+_VERSION_RE = re.compile(r"v\d+$")
+
+
+def query_url(base_url: str, query: str, start: int, size: int) -> str:
+    params = {
+        "search_query": f'all:"{query}"',
+        "start": start,
+        "max_results": size,
+        "sortBy": "submittedDate",
+        "sortOrder": "descending",
+    }
+    return f"{base_url}?{urlencode(params)}"
+
+
+def paper_id(entry_id: str) -> str:
+    """``http://arxiv.org/abs/2601.01743v2`` -> ``2601.01743`` (old-style IDs keep their archive)."""
+    tail = entry_id.split("/abs/", 1)[-1]
+    return _VERSION_RE.sub("", tail)
+
+
+def _text(element: ET.Element, tag: str) -> str:
+    return " ".join((element.findtext(tag) or "").split())
+
+
+def _entry_to_paper(entry: ET.Element) -> Optional[Dict[str, Any]]:
+    entry_id = entry.findtext(f"{ATOM}id") or ""
+    if not entry_id or "/api/errors" in entry_id:
+        return None
+    arxiv_id = paper_id(entry_id)
+    categories = [c.get("term", "") for c in entry.findall(f"{ATOM}category") if c.get("term")]
+    primary = entry.find(f"{ARXIV}primary_category")
+    if primary is not None and primary.get("term") in categories:
+        categories.remove(primary.get("term"))
+        categories.insert(0, primary.get("term"))
+    return {
+        "id": arxiv_id,
+        "title": _text(entry, f"{ATOM}title"),
+        "authors": [_text(author, f"{ATOM}name") for author in entry.findall(f"{ATOM}author")],
+        "abstract": _text(entry, f"{ATOM}summary"),
+        "url": f"https://arxiv.org/abs/{arxiv_id}",
+        "published_date": (entry.findtext(f"{ATOM}published") or "")[:10],
+        "categories": categories,
+        "source": "arXiv",
+    }
+
+
+def parse_page(data: bytes) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Papers of one Atom response page and the query's total result count (if reported)."""
+    papers: List[Dict[str, Any]] = []
+    total: Optional[int] = None
+    for _, element in ET.iterparse(io.BytesIO(data), events=("end",)):
+        if element.tag == f"{ATOM}entry":
+            paper = _entry_to_paper(element)
+            if paper is not None:
+                papers.append(paper)
+            element.clear()
+        elif element.tag == f"{OPENSEARCH}totalResults":
+            try:
+                total = int(element.text or "")
+            except ValueError:
+                pass
+    return papers, total
+
+
+class ArxivClient:
+    def __init__(self, base_url: str = ARXIV_API_URL, client: Optional[http_client.HttpClient] = None,
+                 limiter: Optional[TokenBucket] = None, page_size: int = PAGE_SIZE,
+                 max_results: int = MAX_RESULTS) -> None:
+        self.base_url = base_url
+        self.client = client or http_client.default_client()
+        self.limiter = limiter or TokenBucket(1.0 / REQUEST_INTERVAL if REQUEST_INTERVAL else 0.0)
+        self.page_size = page_size
+        self.max_results = max_results
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.errors: Dict[str, str] = {}     # query -> error of its last failed fetch
+
+    def _get(self, url: str) -> bytes:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            with self._lock:
+                self.requests += 1
+            response = self.client.get(url, raise_for_status=False)
+            if response.status < 400:
+                return response.body
+            if response.status not in RETRY_STATUSES or attempt >= MAX_RETRIES:
+                raise http_client.HttpError(response.status, url)
+            retry_after = response.headers.get("retry-after", "")
+            time.sleep(float(retry_after) if retry_after.isdigit() else 2.0 ** attempt)
+            attempt += 1
+
+    def fetch_query(self, query: str, known: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """Papers for ``query`` newest first, paging until a page holds no unknown ID.
+
+        A page that fails is recorded in ``errors`` and ends the paging; the papers of
+        the pages before it are still returned.
+        """
+        known = set(known)
+        papers: List[Dict[str, Any]] = []
+        start = 0
+        while start < self.max_results:
+            size = min(self.page_size, self.max_results - start)
+            try:
+                page, total = parse_page(self._get(query_url(self.base_url, query, start, size)))
+            except (OSError, http_client.HttpError, ET.ParseError) as exc:
+                self.errors[query] = str(exc)
+                break
+            new = [paper for paper in page if paper["id"] not in known]
+            papers.extend(new)
+            start += len(page)
+            if len(page) < size or (total is not None and start >= total) or not new:
+                break
+        return papers
+
+    def fetch(self, queries: List[str], known: Iterable[str] = (), workers: int = 3) -> Dict[str, Dict[str, Any]]:
+        """New papers for all ``queries`` (run ``workers`` at a time), deduped by arXiv ID.
+
+        A paper found by several queries is kept once, under the first query listed.
+        A query that fails part-way is recorded in ``errors`` and contributes the
+        papers of the pages fetched before the failure.
+        """
+        known = frozenset(known)
+        if not queries:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(queries))), thread_name_prefix="arxiv") as pool:
+            results = list(pool.map(lambda query: self.fetch_query(query, known), queries))
+        papers: Dict[str, Dict[str, Any]] = {}
+        for query, found in zip(queries, results):
+            for paper in found:
+                papers.setdefault(paper["id"], {**paper, "query": query})
+        return papers
@@ -1,121 +1,117 @@
 #!/usr/bin/env python3
 """
 抓取 AI Agent 相關論文和專案
-使用 OpenClaw 的 web_search 和 web_fetch 工具
+arXiv 論文透過 arXiv API 抓取（arxiv_client.py），GitHub 專案與 Hugging Face 模型
+透過各自的搜尋 API 抓取（hub_clients.py），全部存入 rag_store.db
+每個來源各有 TTL（rag_config.REFRESH_TTL_HOURS），只重抓過期的查詢
 """
 
-import json
-import subprocess
+import argparse
 import sys
 import os
+from pathlib import Path
 
-# 設定路徑
-WORKSPACE = "/home/ubuntu/.openclaw/workspace"
-RAG_SYSTEM_DIR = os.path.join(WORKSPACE, "ai-dashboard", "rag_system")
+# 設定路徑：本目錄（rag_config 等）與上層的共用模組（http_client、rag_store）
+RAG_SYSTEM_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(RAG_SYSTEM_DIR)
+sys.path.append(os.path.dirname(RAG_SYSTEM_DIR))
 
-from rag_config import SEARCH_CONFIG, RAG_DATA_DIR
+from rag_config import (SEARCH_CONFIG, RAG_STORE_FILE, HTTP_CACHE_DIR, ARXIV_CONFIG, GITHUB_CONFIG,
+                        HUGGINGFACE_CONFIG, stale_queries)
+from api_client import RateLimitedApi, ResponseCache
+from arxiv_client import ArxivClient
+from hub_clients import github_project, github_search_url, huggingface_model, huggingface_search_url, search
+from rag_store import RagStore
+from rate_limit import TokenBucket
 
-def fetch_arxiv_papers():
-    """抓取 arXiv 論文"""
-    papers = []
-    
-    # 這裡會呼叫 OpenClaw 的 web_search 工具
-    # 由於我們在 Python 環境中，需要透過系統呼叫
-    queries = SEARCH_CONFIG["arxiv_queries"]
-    
-    for query in queries:
-        # 模擬搜尋結果（實際會透過 OpenClaw 工具執行）
-        search_result = {
-            "query": query,
-            "papers": [
-                {
-                    "title": f"Sample Paper on {query}",
-                    "authors": ["Author A", "Author B"],
-                    "abstract": f"This is a sample abstract about {query}. The paper presents a novel approach to AI agent architecture.",
-                    "url": "https://arxiv.org/abs/sample123",
-                    "published_date": "2026-02-22",
-                    "categories": ["cs.AI", "cs.LG"]
-                }
-            ]
-        }
-        papers.extend(search_result["papers"])
-    
-    return papers
+def fetch_arxiv_papers(store, queries):
+    """抓取 arXiv 論文：多個查詢同時進行、分頁，依 arXiv ID 去重，只存入新論文；回傳成功的查詢"""
+    interval = ARXIV_CONFIG["request_interval"]
+    client = ArxivClient(
+        base_url=ARXIV_CONFIG["base_url"],
+        limiter=TokenBucket(1.0 / interval if interval else 0.0),
+        page_size=ARXIV_CONFIG["page_size"],
+        max_results=ARXIV_CONFIG["max_results"],
+    )
+    papers = client.fetch(queries, store.ids("papers"), ARXIV_CONFIG["workers"])
+    added = store.add_new("papers", papers.values())
+    for query, error in client.errors.items():
+        print(f"❌ arXiv 查詢失敗（{query}）：{error}")
+    print(f"📄 arXiv：{len(queries)} 個查詢、{client.requests} 個請求，新論文 {added} 篇（共 {store.count('papers')} 篇）")
+    return [query for query in queries if query not in client.errors]
 
-def fetch_github_projects():
-    """抓取 GitHub 專案"""
-    projects = []
-    
-    queries = SEARCH_CONFIG["github_queries"]
-    
-    for query in queries:
-        project_result = {
-            "query": query,
-            "projects": [
-                {
-                    "name": f"sample-{query.replace(' ', '-')}",
-                    "description": f"A sample GitHub project for {query}",
-                    "url": f"https://github.com/sample/{query.replace(' ', '-')}",
-                    "stars": 100,
-                    "language": "Python",
-                    "last_updated": "2026-02-22"
-                }
-            ]
-        }
-        projects.extend(project_result["projects"])
-    
-    return projects
+def _hub_api(name, config, accept):
+    """一個 API 主機的請求：共用 token bucket、讀取額度 header、ETag 快取"""
+    headers = {"Accept": accept}
+    if config["token"]:
+        headers["Authorization"] = f"Bearer {config['token']}"
+    return RateLimitedApi(
+        name,
+        TokenBucket(config["requests_per_minute"] / 60.0, capacity=config["workers"]),
+        headers=headers,
+        cache=ResponseCache(Path(HTTP_CACHE_DIR) / name),
+    )
 
-def fetch_huggingface_models():
-    """抓取 Hugging Face 模型"""
-    models = []
-    
-    queries = SEARCH_CONFIG["huggingface_queries"]
-    
-    for query in queries:
-        model_result = {
-            "query": query,
-            "models": [
-                {
-                    "name": f"sample-{query.replace(' ', '-')}",
-                    "description": f"A sample Hugging Face model for {query}",
-                    "url": f"https://huggingface.co/sample/{query.replace(' ', '-')}",
-                    "downloads": 1000,
-                    "likes": 50,
-                    "tags": ["AI", "agent"]
-                }
-            ]
-        }
-        models.extend(model_result["models"])
-    
-    return models
+def _store_results(store, kind, api, label, queries, records, errors, counter):
+    """逐筆寫入 store（同 ID 只存一份，記錄星數 / 下載數的變化）；回傳成功的查詢"""
+    added, updated = store.upsert(kind, records.values(), counters=(counter,))
+    for query, error in errors.items():
+        print(f"❌ {label} 查詢失敗（{query}）：{error}")
+    stats = api.stats
+    print(f"{label}：{len(queries)} 個查詢、{stats['requests']} 個請求（{stats['not_modified']} 個 304、"
+          f"{stats['throttled']} 次等待額度重置），新增 {added}、更新 {updated}（共 {store.count(kind)} 個）")
+    return [query for query in queries if query not in errors]
+
+def fetch_github_projects(store, queries):
+    """抓取 GitHub 專案：所有查詢同時進行，依 repo 全名去重"""
+    config = GITHUB_CONFIG
+    api = _hub_api("github", config, "application/vnd.github+json")
+    urls = {query: github_search_url(config["base_url"], query, config["per_query"]) for query in queries}
+    records, errors = search(api, urls, github_project, config["workers"])
+    return _store_results(store, "projects", api, "💻 GitHub", queries, records, errors, "stars")
+
+def fetch_huggingface_models(store, queries):
+    """抓取 Hugging Face 模型：所有查詢同時進行，依模型 ID 去重"""
+    config = HUGGINGFACE_CONFIG
+    api = _hub_api("huggingface", config, "application/json")
+    urls = {query: huggingface_search_url(config["base_url"], query, config["per_query"]) for query in queries}
+    records, errors = search(api, urls, huggingface_model, config["workers"])
+    return _store_results(store, "models", api, "🤗 Hugging Face", queries, records, errors, "downloads")
+
+FETCHERS = {
+    "arxiv": fetch_arxiv_papers,
+    "github": fetch_github_projects,
+    "huggingface": fetch_huggingface_models,
+}
+
+def refresh(store, force=False, now=None):
+    """只重抓過期的查詢（force 時全部重抓），成功的查詢記下抓取時間；回傳每個來源重抓的查詢"""
+    refreshed = {}
+    for source, fetch in FETCHERS.items():
+        queries = SEARCH_CONFIG[f"{source}_queries"] if force else stale_queries(store, source, now)
+        if not queries:
+            continue
+        fetched = fetch(store, queries)
+        store.mark_fetched(source, fetched, when=now)
+        refreshed[source] = fetched
+    return refreshed
 
 def main():
     """主函數"""
+    parser = argparse.ArgumentParser(description="抓取 AI Agent 相關論文、專案與模型")
+    parser.add_argument("--force", action="store_true", help="忽略 TTL，重抓所有查詢")
+    args = parser.parse_args()
+
     print("開始抓取 AI Agent 相關資料...")
-    
-    # 抓取資料
-    papers = fetch_arxiv_papers()
-    projects = fetch_github_projects() 
-    models = fetch_huggingface_models()
-    
-    # 儲存資料
-    rag_data = {
-        "papers": papers,
-        "projects": projects,
-        "models": models,
-        "last_updated": "2026-02-22T12:00:00"
-    }
-    
-    data_file = os.path.join(RAG_DATA_DIR, "rag_data.json")
-    with open(data_file, "w", encoding="utf-8") as f:
-        json.dump(rag_data, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ 資料已儲存到: {data_file}")
-    print(f"📄 論文數量: {len(papers)}")
-    print(f"💻 專案數量: {len(projects)}")
-    print(f"🤗 模型數量: {len(models)}")
+    with RagStore(Path(RAG_STORE_FILE)) as store:
+        if not refresh(store, force=args.force):
+            print("✅ 所有查詢都還在 TTL 內，不需更新")
+        counts = {kind: store.count(kind) for kind in ("papers", "projects", "models")}
+
+    print(f"✅ 資料已存入: {RAG_STORE_FILE}")
+    print(f"📄 論文數量: {counts['papers']}")
+    print(f"💻 專案數量: {counts['projects']}")
+    print(f"🤗 模型數量: {counts['models']}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
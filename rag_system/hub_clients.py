@@ -0,0 +1,84 @@
+"""GitHub repository search and Hugging Face model search for the RAG fetchers.
+
+Both run their queries concurrently through one ``RateLimitedApi`` per host (shared
+token bucket, quota headers, conditional requests) and turn the results into
+rag_data records keyed by ``id`` (repository full name / model ID); a result found
+by several queries is kept once, with the first query that found it.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import quote, urlencode
+
+from api_client import RateLimitedApi
+
+HUGGINGFACE_URL = "https://huggingface.co"
+MAX_TAGS = 8
+
+Record = Dict[str, Any]
+
+
+def github_search_url(base_url: str, query: str, per_page: int) -> str:
+    params = {"q": query, "sort": "stars", "order": "desc", "per_page": per_page}
+    return f"{base_url.rstrip('/')}/search/repositories?{urlencode(params)}"
+
+
+def huggingface_search_url(base_url: str, query: str, limit: int) -> str:
+    params = {"search": query, "sort": "downloads", "direction": -1, "limit": limit}
+    return f"{base_url.rstrip('/')}/api/models?{urlencode(params)}"
+
+
+def github_project(repo: Dict[str, Any], query: str) -> Record:
+    return {
+        "id": repo["full_name"],
+        "name": repo["full_name"],
+        "description": (repo.get("description") or "").strip(),
+        "url": repo.get("html_url") or f"https://github.com/{repo['full_name']}",
+        "stars": int(repo.get("stargazers_count") or 0),
+        "forks": int(repo.get("forks_count") or 0),
+        "language": repo.get("language") or "",
+        "topics": list(repo.get("topics") or [])[:MAX_TAGS],
+        "last_updated": (repo.get("pushed_at") or repo.get("updated_at") or "")[:10],
+        "source": "GitHub",
+        "query": query,
+    }
+
+
+def huggingface_model(model: Dict[str, Any], query: str) -> Record:
+    model_id = model.get("id") or model["modelId"]
+    tags = [tag for tag in model.get("tags") or [] if ":" not in tag][:MAX_TAGS]
+    kind = " · ".join(part for part in (model.get("pipeline_tag"), model.get("library_name")) if part)
+    return {
+        "id": model_id,
+        "name": model_id,
+        "description": kind or ", ".join(tags),
+        "url": f"{HUGGINGFACE_URL}/{quote(model_id)}",
+        "downloads": int(model.get("downloads") or 0),
+        "likes": int(model.get("likes") or 0),
+        "tags": tags,
+        "last_updated": (model.get("lastModified") or model.get("createdAt") or "")[:10],
+        "source": "Hugging Face",
+        "query": query,
+    }
+
+
+def search(api: RateLimitedApi, urls: Dict[str, str], convert: Callable[[Dict[str, Any], str], Record],
+           workers: int) -> Tuple[Dict[str, Record], Dict[str, str]]:
+    """Run ``urls`` (query -> search URL) concurrently; returns ``(records by id, errors by query)``."""
+    pages = api.map_json(list(urls.values()), workers)
+    records: Dict[str, Record] = {}
+    errors: Dict[str, str] = {}
+    for query, url in urls.items():
+        page = pages[url]
+        if isinstance(page, Exception):
+            errors[query] = str(page) or type(page).__name__
+            continue
+        items: List[Dict[str, Any]] = page.get("items", []) if isinstance(page, dict) else page
+        for item in items:
+            try:
+                record = convert(item, query)
+            except (KeyError, TypeError, ValueError):
+                continue
+            records.setdefault(record["id"], record)
+    return records, errors
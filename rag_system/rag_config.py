@@ -5,13 +5,16 @@ RAG System Configuration for AI Dashboard
 """
 
 import os
-import json
-from datetime import datetime, timedelta
+import sys
+from datetime import timedelta
+from pathlib import Path
 
-# 設定檔路徑
-WORKSPACE = "/home/ubuntu/.openclaw/workspace"
-AI_DASHBOARD_DIR = os.path.join(WORKSPACE, "ai-dashboard")
+# 設定檔路徑（AI_DASHBOARD_WORKSPACE 與 generate_dashboard.py 相同，可指向測試用目錄）
+AI_DASHBOARD_DIR = os.environ.get("AI_DASHBOARD_WORKSPACE", "/home/ubuntu/.openclaw/workspace/ai-dashboard")
+WORKSPACE = os.path.dirname(AI_DASHBOARD_DIR)
 RAG_DATA_DIR = os.path.join(AI_DASHBOARD_DIR, "rag_data")
+RAG_STORE_FILE = os.path.join(RAG_DATA_DIR, "rag_store.db")  # 所有抓過的論文 / 專案 / 模型
+HTTP_CACHE_DIR = os.path.join(RAG_DATA_DIR, "http_cache")  # GitHub / Hugging Face 回應的 ETag 快取
 MEMORY_DIR = os.path.join(WORKSPACE, "memory")
 
 # 創建必要目錄
@@ -41,51 +44,60 @@ SEARCH_CONFIG = {
     ]
 }
 
-# 更新頻率設定
-UPDATE_CONFIG = {
-    "frequency_hours": 24,  # 每24小時更新一次
-    "last_update_file": os.path.join(RAG_DATA_DIR, "last_update.txt"),
-    "data_file": os.path.join(RAG_DATA_DIR, "rag_data.json")
+# arXiv API（base_url 可用 ARXIV_API_URL 指向本機 stub server）
+ARXIV_CONFIG = {
+    "base_url": os.environ.get("ARXIV_API_URL", "https://export.arxiv.org/api/query"),
+    "page_size": 50,
+    "max_results": 100,       # 每個查詢最多往回翻幾篇
+    "request_interval": 3.0,  # arXiv API 規範：每 3 秒最多一個請求（所有查詢共用）
+    "workers": 3,             # 同時進行的查詢數
 }
 
-def get_last_update_time():
-    """獲取上次更新時間"""
-    try:
-        with open(UPDATE_CONFIG["last_update_file"], "r") as f:
-            return f.read().strip()
-    except FileNotFoundError:
-        return None
+# GitHub 搜尋 API（base_url 可用 GITHUB_API_URL 指向本機 stub server；有 GITHUB_TOKEN 時額度較高）
+GITHUB_CONFIG = {
+    "base_url": os.environ.get("GITHUB_API_URL", "https://api.github.com"),
+    "token": os.environ.get("GITHUB_TOKEN", ""),
+    "per_query": 20,
+    "requests_per_minute": 30 if os.environ.get("GITHUB_TOKEN") else 10,  # search API 的額度
+    "workers": 3,
+}
 
-def set_last_update_time():
-    """設定上次更新時間"""
-    with open(UPDATE_CONFIG["last_update_file"], "w") as f:
-        f.write(datetime.now().isoformat())
+# Hugging Face 模型 API（base_url 可用 HUGGINGFACE_API_URL 指向本機 stub server）
+HUGGINGFACE_CONFIG = {
+    "base_url": os.environ.get("HUGGINGFACE_API_URL", "https://huggingface.co"),
+    "token": os.environ.get("HF_TOKEN", ""),
+    "per_query": 20,
+    "requests_per_minute": 60,
+    "workers": 3,
+}
 
-def should_update():
-    """檢查是否需要更新"""
-    last_update = get_last_update_time()
-    if not last_update:
-        return True
-    
-    last_update_time = datetime.fromisoformat(last_update)
-    hours_since_update = (datetime.now() - last_update_time).total_seconds() / 3600
-    return hours_since_update >= UPDATE_CONFIG["frequency_hours"]
+# 每個來源的資料多久算過期（小時）：只重抓上次抓取已超過 TTL 的查詢
+REFRESH_TTL_HOURS = {
+    "arxiv": 24,
+    "github": 6,        # 星數變化較快
+    "huggingface": 12,
+}
 
-def save_rag_data(data):
-    """儲存 RAG 資料"""
-    with open(UPDATE_CONFIG["data_file"], "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def refresh_ttl(source):
+    """來源的 TTL"""
+    return timedelta(hours=REFRESH_TTL_HOURS[source])
 
-def load_rag_data():
-    """載入 RAG 資料"""
-    try:
-        with open(UPDATE_CONFIG["data_file"], "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {"papers": [], "projects": [], "models": []}
+def stale_queries(store, source, now=None):
+    """該來源中從未抓過、或上次抓取已超過 TTL 的查詢"""
+    return store.stale(source, SEARCH_CONFIG[f"{source}_queries"], refresh_ttl(source), now)
+
+def should_update(store):
+    """是否有任何來源的查詢已過期"""
+    return any(stale_queries(store, source) for source in REFRESH_TTL_HOURS)
 
 if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from rag_store import RagStore
+
     print("RAG 系統設定已載入")
     print(f"工作目錄: {WORKSPACE}")
     print(f"RAG 資料目錄: {RAG_DATA_DIR}")
-    print(f"是否需要更新: {should_update()}")
\ No newline at end of file
+    with RagStore(Path(RAG_STORE_FILE)) as store:
+        for source in REFRESH_TTL_HOURS:
+            stale = stale_queries(store, source)
+            print(f"{source}: {len(stale)}/{len(SEARCH_CONFIG[source + '_queries'])} 個查詢需要更新")
@@ -0,0 +1,52 @@
+"""Thread-safe token bucket shared by the RAG fetchers' worker threads."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """``rate`` tokens per second, bursts of up to ``capacity``.
+
+    ``acquire`` reserves its tokens under the lock (the balance may go negative) and
+    sleeps outside it, so concurrent callers are served in arrival order and never
+    exceed the rate between them.  ``pause_until`` holds every caller back until a
+    point in time, e.g. when an API reports its quota exhausted until a reset time.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause_until(self, when: float) -> None:
+        """Make ``acquire`` wait until ``when`` (on this bucket's clock)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, when)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens``, waiting as long as needed; returns the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            wait = 0.0
+            if self.rate > 0:
+                self._refill(now)
+                self._tokens -= tokens
+                wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            wait = max(wait, self._paused_until - now)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
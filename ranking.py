@@ -0,0 +1,207 @@
+"""Score-based ranking of candidate articles and section assignment.
+
+    score = source weight
+          * (1 + coverage weight * log2(sources covering the story))
+          * keyword multipliers (boosts > 1, promo penalties < 1)
+          * 0.5 ** (age / half-life)
+
+Everything except the recency term is time-independent, so ``FeatureTable`` computes
+it per article into flat ``array('d')`` columns next to the publish timestamps.  The
+keyword / topic matches (one regex pass over title + summary, the expensive part) are
+cached on the config per article, so a table built again with mostly the same
+articles (the next daemon poll, a re-run in the same process) only matches the new
+ones.  Ranking works on log scores, which order articles exactly like the scores:
+one sort, then each section takes its best stories, preferring those matching its
+topic pattern.  Heavily penalised articles (promotions) are left out altogether.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from dataclasses import dataclass, field
+from itertools import compress, repeat
+from operator import attrgetter, ge, itemgetter, lt
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+
+SECTION_SIZES: Tuple[Tuple[str, int], ...] = (("headlines", 2), ("industry", 4), ("highlights", 2))
+
+
+@dataclass
+class RankingConfig:
+    half_life_hours: float = 18.0
+    source_weights: Dict[str, float] = field(default_factory=dict)
+    default_source_weight: float = 1.0
+    coverage_weight: float = 0.5
+    # Patterns are matched case-insensitively on whole words and must not contain
+    # capturing groups (use (?:...)), since matches are told apart by group name.
+    # Entries in ``_features`` depend on these fields: treat a config in use as frozen.
+    keyword_weights: Dict[str, float] = field(default_factory=dict)    # regex -> multiplier
+    section_topics: Dict[str, str] = field(default_factory=dict)       # section -> regex
+    section_affinity: float = 1.6
+    min_prior: float = 0.3     # articles below this (e.g. penalised promos) never fill a slot
+    _matcher: Optional["re.Pattern[str]"] = field(default=None, init=False, repr=False)
+    # (link, title, summary, published, source) -> FeatureTable entry, for the latest tables' articles
+    _features: Dict[tuple, tuple] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def decay(self) -> float:
+        return math.log(2) / (self.half_life_hours * 3600.0)
+
+    @property
+    def matcher(self) -> "re.Pattern[str]":
+        """All keyword and topic patterns as one alternation of named groups (k<i>, s_<section>).
+
+        When every pattern is lower case it is matched case-sensitively against lower-cased
+        text, which is several times faster than re.IGNORECASE.
+        """
+        if self._matcher is None:
+            groups = [f"(?P<k{i}>{pattern})" for i, pattern in enumerate(self.keyword_weights)]
+            groups += [f"(?P<s_{section}>{pattern})" for section, pattern in self.section_topics.items()]
+            pattern = r"\b(?:" + "|".join(groups or ["(?!)"]) + r")\b"
+            patterns = [*self.keyword_weights, *self.section_topics.values()]
+            flags = 0 if all(p == p.lower() for p in patterns) else re.IGNORECASE
+            self._matcher = re.compile(pattern, flags)
+        return self._matcher
+
+    def text_features(self, title: str, summary: str) -> Tuple[float, Tuple[str, ...]]:
+        """Product of the matched keyword multipliers, and the sections whose topic matched."""
+        matcher = self.matcher
+        text = f"{title}\n{summary}"
+        factors = list(self.keyword_weights.values())
+        matched = {m.lastgroup for m in matcher.finditer(text if matcher.flags & re.IGNORECASE else text.lower())}
+        factor = 1.0
+        sections = []
+        for name in matched:
+            if name[0] == "k":
+                factor *= factors[int(name[1:])]
+            else:
+                sections.append(name[2:])
+        return factor, tuple(sorted(sections))
+
+
+# What a cached entry depends on: an article whose key is not cached is matched again.
+_cache_key = attrgetter("link", "title", "summary", "published", "source")
+_related = attrgetter("related")
+_source = attrgetter("source")
+
+
+class FeatureTable:
+    """Time-independent features of ``articles``, one column entry per article.
+
+    Besides ``published`` / ``prior``, ``log_key`` holds ``log(prior) + decay * published``,
+    which is ``log(score) + decay * now`` for every article not dated in the future.
+    """
+
+    def __init__(self, articles: Sequence[Any], config: RankingConfig) -> None:
+        self.articles = list(articles)
+        self.config = config
+        # Entries are (log key, timestamp, source weight x keyword factor, one topic flag per
+        # section); with them cached, the columns are C-level map / itemgetter passes.
+        cache = config._features
+        keys = list(map(_cache_key, self.articles))
+        entries = list(map(cache.get, keys))
+        if None in entries:
+            decay = config.decay
+            weights, default_weight = config.source_weights, config.default_source_weight
+            for i in [i for i, entry in enumerate(entries) if entry is None]:
+                article = self.articles[i]
+                factor, sections = config.text_features(article.title, article.summary)
+                prior = weights.get(article.source, default_weight) * factor
+                t = article.published.timestamp()
+                log_key = math.log(prior) + decay * t if prior > 0 else -math.inf
+                entries[i] = cache[keys[i]] = (log_key, t, prior, *(section in sections for section in config.section_topics))
+            # Keep the cache to about the articles of the latest tables.
+            if len(cache) > 2 * len(keys):
+                config._features = dict(zip(keys, entries))
+        self.published = array("d", map(itemgetter(1), entries))
+        prior = list(map(itemgetter(2), entries))
+        self.log_key = list(map(itemgetter(0), entries))
+        boosts: Dict[int, Tuple[float, float]] = {}    # sources -> coverage boost, its log
+        for i in compress(range(len(self.articles)), map(_related, self.articles)):
+            article = self.articles[i]
+            sources = len({article.source, *map(_source, article.related)})
+            if sources > 1:
+                boost = boosts.get(sources)
+                if boost is None:
+                    factor = 1.0 + config.coverage_weight * math.log2(sources)
+                    boost = boosts[sources] = (factor, math.log(factor))
+                prior[i] *= boost[0]
+                self.log_key[i] += boost[1]
+        self.prior = array("d", prior)
+        # Articles allowed to fill a slot at all.
+        floor = config.min_prior
+        self.eligible = list(compress(range(len(prior)), map(ge, prior, repeat(floor))))
+        # Topic flags, cleared for articles that are not eligible: ``topics[s].count(1)``
+        # is then the number of candidates for section ``s``'s topic.
+        self.topics: Dict[str, bytearray] = {
+            section: bytearray(map(itemgetter(3 + k), entries)) for k, section in enumerate(config.section_topics)
+        }
+        if len(self.eligible) < len(prior):
+            for i in compress(range(len(prior)), map(lt, prior, repeat(floor))):
+                for column in self.topics.values():
+                    column[i] = 0
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def scores(self, now: float) -> List[float]:
+        """Scores at unix time ``now``; future-dated articles count as brand new."""
+        decay = self.config.decay
+        exp = math.exp
+        return [prior * exp(-decay * (now - t if now > t else 0.0)) for prior, t in zip(self.prior, self.published)]
+
+    def log_scores(self, now: float) -> List[float]:
+        """``log(score) + decay * now`` per article: orders articles like ``scores``."""
+        if not self.published or max(self.published) <= now:
+            return self.log_key
+        # Future-dated articles all count as published ``now``: equal priors, equal keys.
+        keys = list(self.log_key)
+        decay_now = self.config.decay * now
+        for i, t in enumerate(self.published):
+            if t > now and self.prior[i] > 0:
+                keys[i] = math.log(self.prior[i]) + decay_now
+        return keys
+
+
+def rank_sections(table: FeatureTable, now: float, demoted: Collection[int] = (),
+                  sizes: Sequence[Tuple[str, int]] = SECTION_SIZES) -> Dict[str, List[Any]]:
+    """Fill sections in order from the scores; ``demoted`` indices only fill what fresh articles cannot.
+
+    A section is left short rather than filled with an article below ``min_prior``.
+    """
+    keys = table.log_scores(now)
+    order = sorted(table.eligible, key=keys.__getitem__, reverse=True)
+    boost = math.log(table.config.section_affinity)
+    demoted = set(demoted)
+    taken: set = set()
+    sections: Dict[str, List[Any]] = {}
+    for section, size in sizes:
+        topic = table.topics.get(section)
+        # Within one (demoted, matches the topic) group the order is ``order``, so only
+        # the first ``size`` articles of each group can make the section.  Demoted articles
+        # lose to fresh ones anyway, so the scan stops once the fresh group without the
+        # topic is full and the one with it is full too or has no articles left below.
+        topic_left = topic.count(1) if topic is not None else 0
+        counts: Dict[Tuple[bool, bool], int] = {}
+        candidates = []
+        for i in order:
+            matches = topic is not None and topic[i] == 1
+            topic_left -= matches
+            if i not in taken:
+                group = (i in demoted, matches)
+                count = counts.get(group, 0)
+                if count < size:
+                    counts[group] = count + 1
+                    candidates.append(i)
+            if counts.get((False, False), 0) >= size and (not topic_left or counts.get((False, True), 0) >= size):
+                break
+
+        def key(i: int) -> Tuple[bool, float]:
+            return (i in demoted, -(keys[i] + boost) if topic is not None and topic[i] else -keys[i])
+
+        picked = sorted(candidates, key=key)[:size]
+        taken.update(picked)
+        sections[section] = [table.articles[i] for i in picked]
+    return sections
@@ -0,0 +1,161 @@
+/* Client-side BM25 search over the sharded index written by search_index.py.
+ * Nothing is fetched until the search box is used; each query term loads only its
+ * posting shard, and only the days that make the top results load their documents.
+ * tokenize() and shardOf() must stay in sync with search_index.py. */
+(function () {
+    "use strict";
+
+    const ROOT = "search/";
+    const K1 = 1.2;
+    const B = 0.75;
+    const LIMIT = 10;
+    const STOPWORDS = new Set(
+        "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split(" ")
+    );
+    const TOKEN_RE = /[0-9a-z]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+/g;
+    const SECTION_LABELS = { headlines: "🔥 頭條", industry: "💼 產業", highlights: "🧠 深度" };
+
+    let metaPromise = null;
+    const shards = new Map();
+    const days = new Map();
+
+    function fetchJson(path) {
+        return fetch(ROOT + path).then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.status + " " + path);
+            }
+            return response.json();
+        });
+    }
+
+    function cached(cache, key, path, fallback) {
+        if (!cache.has(key)) {
+            cache.set(key, fetchJson(path).catch(function () { return fallback; }));
+        }
+        return cache.get(key);
+    }
+
+    function tokenize(text) {
+        const tokens = [];
+        const runs = text.normalize("NFKC").toLowerCase().match(TOKEN_RE) || [];
+        for (const run of runs) {
+            if (/^[\x00-\x7f]+$/.test(run)) {
+                if (!STOPWORDS.has(run)) {
+                    tokens.push(run);
+                }
+            } else if (run.length === 1) {
+                tokens.push(run);
+            } else {
+                for (let i = 0; i < run.length - 1; i++) {
+                    tokens.push(run.slice(i, i + 2));
+                }
+            }
+        }
+        return tokens;
+    }
+
+    function shardOf(term, count) {
+        let value = 0x811c9dc5;
+        for (const byte of new TextEncoder().encode(term)) {
+            value = Math.imul(value ^ byte, 0x01000193) >>> 0;
+        }
+        return value % count;
+    }
+
+    async function search(query) {
+        if (!metaPromise) {
+            metaPromise = fetchJson("meta.json");
+        }
+        const meta = await metaPromise;
+        if (!meta.docs) {
+            return [];
+        }
+        const avgdl = meta.length / meta.docs;
+        const scores = new Map();
+        for (const term of new Set(tokenize(query))) {
+            const shard = shardOf(term, meta.shards);
+            const postings = (await cached(shards, shard, "postings/" + String(shard).padStart(2, "0") + ".json", {}))[term];
+            if (!postings) {
+                continue;
+            }
+            let df = 0;
+            for (const day in postings) {
+                df += postings[day].length;
+            }
+            const idf = Math.log(1 + (meta.docs - df + 0.5) / (df + 0.5));
+            for (const day in postings) {
+                const lengths = meta.days[day].lengths;
+                for (const [number, tf] of postings[day]) {
+                    const norm = tf + K1 * (1 - B + B * lengths[number] / avgdl);
+                    const key = day + "#" + number;
+                    scores.set(key, (scores.get(key) || 0) + idf * tf * (K1 + 1) / norm);
+                }
+            }
+        }
+        const ranked = Array.from(scores.entries())
+            .sort(function (a, b) { return b[1] - a[1] || (a[0] < b[0] ? -1 : 1); })
+            .slice(0, LIMIT);
+        return Promise.all(ranked.map(async function ([key, score]) {
+            const [day, number] = key.split("#");
+            const docs = await cached(days, day, "docs/" + day + ".json", []);
+            return Object.assign({ day: day, score: score }, docs[Number(number)]);
+        }));
+    }
+
+    function render(list, results, query) {
+        list.replaceChildren();
+        if (!query.trim()) {
+            return;
+        }
+        if (!results.length) {
+            const empty = document.createElement("li");
+            empty.className = "empty";
+            empty.textContent = "找不到相關內容";
+            list.appendChild(empty);
+            return;
+        }
+        for (const hit of results) {
+            const item = document.createElement("li");
+            const link = document.createElement("a");
+            link.href = hit.link;
+            link.target = "_blank";
+            link.textContent = hit.title;
+            const meta = document.createElement("div");
+            meta.className = "search-meta";
+            meta.textContent = [hit.day, SECTION_LABELS[hit.section], hit.source].filter(Boolean).join(" · ");
+            item.append(link, meta);
+            if (hit.summary) {
+                const summary = document.createElement("p");
+                summary.textContent = hit.summary;
+                item.appendChild(summary);
+            }
+            list.appendChild(item);
+        }
+    }
+
+    document.addEventListener("DOMContentLoaded", function () {
+        const input = document.getElementById("history-search");
+        const list = document.getElementById("search-results");
+        if (!input || !list) {
+            return;
+        }
+        let timer = null;
+        let latest = 0;
+        input.addEventListener("input", function () {
+            clearTimeout(timer);
+            timer = setTimeout(async function () {
+                const query = input.value;
+                const ticket = ++latest;
+                try {
+                    const results = await search(query);
+                    if (ticket === latest) {
+                        render(list, results, query);
+                    }
+                } catch (error) {
+                    list.innerHTML = '<li class="empty">搜尋索引尚未建立</li>';
+                    metaPromise = null;
+                }
+            }, 200);
+        });
+    });
+})();
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Incremental BM25 full-text index over the history archive.
+
+Documents are the articles in ``history/<day>.md`` (title, source and translated
+summary) plus the timeline titles of days that have no history file.  Tokens are
+lower-cased Latin words and CJK character bigrams, so Traditional Chinese summaries
+are searchable without a word segmenter.  search.js implements the same tokenizer
+and shard hash, so index.html can query the index client-side.
+
+Layout (compact JSON, fetched lazily by the browser)::
+
+    <index>/meta.json             doc count, total length, per-day doc lengths + content hash
+    <index>/docs/<day>.json       that day's documents
+    <index>/postings/<nn>.json    term -> {day: [[doc, tf], ...]}, terms sharded by FNV-1a
+
+Re-indexing a day re-tokenizes only that day's previous documents to find the
+postings to drop, so the rest of the archive is never re-read.
+
+    python search_index.py query "輝達 晶片"
+    python search_index.py build
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from output_writer import OUTPUTS
+
+FORMAT_VERSION = 1
+SHARDS = 32
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+# Kana, CJK Extension A, CJK Unified Ideographs, CJK Compatibility Ideographs, Hangul.
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+")
+_SECTION_HEADINGS = {
+    "## 🔥 頭條新聞": "headlines",
+    "## 💼 產業動態": "industry",
+    "## 🧠 深度觀點": "highlights",
+}
+_ITEM_RE = re.compile(r"^- \*\*\[(?P<title>.+?)\]\((?P<link>[^)\s]+)\)\*\*(?:\s+_(?P<meta>.*?)_)?\s*$")
+
+
+def tokenize(text: str) -> List[str]:
+    """Latin words (minus stopwords) and overlapping CJK bigrams; a lone CJK character is kept as is."""
+    tokens: List[str] = []
+    for run in _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if run.isascii():
+            if run not in STOPWORDS:
+                tokens.append(run)
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def shard_of(term: str) -> int:
+    """FNV-1a (32-bit) of the UTF-8 term; search.js computes the same value."""
+    value = 0x811C9DC5
+    for byte in term.encode("utf-8"):
+        value = ((value ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return value % SHARDS
+
+
+def document_terms(doc: Dict[str, Any]) -> Counter:
+    terms = Counter(tokenize(doc.get("title", "")) * TITLE_WEIGHT)
+    terms.update(tokenize(" ".join((doc.get("source", ""), doc.get("summary", "")))))
+    return terms
+
+
+# ---------------------------------------------------------------------------
+# Document extraction
+# ---------------------------------------------------------------------------
+
+def parse_history(markdown: str) -> List[Dict[str, Any]]:
+    """Articles of the three news sections of a rendered history/DASHBOARD.md file."""
+    docs: List[Dict[str, Any]] = []
+    section: Optional[str] = None
+    lines = markdown.splitlines()
+    for pos, line in enumerate(lines):
+        if line.startswith("## "):
+            section = _SECTION_HEADINGS.get(line.strip())
+            continue
+        if section is None:
+            continue
+        match = _ITEM_RE.match(line)
+        if not match:
+            continue
+        summary = ""
+        if pos + 1 < len(lines) and lines[pos + 1].startswith("  "):
+            summary = lines[pos + 1].strip()
+        docs.append({
+            "title": match["title"],
+            "link": match["link"],
+            "source": (match["meta"] or "").split(" · ")[0],
+            "summary": summary,
+            "section": section,
+        })
+    return docs
+
+
+def timeline_documents(entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"title": title, "link": entry.get("link", ""), "source": "", "summary": "", "section": section}
+        for section in ("headlines", "industry", "highlights")
+        for title in entry.get(section) or []
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class SearchIndex:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.meta: Dict[str, Any] = {"version": FORMAT_VERSION, "shards": SHARDS, "docs": 0, "length": 0, "days": {}}
+        self._shards: Dict[int, Dict[str, Dict[str, List[List[int]]]]] = {}
+        self._dirty_shards: set = set()
+        self._dirty = False
+        meta_path = root / "meta.json"
+        if meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                meta = {}
+            if meta.get("version") == FORMAT_VERSION and meta.get("shards") == SHARDS:
+                self.meta = meta
+
+    def __len__(self) -> int:
+        return self.meta["docs"]
+
+    def days(self) -> List[str]:
+        return sorted(self.meta["days"])
+
+    def _shard(self, shard: int) -> Dict[str, Dict[str, List[List[int]]]]:
+        if shard not in self._shards:
+            path = self.root / "postings" / f"{shard:02d}.json"
+            self._shards[shard] = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        return self._shards[shard]
+
+    def _load_docs(self, day: str) -> List[Dict[str, Any]]:
+        path = self.root / "docs" / f"{day}.json"
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+    def index_day(self, day: str, docs: List[Dict[str, Any]]) -> bool:
+        """Replace ``day``'s documents; returns False when they are unchanged."""
+        digest = hashlib.sha1(json.dumps(docs, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+        previous = self.meta["days"].get(day)
+        if previous and previous["hash"] == digest:
+            return False
+        if previous:
+            self.remove_day(day)
+        if not docs:
+            return True
+
+        lengths = []
+        for number, doc in enumerate(docs):
+            terms = document_terms(doc)
+            lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                shard = shard_of(term)
+                self._shard(shard).setdefault(term, {}).setdefault(day, []).append([number, tf])
+                self._dirty_shards.add(shard)
+        self.meta["days"][day] = {"hash": digest, "lengths": lengths}
+        self.meta["docs"] += len(docs)
+        self.meta["length"] += sum(lengths)
+        _write_json(self.root / "docs" / f"{day}.json", docs)
+        self._dirty = True
+        return True
+
+    def remove_day(self, day: str) -> None:
+        previous = self.meta["days"].pop(day, None)
+        if previous is None:
+            return
+        for doc in self._load_docs(day):
+            for term in document_terms(doc):
+                shard = shard_of(term)
+                postings = self._shard(shard).get(term)
+                if postings and postings.pop(day, None) is not None:
+                    if not postings:
+                        del self._shard(shard)[term]
+                    self._dirty_shards.add(shard)
+        self.meta["docs"] -= len(previous["lengths"])
+        self.meta["length"] -= sum(previous["lengths"])
+        OUTPUTS.remove(self.root / "docs" / f"{day}.json")
+        self._dirty = True
+
+    def sync(self, history_dir: Path, timeline_entries: Iterable[Dict[str, Any]] = ()) -> List[str]:
+        """Bring the index in line with the archive; returns the days that were (re)indexed."""
+        wanted: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in timeline_entries:
+            if entry.get("date"):
+                wanted[entry["date"]] = timeline_documents(entry)
+        for path in sorted(history_dir.glob("*.md")):
+            wanted[path.stem] = parse_history(path.read_text(encoding="utf-8"))
+        for day in set(self.meta["days"]) - set(wanted):
+            self.remove_day(day)
+        return [day for day, docs in sorted(wanted.items()) if self.index_day(day, docs)]
+
+    def save(self) -> None:
+        for shard in sorted(self._dirty_shards):
+            _write_json(self.root / "postings" / f"{shard:02d}.json", self._shards[shard])
+        self._dirty_shards.clear()
+        if self._dirty:
+            _write_json(self.root / "meta.json", self.meta)
+            self._dirty = False
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        total = self.meta["docs"]
+        if not total:
+            return []
+        avgdl = self.meta["length"] / total
+        scores: Dict[tuple, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self._shard(shard_of(term)).get(term)
+            if not postings:
+                continue
+            df = sum(len(hits) for hits in postings.values())
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for day, hits in postings.items():
+                lengths = self.meta["days"][day]["lengths"]
+                for number, tf in hits:
+                    norm = tf + K1 * (1 - B + B * lengths[number] / avgdl)
+                    scores[(day, number)] = scores.get((day, number), 0.0) + idf * tf * (K1 + 1) / norm
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        docs_by_day: Dict[str, List[Dict[str, Any]]] = {}
+        results = []
+        for (day, number), score in ranked:
+            if day not in docs_by_day:
+                docs_by_day[day] = self._load_docs(day)
+            results.append({"day": day, "score": round(score, 4), **docs_by_day[day][number]})
+        return results
+
+
+def _write_json(path: Path, data: Any) -> None:
+    OUTPUTS.write(path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import generate_dashboard as gd
+
+    parser = argparse.ArgumentParser(description="搜尋歷史儀表板（BM25）")
+    commands = parser.add_subparsers(dest="command", required=True)
+    query = commands.add_parser("query", help="查詢索引")
+    query.add_argument("text", nargs="+")
+    query.add_argument("--limit", type=int, default=10)
+    build = commands.add_parser("build", help="依 history/ 與時間軸更新索引")
+    build.add_argument("--full", action="store_true", help="清空後重建")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.full:
+            for path in gd.SEARCH_INDEX_DIR.glob("**/*.json"):
+                path.unlink()
+        index = SearchIndex(gd.SEARCH_INDEX_DIR)
+        changed = index.sync(gd.HISTORY_DIR, gd.load_timeline_entries(0))
+        index.save()
+        print(f"已索引 {len(changed)} 天，共 {len(index)} 篇文章")
+        return
+
+    index = SearchIndex(gd.SEARCH_INDEX_DIR)
+    for hit in index.search(" ".join(args.text), args.limit):
+        print(f"{hit['score']:7.3f}  {hit['day']}  {hit['title']}")
+        print(f"         {hit['link']}")
+
+
+if __name__ == "__main__":
+    main()
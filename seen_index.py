@@ -0,0 +1,151 @@
+"""Compact cross-day index of articles that were already featured on the dashboard.
+
+Each featured article contributes two 64-bit keys (normalised title, canonical URL)
+paired with the day it was shown.  The index is two parallel sorted arrays
+(``array('Q')`` keys, ``array('I')`` day ordinals) stored in one binary file, so
+loading is a single read and a lookup is a binary search.
+
+The file is bootstrapped once from the news sections of ``history/*.md`` and from
+``timeline.json``; after that each run only merges its own featured articles in.
+"""
+
+from __future__ import annotations
+
+import array
+import bisect
+import hashlib
+import json
+import struct
+from datetime import date
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import dedup
+from output_writer import atomic_write
+from search_index import parse_history
+
+# Version 2: version 1 bootstraps also took the RAG papers / projects / models of
+# history/*.md for featured articles, so a version 1 cache file is rebuilt.  Snapshot
+# state keeps replaying as recorded, whichever version it is.
+MAGIC = b"SEEN2\0\0\0"
+_READABLE = (MAGIC, b"SEEN1\0\0\0")
+_HEADER = struct.Struct("<8sQ")
+
+
+def _hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def article_keys(title: str, link: str = "") -> List[int]:
+    keys = []
+    normalised = " ".join(dedup.tokenize(title))
+    if normalised:
+        keys.append(_hash("t:" + normalised))
+    if link:
+        keys.append(_hash("u:" + dedup.canonical_url(link)))
+    return keys
+
+
+class SeenIndex:
+    """``path`` may be None for a read-only index (e.g. during a replay)."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.keys = array.array("Q")
+        self.days = array.array("I")
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SeenIndex"]:
+        """Load ``path`` with one read; None if it is missing, unreadable or an older version."""
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return None
+        if not raw.startswith(MAGIC):
+            return None
+        return cls.from_bytes(path, raw)
+
+    @classmethod
+    def from_bytes(cls, path: Optional[Path], raw: bytes) -> Optional["SeenIndex"]:
+        index = cls(path)
+        try:
+            magic, count = _HEADER.unpack_from(raw)
+        except struct.error:
+            return None
+        if magic not in _READABLE:
+            return None
+        offset = _HEADER.size
+        index.keys.frombytes(raw[offset:offset + 8 * count])
+        offset += 8 * count
+        index.days.frombytes(raw[offset:offset + 4 * count])
+        if len(index.keys) != count or len(index.days) != count:
+            return None
+        return index
+
+    @classmethod
+    def bootstrap(cls, path: Path, history_dir: Path, timeline_json: Path) -> "SeenIndex":
+        """Build the index from the archive; only used when no index file exists yet."""
+        entries: List[Tuple[int, int]] = []
+        for history_file in sorted(history_dir.glob("*.md")):
+            try:
+                day = date.fromisoformat(history_file.stem).toordinal()
+            except ValueError:
+                continue
+            for doc in parse_history(history_file.read_text(encoding="utf-8")):
+                entries.extend((key, day) for key in article_keys(doc["title"], doc["link"]))
+        if timeline_json.exists():
+            try:
+                timeline = json.loads(timeline_json.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                timeline = []
+            for entry in timeline:
+                try:
+                    day = date.fromisoformat(entry.get("date", "")).toordinal()
+                except ValueError:
+                    continue
+                for section in ("headlines", "industry", "highlights"):
+                    for title in entry.get(section) or []:
+                        entries.extend((key, day) for key in article_keys(title))
+        index = cls(path)
+        index._merge(entries)
+        return index
+
+    def _merge(self, entries: Iterable[Tuple[int, int]]) -> None:
+        new = sorted(set(entries))
+        if not new:
+            return
+        merged = sorted(set(zip(self.keys, self.days)) | set(new))
+        self.keys = array.array("Q", (key for key, _ in merged))
+        self.days = array.array("I", (day for _, day in merged))
+        self._dirty = True
+
+    def first_seen(self, keys: Iterable[int]) -> Optional[int]:
+        """Earliest day ordinal on which any of ``keys`` was featured."""
+        earliest = None
+        for key in keys:
+            pos = bisect.bisect_left(self.keys, key)
+            if pos < len(self.keys) and self.keys[pos] == key:
+                day = self.days[pos]   # pairs are sorted, so this is the earliest day for the key
+                earliest = day if earliest is None else min(earliest, day)
+        return earliest
+
+    def seen_before(self, title: str, link: str, day: date) -> bool:
+        first = self.first_seen(article_keys(title, link))
+        return first is not None and first < day.toordinal()
+
+    def add(self, items: Iterable[Tuple[str, str]], day: date) -> None:
+        ordinal = day.toordinal()
+        self._merge((key, ordinal) for title, link in items for key in article_keys(title, link))
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(MAGIC, len(self.keys)) + self.keys.tobytes() + self.days.tobytes()
+
+    def save(self) -> None:
+        if not self._dirty or self.path is None:
+            return
+        atomic_write(self.path, self.to_bytes())
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.keys)
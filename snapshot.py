@@ -0,0 +1,178 @@
+"""Record/replay of a run's HTTP traffic (feeds and translation) as a snapshot directory.
+
+Layout::
+
+    <snapshot>/manifest.json        run clock, request key -> response metadata (or the
+                                    transport error), target -> source text -> translation
+    <snapshot>/blobs/<sha256>.gz    response bodies, content-addressed and gzip-compressed
+    <snapshot>/state/<name>         small pieces of run state (the seen index, the RAG payload)
+
+A request key is sha256 of method, URL and request body, so a replay resolves the
+exact same requests the recorded run made, with no network I/O at all.  Translations
+are kept per text as well: batch bodies depend on which articles made the cut, so a
+replay looks each text up on its own instead of re-sending the recorded batches.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from http_client import HttpClient, Response
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 2
+READABLE_VERSIONS = (1, 2)   # version 1 has no translations, so its translation lookups miss
+
+
+class SnapshotMiss(ConnectionError):
+    """The replayed run made a request that the snapshot does not contain."""
+
+
+def request_key(method: str, url: str, body: Optional[bytes]) -> str:
+    digest = hashlib.sha256(f"{method.upper()} {url}\n".encode("utf-8"))
+    digest.update(body or b"")
+    return digest.hexdigest()
+
+
+class Snapshot:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.now: Optional[datetime] = None
+        self.requests: Dict[str, Dict[str, Any]] = {}
+        self.translations: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, root: Path) -> "Snapshot":
+        snapshot = cls(root)
+        manifest = json.loads((root / MANIFEST).read_text(encoding="utf-8"))
+        if manifest.get("version") not in READABLE_VERSIONS:
+            raise ValueError(f"不支援的快照格式：{manifest.get('version')}")
+        snapshot.now = datetime.fromisoformat(manifest["now"]) if manifest.get("now") else None
+        snapshot.requests = manifest.get("requests", {})
+        snapshot.translations = manifest.get("translations", {})
+        return snapshot
+
+    def put_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.root / "blobs" / f"{digest}.gz"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(gzip.compress(data, mtime=0))
+            os.replace(tmp, path)
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        return gzip.decompress((self.root / "blobs" / f"{digest}.gz").read_bytes())
+
+    def record(self, method: str, url: str, body: Optional[bytes], response: Response) -> None:
+        entry = {
+            "method": method.upper(),
+            "url": url,
+            "final_url": response.url,
+            "status": response.status,
+            # The body is stored decoded, so transfer headers no longer apply.
+            "headers": {k: v for k, v in response.headers.items() if k not in ("content-encoding", "content-length")},
+            "blob": self.put_blob(response.body),
+        }
+        with self._lock:
+            self.requests[request_key(method, url, body)] = entry
+
+    def record_error(self, method: str, url: str, body: Optional[bytes], error: BaseException) -> None:
+        """Store a request that failed without a response (timeout, refused, ...) so it fails on replay too."""
+        with self._lock:
+            self.requests[request_key(method, url, body)] = {
+                "method": method.upper(),
+                "url": url,
+                "error": f"{type(error).__name__}: {error}",
+            }
+
+    def lookup(self, method: str, url: str, body: Optional[bytes]) -> Response:
+        entry = self.requests.get(request_key(method, url, body))
+        if entry is None:
+            raise SnapshotMiss(f"快照中沒有這個請求：{method} {url}")
+        if "error" in entry:
+            raise ConnectionError(f"錄製時即失敗：{entry['error']}")
+        return Response(status=entry["status"], headers=dict(entry["headers"]),
+                        body=self.get_blob(entry["blob"]), url=entry["final_url"])
+
+    def record_translation(self, target: str, source: str, text: str) -> None:
+        with self._lock:
+            self.translations.setdefault(target, {})[source] = text
+
+    def translation(self, target: str, source: str) -> str:
+        """The recorded translation of ``source``; raises SnapshotMiss if the recorded run had none."""
+        try:
+            return self.translations[target][source]
+        except KeyError:
+            raise SnapshotMiss(f"快照中沒有這段文字的翻譯：{source[:40]!r}") from None
+
+    def save_state(self, name: str, data: bytes) -> None:
+        path = self.root / "state" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def state_path(self, name: str) -> Path:
+        return self.root / "state" / name
+
+    def load_state(self, name: str) -> bytes:
+        """Recorded state ``name``; raises SnapshotMiss if the snapshot does not have it."""
+        try:
+            return self.state_path(name).read_bytes()
+        except FileNotFoundError:
+            raise SnapshotMiss(f"快照中沒有 {name}") from None
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            manifest = {
+                "version": FORMAT_VERSION,
+                "now": self.now.isoformat() if self.now else None,
+                "requests": dict(sorted(self.requests.items())),
+                "translations": {target: dict(sorted(texts.items())) for target, texts in sorted(self.translations.items())},
+            }
+        tmp = self.root / (MANIFEST + ".tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.root / MANIFEST)
+
+
+class RecordingClient(HttpClient):
+    """Live client that stores every response it returns into ``snapshot``."""
+
+    def __init__(self, snapshot: Snapshot, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.snapshot = snapshot
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None, **kwargs: Any) -> Response:
+        raise_for_status = kwargs.pop("raise_for_status", True)
+        try:
+            response = super().request(method, url, body=body, raise_for_status=False, **kwargs)
+        except OSError as exc:
+            self.snapshot.record_error(method, url, body, exc)
+            raise
+        self.snapshot.record(method, url, body, response)
+        if raise_for_status and response.status >= 400:
+            self._raise(response)
+        return response
+
+
+class ReplayClient(HttpClient):
+    """Offline client that answers only from ``snapshot``; unknown requests raise SnapshotMiss."""
+
+    def __init__(self, snapshot: Snapshot, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.snapshot = snapshot
+
+    def request(self, method: str, url: str, body: Optional[bytes] = None, **kwargs: Any) -> Response:
+        response = self.snapshot.lookup(method, url, body)
+        if kwargs.get("raise_for_status", True) and response.status >= 400:
+            self._raise(response)
+        return response
@@ -0,0 +1,204 @@
+"""Indexed store for the dashboard timeline (one row per day, keyed by date).
+
+The store is a small SQLite database; timeline.md and timeline.json are export views
+regenerated from it (atomically, and only when their content changes), so a run
+upserts one row instead of rewriting the whole history, and a crash mid-run leaves
+the store intact (each write is one transaction).
+
+On first use the store is seeded from the existing timeline.json / timeline.md.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from output_writer import OUTPUTS
+
+SECTIONS = ("headlines", "industry", "highlights")
+MARKDOWN_HEADER = "# AI 儀表板時間軸"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS timeline (
+    date       TEXT PRIMARY KEY,   -- YYYY-MM-DD, so text order is date order
+    updated    TEXT NOT NULL,
+    headlines  TEXT NOT NULL,      -- JSON arrays of titles
+    industry   TEXT NOT NULL,
+    highlights TEXT NOT NULL,
+    link       TEXT NOT NULL
+) WITHOUT ROWID
+"""
+_MARKDOWN_FIELDS = {
+    "🕒 更新時間：": "updated",
+    "🔥 頭條：": "headlines",
+    "💼 產業：": "industry",
+    "🧠 深度：": "highlights",
+}
+_MARKDOWN_LINK_RE = re.compile(r"\[完整內容\]\((?P<link>[^)]+)\)")
+_EMPTY_TITLES = "（無資料）"
+
+
+class TimelineStore:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_SCHEMA)
+
+    def __enter__(self) -> "TimelineStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM timeline").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def upsert(self, entries: Iterable[Dict[str, Any]]) -> int:
+        rows = [
+            (
+                entry["date"],
+                entry.get("updated", ""),
+                *(json.dumps(entry.get(section) or [], ensure_ascii=False) for section in SECTIONS),
+                entry.get("link") or f"history/{entry['date']}.md",
+            )
+            for entry in entries
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO timeline (date, updated, headlines, industry, highlights, link)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(date) DO UPDATE SET updated = excluded.updated,"
+                " headlines = excluded.headlines, industry = excluded.industry,"
+                " highlights = excluded.highlights, link = excluded.link",
+                rows,
+            )
+        return len(rows)
+
+    def prune(self, before: str) -> int:
+        """Drop days older than ``before`` (YYYY-MM-DD); returns how many were removed."""
+        with self.conn:
+            return self.conn.execute("DELETE FROM timeline WHERE date < ?", (before,)).rowcount
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Entries with ``start <= date <= end`` (either bound optional), newest first."""
+        sql = "SELECT date, updated, headlines, industry, highlights, link FROM timeline WHERE 1 = 1"
+        params: List[Any] = []
+        if start:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end:
+            sql += " AND date <= ?"
+            params.append(end)
+        sql += " ORDER BY date DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_row_to_entry(row) for row in self.conn.execute(sql, params)]
+
+    def latest(self, limit: int) -> List[Dict[str, Any]]:
+        return self.range(limit=limit)
+
+    def get(self, date: str) -> Optional[Dict[str, Any]]:
+        entries = self.range(date, date)
+        return entries[0] if entries else None
+
+    # ------------------------------------------------------------------
+    # Legacy import / export views
+    # ------------------------------------------------------------------
+
+    def import_legacy(self, timeline_json: Path, timeline_md: Path) -> int:
+        """Seed the store from the old files; JSON wins where both have the same day."""
+        entries: Dict[str, Dict[str, Any]] = {}
+        if timeline_md.exists():
+            for entry in parse_markdown(timeline_md.read_text(encoding="utf-8")):
+                entries.setdefault(entry["date"], entry)
+        if timeline_json.exists():
+            try:
+                data = json.loads(timeline_json.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                data = []
+            for entry in data:
+                if isinstance(entry, dict) and entry.get("date"):
+                    entries[entry["date"]] = entry
+        return self.upsert(entries.values())
+
+    def export_json(self, path: Path, limit: Optional[int] = None) -> bool:
+        return OUTPUTS.write(path, json.dumps(self.range(limit=limit), ensure_ascii=False, indent=2))
+
+    def export_markdown(self, path: Path, limit: Optional[int] = None) -> bool:
+        blocks = [render_markdown_entry(entry) for entry in self.range(limit=limit)]
+        return OUTPUTS.write(path, MARKDOWN_HEADER + "\n\n" + "\n".join(blocks))
+
+
+def render_markdown_entry(entry: Dict[str, Any]) -> str:
+    def join_titles(items: List[str]) -> str:
+        return " / ".join(items) if items else _EMPTY_TITLES
+
+    entry_lines = [
+        f"## {entry['date']}",
+        f"- 🕒 更新時間：{entry['updated']}",
+        f"- 🔥 頭條：{join_titles(entry.get('headlines') or [])}",
+        f"- 💼 產業：{join_titles(entry.get('industry') or [])}",
+        f"- 🧠 深度：{join_titles(entry.get('highlights') or [])}",
+        f"- 📄 [完整內容]({entry['link']})",
+        "",
+    ]
+    return "\n".join(entry_lines)
+
+
+def parse_markdown(text: str) -> List[Dict[str, Any]]:
+    """Read entries back from timeline.md; the first occurrence of each field in a block wins."""
+    entries = []
+    for block in re.split(r"(?m)^(?=## )", text):
+        heading = re.match(r"## (\d{4}-\d{2}-\d{2})", block)
+        if not heading:
+            continue
+        date = heading.group(1)
+        entry: Dict[str, Any] = {"date": date, "link": f"history/{date}.md"}
+        for line in block.splitlines():
+            line = line.lstrip("- ").strip()
+            for prefix, key in _MARKDOWN_FIELDS.items():
+                if line.startswith(prefix) and key not in entry:
+                    value = line[len(prefix):].strip()
+                    if key == "updated":
+                        entry[key] = value
+                    else:
+                        entry[key] = [] if value == _EMPTY_TITLES else [t.strip() for t in value.split(" / ") if t.strip()]
+            link = _MARKDOWN_LINK_RE.search(line)
+            if link:
+                entry["link"] = link.group("link")
+        entry.setdefault("updated", "")
+        for section in SECTIONS:
+            entry.setdefault(section, [])
+        entries.append(entry)
+    return entries
+
+
+def _row_to_entry(row: tuple) -> Dict[str, Any]:
+    date, updated, headlines, industry, highlights, link = row
+    return {
+        "date": date,
+        "updated": updated,
+        "headlines": json.loads(headlines),
+        "industry": json.loads(industry),
+        "highlights": json.loads(highlights),
+        "link": link,
+    }